@@ -1,3 +1,9 @@
+from autocompletado import completar_en, nombre_completo
+from busqueda_difusa import parecidos_en
+from busqueda_texto import buscar_texto_en
+from cache_consultas import cache, cacheada
+from normalizacion import clave_busqueda
+
 # Datos de ejemplo
 productos = [
     {'id': 1, 'nombre': 'iPhone 15', 'marca': 'Apple', 'categoria': 'Smartphone', 'precio': 999.99, 'stock': 10, 'disponible': True},
@@ -22,42 +28,83 @@ empleados = [
 ]
 
 # Utilidades internas
-def _norm(s):
-    return s.strip().lower() if isinstance(s, str) else s
+_norm = clave_busqueda
 
 # ===============================
 # FUNCIONES DE BÚSQUEDA DE PRODUCTOS
 # ===============================
 
-def buscar_producto_por_nombre(productos, nombre_buscado):
+def buscar_producto_por_nombre(productos, nombre_buscado, filtro=None):
     """Busca un producto por nombre (case-insensitive)."""
+    if hasattr(productos, 'buscar_producto_por_nombre'):
+        return productos.buscar_producto_por_nombre(nombre_buscado)
+    if filtro is not None and filtro.descarta(productos, nombre_buscado):
+        return None
     nombre_norm = _norm(nombre_buscado)
     return next((p for p in productos if _norm(p.get('nombre')) == nombre_norm), None)
 
-def buscar_producto_por_id(productos, id_buscado):
+def buscar_producto_por_id(productos, id_buscado, filtro=None):
     """Busca un producto por ID."""
+    if hasattr(productos, 'buscar_producto_por_id'):
+        return productos.buscar_producto_por_id(id_buscado)
+    if filtro is not None and filtro.descarta(productos, id_buscado):
+        return None
     return next((p for p in productos if p.get('id') == id_buscado), None)
 
+@cacheada
 def buscar_productos_por_categoria(productos, categoria_buscada):
     """Busca productos por categoría (case-insensitive)."""
+    if hasattr(productos, 'buscar_productos_por_categoria'):
+        return productos.buscar_productos_por_categoria(categoria_buscada)
     cat_norm = _norm(categoria_buscada)
     return [p for p in productos if _norm(p.get('categoria')) == cat_norm]
 
+@cacheada
 def buscar_productos_por_marca(productos, marca_buscada):
     """Busca productos por marca (case-insensitive)."""
+    if hasattr(productos, 'buscar_productos_por_marca'):
+        return productos.buscar_productos_por_marca(marca_buscada)
     marca_norm = _norm(marca_buscada)
     return [p for p in productos if _norm(p.get('marca')) == marca_norm]
 
+@cacheada
 def buscar_productos_disponibles(productos):
     """Busca productos disponibles (disponible=True y stock>0)."""
+    if hasattr(productos, 'buscar_productos_disponibles'):
+        return productos.buscar_productos_disponibles()
     return [p for p in productos if p.get('disponible') and p.get('stock', 0) > 0]
 
+def buscar_productos_parecidos(productos, nombre_buscado, cantidad=5, max_errores=None):
+    """Productos con nombre parecido al buscado (admite errores de tecleo), como pares
+    (producto, puntuación) del más al menos parecido."""
+    if hasattr(productos, 'buscar_productos_parecidos'):
+        return productos.buscar_productos_parecidos(nombre_buscado, cantidad, max_errores)
+    return parecidos_en(productos, nombre_buscado, 'nombre', cantidad, max_errores)
+
+def autocompletar_productos(productos, prefijo, cantidad=10):
+    """Los primeros productos (en orden alfabético) cuyo nombre empieza por el prefijo (case-insensitive)."""
+    if hasattr(productos, 'autocompletar_productos'):
+        return productos.autocompletar_productos(prefijo, cantidad)
+    return completar_en(productos, prefijo, cantidad)
+
+@cacheada
+def buscar_productos_por_texto(productos, consulta, operador='y', cantidad=None):
+    """Productos con todas ('y') o alguna ('o') de las palabras de la consulta en nombre, marca o
+    categoría, como pares (producto, puntuación BM25) del más al menos relevante."""
+    if hasattr(productos, 'buscar_productos_por_texto'):
+        return productos.buscar_productos_por_texto(consulta, operador, cantidad)
+    return buscar_texto_en(productos, consulta, operador, cantidad)
+
 def buscar_productos_por_rango_precio(productos, precio_min, precio_max):
     """Busca productos por rango de precio."""
+    if hasattr(productos, 'buscar_productos_por_rango_precio'):
+        return productos.buscar_productos_por_rango_precio(precio_min, precio_max)
     return [p for p in productos if precio_min <= p.get('precio', 0.0) <= precio_max]
 
 def contar_productos_por_categoria(productos):
     """Cuenta productos por categoría y devuelve diccionario {categoria: contador}."""
+    if hasattr(productos, 'contar_productos_por_categoria'):
+        return productos.contar_productos_por_categoria(sin_categoria='Sin categoría')
     conteo = {}
     for p in productos:
         categoria = p.get('categoria', 'Sin categoría')
@@ -68,8 +115,12 @@ def contar_productos_por_categoria(productos):
 # FUNCIONES DE BÚSQUEDA DE EMPLEADOS
 # ===============================
 
-def buscar_empleado_por_id(empleados, id_buscado):
+def buscar_empleado_por_id(empleados, id_buscado, filtro=None):
     """Busca empleado por ID."""
+    if hasattr(empleados, 'buscar_empleado_por_id'):
+        return empleados.buscar_empleado_por_id(id_buscado)
+    if filtro is not None and filtro.descarta(empleados, id_buscado):
+        return None
     return next((e for e in empleados if e.get('id') == id_buscado), None)
 
 def buscar_empleado_por_nombre_completo(empleados, nombre_completo):
@@ -83,13 +134,22 @@ def buscar_empleado_por_nombre_completo(empleados, nombre_completo):
             return e
     return None
 
+def autocompletar_empleados(empleados, prefijo, cantidad=10):
+    """Los primeros empleados (por "nombre apellido") cuyo nombre completo empieza por el prefijo."""
+    if hasattr(empleados, 'autocompletar_empleados'):
+        return empleados.autocompletar_empleados(prefijo, cantidad)
+    return completar_en(empleados, prefijo, cantidad, calculo=nombre_completo)
+
 def buscar_empleados_por_departamento(empleados, departamento_buscado):
     """Busca empleados por departamento (case-insensitive)."""
     depto_norm = _norm(departamento_buscado)
     return [e for e in empleados if _norm(e.get('departamento')) == depto_norm]
 
+@cacheada
 def buscar_empleados_activos(empleados):
     """Devuelve lista de empleados activos."""
+    if hasattr(empleados, 'buscar_empleados_activos'):
+        return empleados.buscar_empleados_activos()
     return [e for e in empleados if e.get('activo')]
 
 # ===============================
@@ -153,6 +213,30 @@ def mostrar_empleado(empleado):
     print(f"   💵 Salario: ${empleado['salario']:,}")
     print(f"   🟢 Estado: {estado}")
 
+def buscar_mientras_escribe(texto, buscar, autocompletar, describir):
+    """
+    Búsqueda mientras se escribe: si el texto no es un nombre exacto, lista
+    los que empiezan por él para elegir uno por número o seguir escribiendo
+    (lo nuevo se añade al final del texto). Devuelve (registro o None, texto
+    final), o (None, None) si se deja la búsqueda con Enter.
+    """
+    while True:
+        registro = buscar(texto)
+        if registro is not None:
+            return registro, texto
+        sugerencias = autocompletar(texto)
+        if not sugerencias:
+            return None, texto
+        print(f"   Empiezan por '{texto}':")
+        for i, sugerencia in enumerate(sugerencias, 1):
+            print(f"   {i}. {describir(sugerencia)}")
+        mas = input(f"Número para elegir, más letras para seguir ('{texto}...') o Enter para salir: ")
+        if not mas.strip():
+            return None, None
+        if mas.strip().isdigit() and 1 <= int(mas) <= len(sugerencias):
+            return sugerencias[int(mas) - 1], texto
+        texto += mas
+
 # ===============================
 # MENÚS DEL SISTEMA
 # ===============================
@@ -247,9 +331,20 @@ def buscar_producto_id():
 def buscar_producto_nombre():
     print("\n🔍 BUSCAR PRODUCTO POR NOMBRE")
     print("-" * 30)
-    nombre = input("Ingrese el nombre del producto: ").strip()
+    nombre = input("Ingrese el nombre del producto (o su comienzo): ").strip()
     if nombre:
-        mostrar_producto(buscar_producto_por_nombre(productos, nombre))
+        producto, nombre = buscar_mientras_escribe(
+            nombre, lambda texto: buscar_producto_por_nombre(productos, texto),
+            lambda texto: autocompletar_productos(productos, texto),
+            lambda p: f"{p['nombre']} (ID: {p['id']})")
+        if nombre is not None:
+            mostrar_producto(producto)
+        if nombre is not None and producto is None:
+            parecidos = buscar_productos_parecidos(productos, nombre)
+            if parecidos:
+                print("   ¿Quiso decir...?")
+                for parecido, puntuacion in parecidos:
+                    print(f"   - {parecido['nombre']} (ID: {parecido['id']}, parecido: {puntuacion:.0%})")
     else:
         print("❌ Error: Debe ingresar un nombre válido.")
     presionar_para_continuar()
@@ -337,9 +432,14 @@ def buscar_empleado_id():
 def buscar_empleado_nombre():
     print("\n🔍 BUSCAR EMPLEADO POR NOMBRE")
     print("-" * 30)
-    nombre = input("Ingrese el nombre completo (ej: Ana García): ").strip()
+    nombre = input("Ingrese el nombre completo o su comienzo (ej: Ana García): ").strip()
     if nombre:
-        mostrar_empleado(buscar_empleado_por_nombre_completo(empleados, nombre))
+        empleado, nombre = buscar_mientras_escribe(
+            nombre, lambda texto: buscar_empleado_por_nombre_completo(empleados, texto),
+            lambda texto: autocompletar_empleados(empleados, texto),
+            lambda e: f"{e['nombre']} {e['apellido']} ({e['departamento']})")
+        if nombre is not None:
+            mostrar_empleado(empleado)
     else:
         print("❌ Error: Debe ingresar un nombre válido.")
     presionar_para_continuar()
@@ -386,46 +486,95 @@ def listar_todos_empleados():
         print("❌ No hay empleados registrados.")
     presionar_para_continuar()
 
+def estadisticas_productos(productos):
+    """Totales de productos: total, disponibles, sin_stock, valor_inventario y por_categoria."""
+    if hasattr(productos, 'estadisticas_productos'):
+        return productos.estadisticas_productos()
+    return {'total': len(productos),
+            'disponibles': len(buscar_productos_disponibles(productos)),
+            'sin_stock': sum(1 for p in productos if p.get('stock', 0) == 0),
+            'valor_inventario': sum(p.get('precio', 0.0) * p.get('stock', 0) for p in productos),
+            'por_categoria': contar_productos_por_categoria(productos)}
+
+def estadisticas_empleados(empleados):
+    """Totales de empleados: total, activos, inactivos, salario_promedio y por_departamento."""
+    if hasattr(empleados, 'estadisticas_empleados'):
+        return empleados.estadisticas_empleados()
+    activos = len(buscar_empleados_activos(empleados))
+    departamentos = {}
+    for e in empleados:
+        d = e.get('departamento', 'Sin departamento')
+        departamentos[d] = departamentos.get(d, 0) + 1
+    return {'total': len(empleados), 'activos': activos, 'inactivos': len(empleados) - activos,
+            'salario_promedio': sum(e.get('salario', 0) for e in empleados) / len(empleados) if empleados else 0,
+            'por_departamento': departamentos}
+
 def mostrar_estadisticas():
     print("\n📊 ESTADÍSTICAS DEL SISTEMA")
     print("-" * 30)
-    productos_disponibles = buscar_productos_disponibles(productos)
-    productos_sin_stock = [p for p in productos if p.get('stock', 0) == 0]
-    valor_inventario = sum(p.get('precio', 0.0) * p.get('stock', 0) for p in productos)
+    datos = estadisticas_productos(productos)
     print("📦 ESTADÍSTICAS DE PRODUCTOS:")
-    print(f"   • Total de productos: {len(productos)}")
-    print(f"   • Productos disponibles: {len(productos_disponibles)}")
-    print(f"   • Productos sin stock: {len(productos_sin_stock)}")
-    print(f"   • Valor total del inventario: ${valor_inventario:,.2f}")
-    conteo_categorias = contar_productos_por_categoria(productos)
+    print(f"   • Total de productos: {datos['total']}")
+    print(f"   • Productos disponibles: {datos['disponibles']}")
+    print(f"   • Productos sin stock: {datos['sin_stock']}")
+    print(f"   • Valor total del inventario: ${datos['valor_inventario']:,.2f}")
     print("   • Distribución por categoría:")
-    for categoria, cantidad in conteo_categorias.items():
+    for categoria, cantidad in datos['por_categoria'].items():
         print(f"     - {categoria}: {cantidad}")
     print("\n👥 ESTADÍSTICAS DE EMPLEADOS:")
-    empleados_activos = buscar_empleados_activos(empleados)
-    empleados_inactivos = len(empleados) - len(empleados_activos)
-    salario_promedio = sum(e.get('salario', 0) for e in empleados) / len(empleados) if empleados else 0
-    print(f"   • Total de empleados: {len(empleados)}")
-    print(f"   • Empleados activos: {len(empleados_activos)}")
-    print(f"   • Empleados inactivos: {empleados_inactivos}")
-    print(f"   • Salario promedio: ${salario_promedio:,.2f}")
-    departamentos = {}
-    for e in empleados:
-        d = e.get('departamento', 'Sin departamento')
-        departamentos[d] = departamentos.get(d, 0) + 1
+    datos = estadisticas_empleados(empleados)
+    print(f"   • Total de empleados: {datos['total']}")
+    print(f"   • Empleados activos: {datos['activos']}")
+    print(f"   • Empleados inactivos: {datos['inactivos']}")
+    print(f"   • Salario promedio: ${datos['salario_promedio']:,.2f}")
     print("   • Distribución por departamento:")
-    for departamento, cantidad in departamentos.items():
+    for departamento, cantidad in datos['por_departamento'].items():
         print(f"     - {departamento}: {cantidad}")
+    datos = cache.estadisticas()
+    print("\n⚡ CACHÉ DE CONSULTAS:")
+    print(f"   • Aciertos: {datos['aciertos']} de {datos['aciertos'] + datos['fallos']} "
+          f"({datos['tasa_aciertos']:.0%})")
+    print(f"   • Entradas: {datos['entradas']} ({datos['bytes'] / 1024:,.0f} KB)")
+    print(f"   • Expulsiones: {datos['expulsiones']} · Invalidaciones: {datos['invalidaciones']}")
     presionar_para_continuar()
 
+def cargar_datos(ruta_productos=None, ruta_empleados=None):
+    """
+    Sustituye los datos de ejemplo por los de archivos. Los productos pueden
+    venir de una instantánea (.lineal, se abre al instante sin cargar nada)
+    o de un CSV / JSON Lines; los empleados, de un CSV / JSON Lines.
+    """
+    global productos, empleados
+    if ruta_productos:
+        from instantanea import EXTENSION, abrir_instantanea
+        if ruta_productos.endswith(EXTENSION):
+            productos = abrir_instantanea(ruta_productos)
+        else:
+            from cargador import cargar_productos
+            productos = cargar_productos(ruta_productos)
+        print(f"📦 {len(productos)} productos cargados de {ruta_productos}")
+    if ruta_empleados:
+        from cargador import cargar_empleados
+        empleados = cargar_empleados(ruta_empleados)
+        print(f"👥 {len(empleados)} empleados cargados de {ruta_empleados}")
+
 # ===============================
 # INICIO DEL PROGRAMA
 # ===============================
 
 if __name__ == "__main__":
+    import sys
     print("🚀 Iniciando Sistema Integrado de Búsqueda...")
+    # Uso: python Sistema_Integrado.py [productos.lineal|.csv|.jsonl] [empleados.csv|.jsonl]
+    cargar_datos(*sys.argv[1:3])
     menu_principal()
 
+from autocompletado import completar_en, nombre_completo
+from busqueda_difusa import parecidos_en
+from busqueda_texto import buscar_texto_en
+from cache_consultas import cache, cacheada
+from normalizacion import clave_busqueda
+
 # Datos de ejemplo
 productos = [
     {'id': 1, 'nombre': 'iPhone 15', 'marca': 'Apple', 'categoria': 'Smartphone', 'precio': 999.99, 'stock': 10, 'disponible': True},
@@ -450,42 +599,83 @@ empleados = [
 ]
 
 # Utilidades internas
-def _norm(s):
-    return s.strip().lower() if isinstance(s, str) else s
+_norm = clave_busqueda
 
 # ===============================
 # FUNCIONES DE BÚSQUEDA DE PRODUCTOS
 # ===============================
 
-def buscar_producto_por_nombre(productos, nombre_buscado):
+def buscar_producto_por_nombre(productos, nombre_buscado, filtro=None):
     """Busca un producto por nombre (case-insensitive)."""
+    if hasattr(productos, 'buscar_producto_por_nombre'):
+        return productos.buscar_producto_por_nombre(nombre_buscado)
+    if filtro is not None and filtro.descarta(productos, nombre_buscado):
+        return None
     nombre_norm = _norm(nombre_buscado)
     return next((p for p in productos if _norm(p.get('nombre')) == nombre_norm), None)
 
-def buscar_producto_por_id(productos, id_buscado):
+def buscar_producto_por_id(productos, id_buscado, filtro=None):
     """Busca un producto por ID."""
+    if hasattr(productos, 'buscar_producto_por_id'):
+        return productos.buscar_producto_por_id(id_buscado)
+    if filtro is not None and filtro.descarta(productos, id_buscado):
+        return None
     return next((p for p in productos if p.get('id') == id_buscado), None)
 
+@cacheada
 def buscar_productos_por_categoria(productos, categoria_buscada):
     """Busca productos por categoría (case-insensitive)."""
+    if hasattr(productos, 'buscar_productos_por_categoria'):
+        return productos.buscar_productos_por_categoria(categoria_buscada)
     cat_norm = _norm(categoria_buscada)
     return [p for p in productos if _norm(p.get('categoria')) == cat_norm]
 
+@cacheada
 def buscar_productos_por_marca(productos, marca_buscada):
     """Busca productos por marca (case-insensitive)."""
+    if hasattr(productos, 'buscar_productos_por_marca'):
+        return productos.buscar_productos_por_marca(marca_buscada)
     marca_norm = _norm(marca_buscada)
     return [p for p in productos if _norm(p.get('marca')) == marca_norm]
 
+@cacheada
 def buscar_productos_disponibles(productos):
     """Busca productos disponibles (disponible=True y stock>0)."""
+    if hasattr(productos, 'buscar_productos_disponibles'):
+        return productos.buscar_productos_disponibles()
     return [p for p in productos if p.get('disponible') and p.get('stock', 0) > 0]
 
+def buscar_productos_parecidos(productos, nombre_buscado, cantidad=5, max_errores=None):
+    """Productos con nombre parecido al buscado (admite errores de tecleo), como pares
+    (producto, puntuación) del más al menos parecido."""
+    if hasattr(productos, 'buscar_productos_parecidos'):
+        return productos.buscar_productos_parecidos(nombre_buscado, cantidad, max_errores)
+    return parecidos_en(productos, nombre_buscado, 'nombre', cantidad, max_errores)
+
+def autocompletar_productos(productos, prefijo, cantidad=10):
+    """Los primeros productos (en orden alfabético) cuyo nombre empieza por el prefijo (case-insensitive)."""
+    if hasattr(productos, 'autocompletar_productos'):
+        return productos.autocompletar_productos(prefijo, cantidad)
+    return completar_en(productos, prefijo, cantidad)
+
+@cacheada
+def buscar_productos_por_texto(productos, consulta, operador='y', cantidad=None):
+    """Productos con todas ('y') o alguna ('o') de las palabras de la consulta en nombre, marca o
+    categoría, como pares (producto, puntuación BM25) del más al menos relevante."""
+    if hasattr(productos, 'buscar_productos_por_texto'):
+        return productos.buscar_productos_por_texto(consulta, operador, cantidad)
+    return buscar_texto_en(productos, consulta, operador, cantidad)
+
 def buscar_productos_por_rango_precio(productos, precio_min, precio_max):
     """Busca productos por rango de precio."""
+    if hasattr(productos, 'buscar_productos_por_rango_precio'):
+        return productos.buscar_productos_por_rango_precio(precio_min, precio_max)
     return [p for p in productos if precio_min <= p.get('precio', 0.0) <= precio_max]
 
 def contar_productos_por_categoria(productos):
     """Cuenta productos por categoría y devuelve diccionario {categoria: contador}."""
+    if hasattr(productos, 'contar_productos_por_categoria'):
+        return productos.contar_productos_por_categoria(sin_categoria='Sin categoría')
     conteo = {}
     for p in productos:
         categoria = p.get('categoria', 'Sin categoría')
@@ -496,8 +686,12 @@ def contar_productos_por_categoria(productos):
 # FUNCIONES DE BÚSQUEDA DE EMPLEADOS
 # ===============================
 
-def buscar_empleado_por_id(empleados, id_buscado):
+def buscar_empleado_por_id(empleados, id_buscado, filtro=None):
     """Busca empleado por ID."""
+    if hasattr(empleados, 'buscar_empleado_por_id'):
+        return empleados.buscar_empleado_por_id(id_buscado)
+    if filtro is not None and filtro.descarta(empleados, id_buscado):
+        return None
     return next((e for e in empleados if e.get('id') == id_buscado), None)
 
 def buscar_empleado_por_nombre_completo(empleados, nombre_completo):
@@ -511,13 +705,22 @@ def buscar_empleado_por_nombre_completo(empleados, nombre_completo):
             return e
     return None
 
+def autocompletar_empleados(empleados, prefijo, cantidad=10):
+    """Los primeros empleados (por "nombre apellido") cuyo nombre completo empieza por el prefijo."""
+    if hasattr(empleados, 'autocompletar_empleados'):
+        return empleados.autocompletar_empleados(prefijo, cantidad)
+    return completar_en(empleados, prefijo, cantidad, calculo=nombre_completo)
+
 def buscar_empleados_por_departamento(empleados, departamento_buscado):
     """Busca empleados por departamento (case-insensitive)."""
     depto_norm = _norm(departamento_buscado)
     return [e for e in empleados if _norm(e.get('departamento')) == depto_norm]
 
+@cacheada
 def buscar_empleados_activos(empleados):
     """Devuelve lista de empleados activos."""
+    if hasattr(empleados, 'buscar_empleados_activos'):
+        return empleados.buscar_empleados_activos()
     return [e for e in empleados if e.get('activo')]
 
 # ===============================
@@ -581,6 +784,30 @@ def mostrar_empleado(empleado):
     print(f"   💵 Salario: ${empleado['salario']:,}")
     print(f"   🟢 Estado: {estado}")
 
+def buscar_mientras_escribe(texto, buscar, autocompletar, describir):
+    """
+    Búsqueda mientras se escribe: si el texto no es un nombre exacto, lista
+    los que empiezan por él para elegir uno por número o seguir escribiendo
+    (lo nuevo se añade al final del texto). Devuelve (registro o None, texto
+    final), o (None, None) si se deja la búsqueda con Enter.
+    """
+    while True:
+        registro = buscar(texto)
+        if registro is not None:
+            return registro, texto
+        sugerencias = autocompletar(texto)
+        if not sugerencias:
+            return None, texto
+        print(f"   Empiezan por '{texto}':")
+        for i, sugerencia in enumerate(sugerencias, 1):
+            print(f"   {i}. {describir(sugerencia)}")
+        mas = input(f"Número para elegir, más letras para seguir ('{texto}...') o Enter para salir: ")
+        if not mas.strip():
+            return None, None
+        if mas.strip().isdigit() and 1 <= int(mas) <= len(sugerencias):
+            return sugerencias[int(mas) - 1], texto
+        texto += mas
+
 # ===============================
 # MENÚS DEL SISTEMA
 # ===============================
@@ -675,9 +902,20 @@ def buscar_producto_id():
 def buscar_producto_nombre():
     print("\n🔍 BUSCAR PRODUCTO POR NOMBRE")
     print("-" * 30)
-    nombre = input("Ingrese el nombre del producto: ").strip()
+    nombre = input("Ingrese el nombre del producto (o su comienzo): ").strip()
     if nombre:
-        mostrar_producto(buscar_producto_por_nombre(productos, nombre))
+        producto, nombre = buscar_mientras_escribe(
+            nombre, lambda texto: buscar_producto_por_nombre(productos, texto),
+            lambda texto: autocompletar_productos(productos, texto),
+            lambda p: f"{p['nombre']} (ID: {p['id']})")
+        if nombre is not None:
+            mostrar_producto(producto)
+        if nombre is not None and producto is None:
+            parecidos = buscar_productos_parecidos(productos, nombre)
+            if parecidos:
+                print("   ¿Quiso decir...?")
+                for parecido, puntuacion in parecidos:
+                    print(f"   - {parecido['nombre']} (ID: {parecido['id']}, parecido: {puntuacion:.0%})")
     else:
         print("❌ Error: Debe ingresar un nombre válido.")
     presionar_para_continuar()
@@ -765,9 +1003,14 @@ def buscar_empleado_id():
 def buscar_empleado_nombre():
     print("\n🔍 BUSCAR EMPLEADO POR NOMBRE")
     print("-" * 30)
-    nombre = input("Ingrese el nombre completo (ej: Ana García): ").strip()
+    nombre = input("Ingrese el nombre completo o su comienzo (ej: Ana García): ").strip()
     if nombre:
-        mostrar_empleado(buscar_empleado_por_nombre_completo(empleados, nombre))
+        empleado, nombre = buscar_mientras_escribe(
+            nombre, lambda texto: buscar_empleado_por_nombre_completo(empleados, texto),
+            lambda texto: autocompletar_empleados(empleados, texto),
+            lambda e: f"{e['nombre']} {e['apellido']} ({e['departamento']})")
+        if nombre is not None:
+            mostrar_empleado(empleado)
     else:
         print("❌ Error: Debe ingresar un nombre válido.")
     presionar_para_continuar()
@@ -814,44 +1057,87 @@ def listar_todos_empleados():
         print("❌ No hay empleados registrados.")
     presionar_para_continuar()
 
+def estadisticas_productos(productos):
+    """Totales de productos: total, disponibles, sin_stock, valor_inventario y por_categoria."""
+    if hasattr(productos, 'estadisticas_productos'):
+        return productos.estadisticas_productos()
+    return {'total': len(productos),
+            'disponibles': len(buscar_productos_disponibles(productos)),
+            'sin_stock': sum(1 for p in productos if p.get('stock', 0) == 0),
+            'valor_inventario': sum(p.get('precio', 0.0) * p.get('stock', 0) for p in productos),
+            'por_categoria': contar_productos_por_categoria(productos)}
+
+def estadisticas_empleados(empleados):
+    """Totales de empleados: total, activos, inactivos, salario_promedio y por_departamento."""
+    if hasattr(empleados, 'estadisticas_empleados'):
+        return empleados.estadisticas_empleados()
+    activos = len(buscar_empleados_activos(empleados))
+    departamentos = {}
+    for e in empleados:
+        d = e.get('departamento', 'Sin departamento')
+        departamentos[d] = departamentos.get(d, 0) + 1
+    return {'total': len(empleados), 'activos': activos, 'inactivos': len(empleados) - activos,
+            'salario_promedio': sum(e.get('salario', 0) for e in empleados) / len(empleados) if empleados else 0,
+            'por_departamento': departamentos}
+
 def mostrar_estadisticas():
     print("\n📊 ESTADÍSTICAS DEL SISTEMA")
     print("-" * 30)
-    productos_disponibles = buscar_productos_disponibles(productos)
-    productos_sin_stock = [p for p in productos if p.get('stock', 0) == 0]
-    valor_inventario = sum(p.get('precio', 0.0) * p.get('stock', 0) for p in productos)
+    datos = estadisticas_productos(productos)
     print("📦 ESTADÍSTICAS DE PRODUCTOS:")
-    print(f"   • Total de productos: {len(productos)}")
-    print(f"   • Productos disponibles: {len(productos_disponibles)}")
-    print(f"   • Productos sin stock: {len(productos_sin_stock)}")
-    print(f"   • Valor total del inventario: ${valor_inventario:,.2f}")
-    conteo_categorias = contar_productos_por_categoria(productos)
+    print(f"   • Total de productos: {datos['total']}")
+    print(f"   • Productos disponibles: {datos['disponibles']}")
+    print(f"   • Productos sin stock: {datos['sin_stock']}")
+    print(f"   • Valor total del inventario: ${datos['valor_inventario']:,.2f}")
     print("   • Distribución por categoría:")
-    for categoria, cantidad in conteo_categorias.items():
+    for categoria, cantidad in datos['por_categoria'].items():
         print(f"     - {categoria}: {cantidad}")
     print("\n👥 ESTADÍSTICAS DE EMPLEADOS:")
-    empleados_activos = buscar_empleados_activos(empleados)
-    empleados_inactivos = len(empleados) - len(empleados_activos)
-    salario_promedio = sum(e.get('salario', 0) for e in empleados) / len(empleados) if empleados else 0
-    print(f"   • Total de empleados: {len(empleados)}")
-    print(f"   • Empleados activos: {len(empleados_activos)}")
-    print(f"   • Empleados inactivos: {empleados_inactivos}")
-    print(f"   • Salario promedio: ${salario_promedio:,.2f}")
-    departamentos = {}
-    for e in empleados:
-        d = e.get('departamento', 'Sin departamento')
-        departamentos[d] = departamentos.get(d, 0) + 1
+    datos = estadisticas_empleados(empleados)
+    print(f"   • Total de empleados: {datos['total']}")
+    print(f"   • Empleados activos: {datos['activos']}")
+    print(f"   • Empleados inactivos: {datos['inactivos']}")
+    print(f"   • Salario promedio: ${datos['salario_promedio']:,.2f}")
     print("   • Distribución por departamento:")
-    for departamento, cantidad in departamentos.items():
+    for departamento, cantidad in datos['por_departamento'].items():
         print(f"     - {departamento}: {cantidad}")
+    datos = cache.estadisticas()
+    print("\n⚡ CACHÉ DE CONSULTAS:")
+    print(f"   • Aciertos: {datos['aciertos']} de {datos['aciertos'] + datos['fallos']} "
+          f"({datos['tasa_aciertos']:.0%})")
+    print(f"   • Entradas: {datos['entradas']} ({datos['bytes'] / 1024:,.0f} KB)")
+    print(f"   • Expulsiones: {datos['expulsiones']} · Invalidaciones: {datos['invalidaciones']}")
     presionar_para_continuar()
 
+def cargar_datos(ruta_productos=None, ruta_empleados=None):
+    """
+    Sustituye los datos de ejemplo por los de archivos. Los productos pueden
+    venir de una instantánea (.lineal, se abre al instante sin cargar nada)
+    o de un CSV / JSON Lines; los empleados, de un CSV / JSON Lines.
+    """
+    global productos, empleados
+    if ruta_productos:
+        from instantanea import EXTENSION, abrir_instantanea
+        if ruta_productos.endswith(EXTENSION):
+            productos = abrir_instantanea(ruta_productos)
+        else:
+            from cargador import cargar_productos
+            productos = cargar_productos(ruta_productos)
+        print(f"📦 {len(productos)} productos cargados de {ruta_productos}")
+    if ruta_empleados:
+        from cargador import cargar_empleados
+        empleados = cargar_empleados(ruta_empleados)
+        print(f"👥 {len(empleados)} empleados cargados de {ruta_empleados}")
+
 # ===============================
 # INICIO DEL PROGRAMA
 # ===============================
 
 if __name__ == "__main__":
+    import sys
     print("🚀 Iniciando Sistema Integrado de Búsqueda...")
+    # Uso: python Sistema_Integrado.py [productos.lineal|.csv|.jsonl] [empleados.csv|.jsonl]
+    cargar_datos(*sys.argv[1:3])
     menu_principal()
     
 #¿Cuál es la complejidad temporal ?
@@ -0,0 +1,161 @@
+import math
+from numbers import Real
+from typing import Any, Dict, Iterable, List, Tuple
+
+def _numero(valor) -> float:
+    return valor if valor.__class__ in (int, float) or isinstance(valor, Real) else 0
+
+class SumaExacta:
+    """
+    Suma que admite restar sin acumular error de redondeo: guarda sumas
+    parciales sin solapamiento (algoritmo de Shewchuk, el de math.fsum), así
+    tras millones de altas y bajas sigue dando la suma exacta redondeada.
+    """
+
+    def __init__(self):
+        self._parciales: List[float] = []
+        self._especiales = 0.0
+
+    def agregar(self, x: float) -> None:
+        if not math.isfinite(x):
+            # inf y nan no caben en las parciales: se suman aparte
+            self._especiales += x
+            return
+        parciales = []
+        for y in self._parciales:
+            if abs(x) < abs(y):
+                x, y = y, x
+            alto = x + y
+            bajo = y - (alto - x)
+            if bajo:
+                parciales.append(bajo)
+            x = alto
+        parciales.append(x)
+        self._parciales = parciales
+
+    def quitar(self, x: float) -> None:
+        self.agregar(-x)
+
+    def valor(self) -> float:
+        return math.fsum(self._parciales) + self._especiales
+
+class _Agregado:
+    """
+    Base de los agregados: se registran en un Catalogo como un índice más y
+    se actualizan en O(1) con cada alta, cambio o baja.
+    """
+
+    def construir(self, filas: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        for pos, registro in filas:
+            self.insertar(pos, registro)
+
+    def verificar(self, pos: int, registro: Dict[str, Any]) -> None:
+        pass
+
+    def insertar(self, pos: int, registro: Dict[str, Any]) -> None:
+        self._aplicar(registro, 1)
+
+    def eliminar(self, pos: int, registro: Dict[str, Any]) -> None:
+        self._aplicar(registro, -1)
+
+    def actualizar(self, pos: int, anterior: Dict[str, Any], nuevo: Dict[str, Any]) -> None:
+        self._aplicar(anterior, -1)
+        self._aplicar(nuevo, 1)
+
+    def _aplicar(self, registro: Dict[str, Any], signo: int) -> None:
+        raise NotImplementedError
+
+class AgregadosProductos(_Agregado):
+    """Total de productos, disponibles (con stock), sin stock y valor del inventario (precio * stock)."""
+
+    def construir(self, filas: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        # En bloque: los importes se suman de una vez con fsum
+        importes = []
+        for _, p in filas:
+            stock = p.get('stock', 0)
+            self.total += 1
+            if p.get('disponible') and _numero(stock) > 0:
+                self.disponibles += 1
+            if stock == 0:
+                self.sin_stock += 1
+            importes.append(_numero(p.get('precio', 0.0)) * _numero(stock))
+        finitos = [x for x in importes if math.isfinite(x)]
+        self._valor.agregar(math.fsum(finitos))
+        if len(finitos) != len(importes):
+            for x in importes:
+                if not math.isfinite(x):
+                    self._valor.agregar(x)
+
+    def __init__(self):
+        self.total = 0
+        self.disponibles = 0
+        self.sin_stock = 0
+        self._valor = SumaExacta()
+
+    def _aplicar(self, p: Dict[str, Any], signo: int) -> None:
+        stock = p.get('stock', 0)
+        self.total += signo
+        if p.get('disponible') and _numero(stock) > 0:
+            self.disponibles += signo
+        if stock == 0:
+            self.sin_stock += signo
+        self._valor.agregar(signo * (_numero(p.get('precio', 0.0)) * _numero(stock)))
+
+    def valor_inventario(self) -> float:
+        return self._valor.valor()
+
+class AgregadosEmpleados(_Agregado):
+    """Total y activos, y suma y promedio de salarios (total y por departamento)."""
+
+    def __init__(self):
+        self.total = 0
+        self.activos = 0
+        self._salarios = SumaExacta()
+        self._departamentos: Dict[Any, list] = {}
+
+    def _aplicar(self, e: Dict[str, Any], signo: int) -> None:
+        salario = _numero(e.get('salario', 0))
+        self.total += signo
+        if e.get('activo'):
+            self.activos += signo
+        self._salarios.agregar(signo * salario)
+        depto = e.get('departamento')
+        datos = self._departamentos.get(depto)
+        if datos is None:
+            datos = self._departamentos[depto] = [0, SumaExacta()]
+        datos[0] += signo
+        datos[1].agregar(signo * salario)
+        if not datos[0]:
+            del self._departamentos[depto]
+
+    def suma_salarios(self, departamento=None) -> float:
+        if departamento is None:
+            return self._salarios.valor()
+        datos = self._departamentos.get(departamento)
+        return datos[1].valor() if datos else 0.0
+
+    def salario_promedio(self, departamento=None) -> float:
+        cantidad = self.total if departamento is None else self._departamentos.get(departamento, [0])[0]
+        return self.suma_salarios(departamento) / cantidad if cantidad else 0
+
+    def salarios_por_departamento(self) -> Dict[Any, Dict[str, float]]:
+        """{departamento: {'empleados', 'suma', 'promedio'}}."""
+        return {depto: {'empleados': n, 'suma': suma.valor(), 'promedio': suma.valor() / n}
+                for depto, (n, suma) in self._departamentos.items()}
+
+if __name__ == "__main__":
+    print("=== PRUEBAS DE AGREGADOS ===\n")
+    suma = SumaExacta()
+    for x in [1e16, 1.0, -1e16]:
+        suma.agregar(x)
+    print(f"1. 1e16 + 1 - 1e16 con suma exacta: {suma.valor()} (con float: {1e16 + 1.0 - 1e16})")
+
+    agregados = AgregadosProductos()
+    agregados.construir(enumerate([
+        {'id': 1, 'precio': 999.99, 'stock': 10, 'disponible': True},
+        {'id': 2, 'precio': 49.90, 'stock': 0, 'disponible': False},
+    ]))
+    print(f"\n2. Productos: {agregados.total}, disponibles: {agregados.disponibles}, sin stock: {agregados.sin_stock}")
+    agregados.actualizar(0, {'id': 1, 'precio': 999.99, 'stock': 10, 'disponible': True},
+                         {'id': 1, 'precio': 999.99, 'stock': 3, 'disponible': True})
+    print(f"   Valor del inventario tras vender 7: ${agregados.valor_inventario():,.2f}")
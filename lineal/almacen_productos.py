@@ -0,0 +1,495 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from numbers import Real
+from operator import mul
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from Búsqueda_Lineal import np
+from normalizacion import clave_texto
+
+COLUMNAS = ('id', 'nombre', 'marca', 'categoria', 'precio', 'stock', 'disponible')
+_TEXTO = ('nombre', 'marca', 'categoria')
+# Rango de la columna de stock (enteros de 64 bits)
+_MAX_STOCK = (1 << 63) - 1
+
+_norm_str = clave_texto
+
+def _tipo(columna) -> str:
+    """Tipo de los elementos de un array o de una memoryview (columnas abiertas de una instantánea)."""
+    return columna.typecode if isinstance(columna, array) else columna.format
+
+def _a_array(columna) -> array:
+    """Copia escribible de una columna; los arrays se devuelven tal cual."""
+    if isinstance(columna, array):
+        return columna
+    copia = array(columna.format)
+    copia.frombytes(columna.cast('B'))
+    return copia
+
+class ColumnaDiccionario:
+    """
+    Columna de texto codificada con diccionario: cada valor distinto se guarda
+    una sola vez y cada fila solo guarda su código entero. El tipo de los
+    códigos crece (1, 2 o 4 bytes) según el número de valores distintos.
+
+    El diccionario no guarda objetos str sino un único bloque UTF-8 con sus
+    desplazamientos, y se indexa con una tabla hash sobre un array; así una
+    columna casi única, como el nombre, ocupa pocas decenas de bytes por fila.
+    """
+
+    _MAX_CACHE = 4096
+
+    def __init__(self):
+        self.codigos = array('B')
+        self.bloque = bytearray()
+        self.inicios = array('q', [0])
+        self._codigo_nulo: Optional[int] = None
+        self._tabla = array('i', [-1]) * 16
+        # Los valores más repetidos (marcas, categorías) se resuelven sin la tabla
+        self._cache: Dict[str, int] = {}
+        self._por_normalizado: Optional[Dict[str, List[int]]] = None
+
+    @classmethod
+    def desde_partes(cls, codigos, bloque, inicios, codigo_nulo: Optional[int]) -> 'ColumnaDiccionario':
+        """
+        Columna a partir de sus partes ya codificadas (arrays o memoryviews de
+        una instantánea, sin copiarlas). La tabla hash depende del hash de
+        cada proceso, así que no se guarda: se rehace al primer uso.
+        """
+        columna = cls()
+        columna.codigos, columna.bloque, columna.inicios = codigos, bloque, inicios
+        columna._codigo_nulo = codigo_nulo
+        columna._tabla = None
+        return columna
+
+    def _escribible(self) -> None:
+        """Pasa a arrays propios las partes que son vistas de solo lectura."""
+        if not isinstance(self.codigos, array):
+            self.codigos = _a_array(self.codigos)
+            self.bloque = bytearray(self.bloque)
+            self.inicios = _a_array(self.inicios)
+
+    def agregar(self, valor: Optional[str]) -> None:
+        self._escribible()
+        codigo = self.codificar(valor)  # puede cambiar el tipo de self.codigos
+        self.codigos.append(codigo)
+
+    def distintos(self) -> int:
+        return len(self.inicios) - 1
+
+    def valor(self, codigo: int) -> Optional[str]:
+        if codigo == self._codigo_nulo:
+            return None
+        return str(self.bloque[self.inicios[codigo]:self.inicios[codigo + 1]], 'utf-8')
+
+    def valores(self) -> Iterator[Optional[str]]:
+        return (self.valor(c) for c in range(self.distintos()))
+
+    def _hueco(self, valor: str, datos: bytes):
+        """Posición de la tabla donde está (o iría) valor y su código, -1 si no está."""
+        if self._tabla is None:
+            self._rehacer_tabla()
+        tabla, bloque, inicios = self._tabla, self.bloque, self.inicios
+        mascara = len(tabla) - 1
+        i = hash(valor) & mascara
+        while True:
+            codigo = tabla[i]
+            if codigo == -1 or bloque[inicios[codigo]:inicios[codigo + 1]] == datos:
+                return i, codigo
+            i = (i + 1) & mascara
+
+    def codigo_exacto(self, valor: Optional[str]) -> Optional[int]:
+        """Código del valor si ya existe en la columna."""
+        if valor is None:
+            return self._codigo_nulo
+        if not isinstance(valor, str):
+            return None
+        codigo = self._cache.get(valor)
+        if codigo is None:
+            codigo = self._hueco(valor, valor.encode('utf-8'))[1]
+        return None if codigo == -1 else codigo
+
+    def codificar(self, valor: Optional[str]) -> int:
+        """Devuelve el código del valor, dándolo de alta si es nuevo."""
+        if valor is not None and not isinstance(valor, str):
+            raise ValueError(f"Se esperaba un texto o None: {valor!r}")
+        codigo = self._cache.get(valor) if valor is not None else self._codigo_nulo
+        if codigo is not None:
+            return codigo
+        self._escribible()
+        nuevo = True
+        if valor is None:
+            codigo = self._codigo_nulo = self._nuevo_codigo(b'')
+        else:
+            datos = valor.encode('utf-8')
+            hueco, codigo = self._hueco(valor, datos)
+            nuevo = codigo == -1
+            if nuevo:
+                codigo = self._nuevo_codigo(datos)
+                self._tabla[hueco] = codigo
+                if 2 * self.distintos() > len(self._tabla):
+                    self._rehacer_tabla()
+            if len(self._cache) < self._MAX_CACHE:
+                self._cache[valor] = codigo
+        # Solo los códigos nuevos: uno que ya existía ya está en su lista
+        if nuevo and self._por_normalizado is not None:
+            self._por_normalizado.setdefault(_norm_str(valor), []).append(codigo)
+        return codigo
+
+    def _nuevo_codigo(self, datos: bytes) -> int:
+        codigo = self.distintos()
+        self.bloque += datos
+        self.inicios.append(len(self.bloque))
+        if codigo >= 1 << (8 * self.codigos.itemsize):
+            self.codigos = array('H' if codigo < 1 << 16 else 'I', self.codigos)
+        return codigo
+
+    def _rehacer_tabla(self) -> None:
+        tamano = 16
+        while tamano < 4 * self.distintos():
+            tamano *= 2
+        self._tabla = array('i', [-1]) * tamano
+        for codigo in range(self.distintos()):
+            valor = self.valor(codigo)
+            if valor is not None:
+                hueco, _ = self._hueco(valor, valor.encode('utf-8'))
+                self._tabla[hueco] = codigo
+
+    def codigos_normalizados(self, valor: str) -> List[int]:
+        """Códigos de los valores que coinciden con valor sin distinguir mayúsculas."""
+        if self._por_normalizado is None:
+            # Se normaliza cada valor distinto una sola vez, no en cada consulta
+            self._por_normalizado = {}
+            for codigo, v in enumerate(self.valores()):
+                self._por_normalizado.setdefault(_norm_str(v), []).append(codigo)
+        return self._por_normalizado.get(_norm_str(valor), [])
+
+    def memoria_bytes(self) -> int:
+        return (len(self.codigos) * self.codigos.itemsize + len(self.bloque)
+                + len(self.inicios) * 8 + len(self._tabla or ()) * 4)
+
+    def __getitem__(self, i: int) -> Optional[str]:
+        return self.valor(self.codigos[i])
+
+    def __len__(self) -> int:
+        return len(self.codigos)
+
+class AlmacenProductos:
+    """
+    Catálogo de productos en columnas en lugar de una lista de diccionarios.
+
+    id, precio, stock y disponible se guardan en arreglos tipados y nombre,
+    marca y categoría como columnas codificadas con diccionario, con lo que un
+    producto ocupa unas decenas de bytes en lugar de ~1 KB. Con NumPy los
+    filtros se evalúan vectorizados sobre las columnas.
+
+    Las funciones buscar_productos_* y calcular_valor_inventario_total de los
+    demás módulos aceptan un almacén en lugar de la lista: si la colección
+    tiene un método con el mismo nombre que la función, le delegan la búsqueda.
+    Los resultados son diccionarios nuevos con las siete columnas.
+    """
+
+    def __init__(self, productos: Iterable[Dict[str, Any]] = ()):
+        self.ids = array('q')
+        self.precios = array('d')
+        self.stocks = array('q')
+        self.disponibles = bytearray()
+        self.nombres = ColumnaDiccionario()
+        self.marcas = ColumnaDiccionario()
+        self.categorias = ColumnaDiccionario()
+        # Índices ordenados por columna (ver orden()), construidos al primer uso
+        self._ordenes: Dict[str, tuple] = {}
+        # Aumenta con cada alta o cambio de stock (ver Inventario)
+        self.version = 0
+        self.agregar_lote(productos)
+
+    @classmethod
+    def desde_columnas(cls, ids, precios, stocks, disponibles, nombres: ColumnaDiccionario,
+                       marcas: ColumnaDiccionario, categorias: ColumnaDiccionario,
+                       ordenes: Optional[Dict[str, tuple]] = None) -> 'AlmacenProductos':
+        """
+        Almacén sobre columnas ya construidas, sin copiarlas; pueden ser vistas
+        de una instantánea abierta con mmap. Se copian a arrays propios la
+        primera vez que se agrega un producto.
+        """
+        almacen = cls()
+        almacen.ids, almacen.precios, almacen.stocks, almacen.disponibles = ids, precios, stocks, disponibles
+        almacen.nombres, almacen.marcas, almacen.categorias = nombres, marcas, categorias
+        almacen._ordenes = dict(ordenes or {})
+        return almacen
+
+    def _escribible(self) -> None:
+        self.ids = _a_array(self.ids)
+        self.precios = _a_array(self.precios)
+        self.stocks = _a_array(self.stocks)
+        if self.stocks.typecode != 'q':
+            # Instantáneas anteriores guardaban el stock en 32 bits
+            self.stocks = array('q', self.stocks)
+        self.disponibles = bytearray(self.disponibles)
+
+    # ---------- carga y acceso ----------
+
+    def agregar(self, producto: Dict[str, Any]) -> None:
+        """Agrega un producto al final del almacén."""
+        id_producto = producto.get('id')
+        if not isinstance(id_producto, int):
+            raise ValueError(f"El producto necesita un 'id' entero: {producto!r}")
+        # Se comprueba todo antes de escribir para no dejar una fila a medias
+        precio, stock = producto.get('precio', 0.0), producto.get('stock', 0)
+        for campo, valor in (('precio', precio), ('stock', stock)):
+            if not isinstance(valor, Real):
+                raise ValueError(f"El producto necesita un '{campo}' numérico: {producto!r}")
+        if not -_MAX_STOCK - 1 <= stock <= _MAX_STOCK:
+            raise ValueError(f"El 'stock' del producto no cabe en 64 bits: {producto!r}")
+        for campo in _TEXTO:
+            valor = producto.get(campo)
+            if valor is not None and not isinstance(valor, str):
+                raise ValueError(f"El '{campo}' del producto debe ser texto: {producto!r}")
+        if not isinstance(self.ids, array) or _tipo(self.stocks) != 'q':
+            self._escribible()
+        if self._ordenes:
+            self._ordenes = {}
+        self.ids.append(id_producto)
+        self.precios.append(float(precio))
+        self.stocks.append(int(stock))
+        self.disponibles.append(1 if producto.get('disponible') else 0)
+        self.nombres.agregar(producto.get('nombre'))
+        self.marcas.agregar(producto.get('marca'))
+        self.categorias.agregar(producto.get('categoria'))
+        self.version += 1
+
+    def agregar_lote(self, productos: Iterable[Dict[str, Any]]) -> None:
+        for producto in productos:
+            self.agregar(producto)
+
+    def fila(self, i: int) -> Dict[str, Any]:
+        """Reconstruye el producto de la posición i como diccionario."""
+        return {
+            'id': self.ids[i],
+            'nombre': self.nombres[i],
+            'marca': self.marcas[i],
+            'categoria': self.categorias[i],
+            'precio': self.precios[i],
+            'stock': self.stocks[i],
+            'disponible': bool(self.disponibles[i]),
+        }
+
+    def filas(self, posiciones: Iterable[int]) -> List[Dict[str, Any]]:
+        return [self.fila(i) for i in posiciones]
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for i in range(len(self)):
+            yield self.fila(i)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return self.filas(range(*i.indices(len(self))))
+        if i < 0:
+            i += len(self)
+        return self.fila(i)
+
+    def memoria_bytes(self) -> int:
+        """Memoria aproximada de las columnas y de los diccionarios de texto."""
+        total = sum(len(c) * c.itemsize for c in (self.ids, self.precios, self.stocks))
+        total += len(self.disponibles)
+        return total + sum(c.memoria_bytes() for c in self._textos().values())
+
+    # ---------- evaluación de condiciones ----------
+
+    def _textos(self) -> Dict[str, ColumnaDiccionario]:
+        return {'nombre': self.nombres, 'marca': self.marcas, 'categoria': self.categorias}
+
+    def _columna(self, nombre: str):
+        return {'id': self.ids, 'precio': self.precios, 'stock': self.stocks,
+                'disponible': self.disponibles, 'nombre': self.nombres.codigos,
+                'marca': self.marcas.codigos, 'categoria': self.categorias.codigos}[nombre]
+
+    def _posiciones(self, condiciones: List[tuple]) -> List[int]:
+        """
+        Posiciones que cumplen todas las condiciones (columna, operador, valor).
+        Operadores: '>=', '<=', '>', '==', 'en' (valor es un conjunto de códigos).
+        """
+        n = len(self)
+        if np is not None:
+            mascara = np.ones(n, dtype=bool)
+            for nombre, op, valor in condiciones:
+                col = self._columna(nombre)
+                vista = np.frombuffer(col, dtype=bool if nombre == 'disponible' else _tipo(col))
+                if op == '>=':
+                    mascara &= vista >= valor
+                elif op == '<=':
+                    mascara &= vista <= valor
+                elif op == '>':
+                    mascara &= vista > valor
+                elif op == '==':
+                    mascara &= vista == valor
+                elif len(valor) == 1:
+                    mascara &= vista == next(iter(valor))
+                else:
+                    mascara &= np.isin(vista, list(valor))
+                del vista
+            return np.flatnonzero(mascara).tolist()
+
+        candidatos: Iterable[int] = range(n)
+        for nombre, op, valor in condiciones:
+            col = self._columna(nombre)
+            if op == '>=':
+                candidatos = [i for i in candidatos if col[i] >= valor]
+            elif op == '<=':
+                candidatos = [i for i in candidatos if col[i] <= valor]
+            elif op == '>':
+                candidatos = [i for i in candidatos if col[i] > valor]
+            elif op == '==':
+                candidatos = [i for i in candidatos if col[i] == valor]
+            else:
+                candidatos = [i for i in candidatos if col[i] in valor]
+        return list(candidatos)
+
+    def orden(self, campo: str) -> tuple:
+        """
+        Índice ordenado de la columna 'id' o 'precio': (valores en orden,
+        posición de cada uno), con los empates en orden de posición y sin los
+        NaN. Se construye al primer uso (o viene de la instantánea) y se
+        descarta al agregar productos.
+        """
+        orden = self._ordenes.get(campo)
+        if orden is None:
+            columna = self._columna(campo)
+            tipo = _tipo(columna)
+            if np is not None:
+                valores = np.frombuffer(columna, dtype=tipo)
+                posiciones = np.argsort(valores, kind='stable')
+                if tipo == 'd':
+                    posiciones = posiciones[~np.isnan(valores[posiciones])]
+                orden = (array(tipo, valores[posiciones].tobytes()), array('q', posiciones.astype('q').tobytes()))
+            else:
+                posiciones = sorted((i for i in range(len(columna)) if columna[i] == columna[i]),
+                                    key=columna.__getitem__)
+                orden = (array(tipo, [columna[i] for i in posiciones]), array('q', posiciones))
+            self._ordenes[campo] = orden
+        return orden
+
+    def _condicion_exacta(self, clave: str, valor) -> Optional[tuple]:
+        """Traduce una comparación exacta a condición; None si nada puede cumplirla."""
+        if clave in _TEXTO:
+            columna = self._textos()[clave]
+            if isinstance(valor, str):
+                codigos = set(columna.codigos_normalizados(valor))
+            else:
+                codigo = columna.codigo_exacto(valor)
+                codigos = set() if codigo is None else {codigo}
+            return (clave, 'en', codigos) if codigos else None
+        if isinstance(valor, (int, float)):
+            return (clave, '==', valor)
+        return None
+
+    def _filtrar(self, filtros: Dict[str, Any], rangos: bool) -> List[Dict[str, Any]]:
+        condiciones = []
+        for clave, valor in filtros.items():
+            if rangos and clave in ('precio_min', 'precio_max', 'stock_min', 'stock_max'):
+                condiciones.append((clave.split('_')[0], '>=' if clave.endswith('min') else '<=', valor))
+            elif clave in COLUMNAS:
+                condicion = self._condicion_exacta(clave, valor)
+                if condicion is None:
+                    return []
+                condiciones.append(condicion)
+            else:
+                return []
+        return self.filas(self._posiciones(condiciones))
+
+    # ---------- mismas búsquedas que las funciones de los módulos ----------
+
+    def buscar_producto_por_id(self, id_buscado) -> Optional[Dict[str, Any]]:
+        if not isinstance(id_buscado, Real) or id_buscado != id_buscado:
+            return None
+        valores, posiciones = self.orden('id')
+        i = bisect_left(valores, id_buscado)
+        return self.fila(posiciones[i]) if i < len(valores) and valores[i] == id_buscado else None
+
+    def buscar_productos_por_categoria(self, categoria_buscada: str) -> List[Dict[str, Any]]:
+        return self._filtrar({'categoria': categoria_buscada}, rangos=False)
+
+    def buscar_productos_por_marca(self, marca_buscada: str) -> List[Dict[str, Any]]:
+        return self._filtrar({'marca': marca_buscada}, rangos=False)
+
+    def buscar_productos_disponibles(self) -> List[Dict[str, Any]]:
+        return self.filas(self._posiciones([('disponible', '==', True), ('stock', '>', 0)]))
+
+    def buscar_productos_sin_stock(self) -> List[Dict[str, Any]]:
+        return self.filas(self._posiciones([('stock', '==', 0)]))
+
+    def buscar_productos_por_rango_precio(self, precio_min: float, precio_max: float) -> List[Dict[str, Any]]:
+        if not precio_min <= precio_max:
+            return []
+        valores, posiciones = self.orden('precio')
+        desde, hasta = bisect_left(valores, precio_min), bisect_right(valores, precio_max)
+        if np is not None:
+            return self.filas(np.sort(np.frombuffer(posiciones, dtype='q')[desde:hasta]).tolist())
+        return self.filas(sorted(posiciones[desde:hasta]))
+
+    def buscar_productos_por_stock_minimo(self, stock_minimo: int) -> List[Dict[str, Any]]:
+        return self.filas(self._posiciones([('stock', '>=', stock_minimo)]))
+
+    def buscar_productos_bajo_stock(self, limite_stock: int = 5) -> List[Dict[str, Any]]:
+        return self.filas(self._posiciones([('stock', '>', 0), ('stock', '<=', limite_stock)]))
+
+    def buscar_productos_con_filtros(self, **filtros) -> List[Dict[str, Any]]:
+        return self._filtrar(filtros, rangos=False)
+
+    def buscar_productos_con_filtros_multiples(self, **filtros) -> List[Dict[str, Any]]:
+        return self._filtrar(filtros, rangos=True)
+
+    def calcular_valor_inventario_total(self) -> float:
+        if np is not None and len(self):
+            return float(np.dot(np.frombuffer(self.precios, dtype='d'),
+                                np.frombuffer(self.stocks, dtype=_tipo(self.stocks)).astype('d')))
+        return sum(map(mul, self.precios, self.stocks))
+
+    def estadisticas_productos(self) -> Dict[str, Any]:
+        """Las cifras de mostrar_estadisticas, contando sobre las columnas."""
+        codigos = self.categorias.codigos
+        if np is not None:
+            conteos = np.bincount(np.frombuffer(codigos, dtype=_tipo(codigos)),
+                                  minlength=self.categorias.distintos()).tolist()
+        else:
+            conteos = [0] * self.categorias.distintos()
+            for codigo in codigos:
+                conteos[codigo] += 1
+        # Los códigos se asignan por orden de aparición, el mismo orden que el conteo de la lista
+        por_categoria: Dict[Any, int] = {}
+        for codigo, cantidad in enumerate(conteos):
+            if cantidad:
+                categoria = self.categorias.valor(codigo)
+                categoria = 'Sin categoría' if categoria is None else categoria
+                por_categoria[categoria] = por_categoria.get(categoria, 0) + cantidad
+        return {'total': len(self),
+                'disponibles': len(self._posiciones([('disponible', '==', True), ('stock', '>', 0)])),
+                'sin_stock': len(self._posiciones([('stock', '==', 0)])),
+                'valor_inventario': self.calcular_valor_inventario_total(),
+                'por_categoria': por_categoria}
+
+if __name__ == "__main__":
+    productos = [
+        {'id': 1, 'nombre': 'iPhone 15', 'marca': 'Apple', 'categoria': 'Smartphone', 'precio': 999.99, 'stock': 10, 'disponible': True},
+        {'id': 2, 'nombre': 'Samsung Galaxy S24', 'marca': 'Samsung', 'categoria': 'Smartphone', 'precio': 899.99, 'stock': 8, 'disponible': True},
+        {'id': 3, 'nombre': 'MacBook Air M3', 'marca': 'Apple', 'categoria': 'Laptop', 'precio': 1299.99, 'stock': 5, 'disponible': True},
+        {'id': 4, 'nombre': 'Dell XPS 13', 'marca': 'Dell', 'categoria': 'Laptop', 'precio': 1199.99, 'stock': 0, 'disponible': False},
+        {'id': 5, 'nombre': 'Sony WH-1000XM5', 'marca': 'Sony', 'categoria': 'Audífonos', 'precio': 399.99, 'stock': 15, 'disponible': True}
+    ]
+    almacen = AlmacenProductos(productos)
+
+    print("=== PRUEBAS DEL ALMACÉN COLUMNAR DE PRODUCTOS ===\n")
+    print(f"1. Productos almacenados: {len(almacen)} ({almacen.memoria_bytes()} bytes)")
+
+    print("\n2. Productos Apple:")
+    for producto in almacen.buscar_productos_por_marca('apple'):
+        print(f"   - {producto['nombre']} (${producto['precio']})")
+
+    print("\n3. Laptops disponibles con stock:")
+    for producto in almacen.buscar_productos_con_filtros_multiples(categoria='Laptop', disponible=True, stock_min=1):
+        print(f"   - {producto['nombre']} (Stock: {producto['stock']})")
+
+    print(f"\n4. Valor total del inventario: ${almacen.calcular_valor_inventario_total():,.2f}")
@@ -0,0 +1,160 @@
+import heapq
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from normalizacion import clave_texto
+
+def clave_prefijo(valor) -> str:
+    """
+    Como clave_texto, pero si el texto acaba en espacio se conserva uno: así
+    'ana ' completa 'Ana García' y no 'Anabel'.
+    """
+    clave = clave_texto(valor)
+    if clave and valor[-1:].isspace():
+        clave += ' '
+    return clave
+
+def nombre_completo(registro: Dict[str, Any]) -> str:
+    """'nombre apellido' de un empleado, la clave con la que se autocompletan."""
+    return f"{registro.get('nombre', '')} {registro.get('apellido', '')}"
+
+def _claves(registros: Iterable[Dict[str, Any]], calculo: Callable[[Dict[str, Any]], Any],
+            prefijo: str) -> Iterator[Tuple[str, int]]:
+    for i, registro in enumerate(registros):
+        clave = clave_texto(calculo(registro))
+        if clave and clave.startswith(prefijo):
+            yield clave, i
+
+def completar_en(registros: Iterable[Dict[str, Any]], prefijo: str, cantidad: int = 10,
+                 campo: str = 'nombre',
+                 calculo: Optional[Callable[[Dict[str, Any]], Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Versión recorriendo todos los registros, para listas sin índice: los
+    mismos registros y en el mismo orden que IndicePrefijos.completar().
+    """
+    registros = list(registros)
+    calculo = calculo or (lambda registro: registro.get(campo))
+    mejores = heapq.nsmallest(cantidad, _claves(registros, calculo, clave_prefijo(prefijo)))
+    return [registros[i] for _, i in mejores]
+
+class IndicePrefijos:
+    """
+    Índice de autocompletado: las claves normalizadas de un campo (o de un
+    texto calculado a partir del registro), ordenadas, con la posición de
+    cada una en un array paralelo de enteros de 4 bytes.
+
+    Las claves que empiezan por un prefijo quedan seguidas, así que las N
+    primeras completaciones salen con una bisección y N pasos, sin recorrer
+    el resto. Frente a un trie, que necesita un diccionario por nodo, ocupa
+    un puntero y 4 bytes por entrada más las claves, y estas son las mismas
+    cadenas internadas que usan los demás índices.
+
+    Se registra en un Catalogo como cualquier otro índice.
+    """
+
+    def __init__(self, campo: str = 'nombre', calculo: Optional[Callable[[Dict[str, Any]], Any]] = None):
+        self.campo = campo
+        self.calculo = calculo
+        self.claves: List[str] = []
+        self.posiciones = array('i')
+
+    def clave(self, registro: Dict[str, Any]) -> str:
+        return clave_texto(self.calculo(registro) if self.calculo is not None else registro.get(self.campo))
+
+    def _hueco(self, clave: str, pos: int) -> int:
+        """Índice donde está o iría (clave, pos): entre claves iguales, por posición."""
+        desde = bisect_left(self.claves, clave)
+        hasta = bisect_right(self.claves, clave, desde)
+        return bisect_left(self.posiciones, pos, desde, hasta)
+
+    def construir(self, filas: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        if self.claves:
+            for pos, registro in filas:
+                self.insertar(pos, registro)
+            return
+        pares = []
+        for pos, registro in filas:
+            clave = self.clave(registro)
+            if clave:
+                pares.append((clave, pos))
+        pares.sort()
+        self.claves = [clave for clave, _ in pares]
+        self.posiciones = array('i', [pos for _, pos in pares])
+
+    def verificar(self, pos: int, registro: Dict[str, Any]) -> None:
+        pass
+
+    def insertar(self, pos: int, registro: Dict[str, Any]) -> None:
+        clave = self.clave(registro)
+        if clave:
+            i = self._hueco(clave, pos)
+            self.claves.insert(i, clave)
+            self.posiciones.insert(i, pos)
+
+    def eliminar(self, pos: int, registro: Dict[str, Any]) -> None:
+        clave = self.clave(registro)
+        if not clave:
+            return
+        i = self._hueco(clave, pos)
+        if i < len(self.posiciones) and self.posiciones[i] == pos and self.claves[i] == clave:
+            del self.claves[i]
+            del self.posiciones[i]
+
+    def actualizar(self, pos: int, anterior: Dict[str, Any], nuevo: Dict[str, Any]) -> None:
+        if self.clave(anterior) != self.clave(nuevo):
+            self.eliminar(pos, anterior)
+            self.insertar(pos, nuevo)
+
+    def completar(self, prefijo: str, cantidad: int = 10) -> List[int]:
+        """Posiciones de las `cantidad` primeras claves (en orden alfabético) que empiezan por el prefijo."""
+        prefijo = clave_prefijo(prefijo)
+        claves, posiciones = self.claves, self.posiciones
+        i = bisect_left(claves, prefijo)
+        fin = min(i + max(cantidad, 0), len(claves))
+        resultado = []
+        while i < fin and claves[i].startswith(prefijo):
+            resultado.append(posiciones[i])
+            i += 1
+        return resultado
+
+    def contar(self, prefijo: str) -> int:
+        """Cuántas claves empiezan por el prefijo, con dos bisecciones."""
+        prefijo = clave_prefijo(prefijo)
+        return bisect_left(self.claves, prefijo + '\U0010ffff') - bisect_left(self.claves, prefijo)
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from benchmark import generar_empleados, generar_productos
+
+    print("=== PRUEBAS DE AUTOCOMPLETADO ===\n")
+    empleados = [
+        {'id': 101, 'nombre': 'Ana', 'apellido': 'García'},
+        {'id': 102, 'nombre': 'Anabel', 'apellido': 'Ruiz'},
+        {'id': 103, 'nombre': 'Carlos', 'apellido': 'López'},
+    ]
+    indice = IndicePrefijos(calculo=nombre_completo)
+    indice.construir(enumerate(empleados))
+    for prefijo in ['an', 'ana ', 'ANA GAR', 'car']:
+        print(f"   {prefijo!r:10} -> {[nombre_completo(empleados[pos]) for pos in indice.completar(prefijo)]}")
+
+    n = 1_000_000
+    for nombre, registros, indice, mostrar, prefijos in [
+        ("productos", generar_productos(n), IndicePrefijos('nombre'), lambda p: p['nombre'],
+         ['s', 'samsung modelo 12', 'dell modelo 99999']),
+        ("empleados", generar_empleados(n), IndicePrefijos(calculo=nombre_completo), nombre_completo,
+         ['a', 'ana garcia9', 'ÁNA GARCÍA12']),
+    ]:
+        inicio = time.perf_counter()
+        indice.construir(enumerate(registros))
+        memoria = sys.getsizeof(indice.claves) + indice.posiciones.itemsize * len(indice.posiciones)
+        print(f"\n{n:,} {nombre}: índice en {time.perf_counter() - inicio:.1f}s, "
+              f"{memoria / 1e6:.0f} MB sin contar las claves")
+        for prefijo in prefijos:
+            inicio = time.perf_counter()
+            completados = indice.completar(prefijo, 3)
+            us = (time.perf_counter() - inicio) * 1e6
+            print(f"   {prefijo!r:20} -> {indice.contar(prefijo):>7,} en total, "
+                  f"{[mostrar(registros[pos]) for pos in completados]} ({us:.0f} µs)")
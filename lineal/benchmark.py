@@ -0,0 +1,281 @@
+"""
+Banco de pruebas de rendimiento para todas las funciones de búsqueda del paquete.
+
+Genera catálogos de productos y plantillas de empleados de 10^3 a 10^7 registros,
+mide cada función de búsqueda y guarda operaciones por segundo, latencias p50/p99
+y memoria pico en JSON. Un resultado guardado como base se puede comparar con una
+ejecución posterior:
+
+    python benchmark.py --tamanos 1000 10000 --salida actual.json
+    python benchmark.py --base base.json --actualizar-base
+    python benchmark.py --base base.json          # compara contra la base
+"""
+import argparse
+import contextlib
+import importlib
+import inspect
+import io
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+MODULOS = ['Búsqueda_Lineal', 'producto', 'productos_disponibles', 'Sistema_Integrado', 'empleado']
+TAMANOS = [10 ** k for k in range(3, 8)]
+PREFIJOS = ('busqueda_lineal_simple', 'buscar_producto', 'buscar_empleado', 'autocompletar_')
+
+MARCAS = ['Apple', 'Samsung', 'Dell', 'Sony', 'Logitech', 'HP', 'Lenovo', 'Asus']
+CATEGORIAS = ['Smartphone', 'Laptop', 'Tablet', 'Audífonos', 'Accesorios']
+DEPARTAMENTOS = ['Ventas', 'Técnico', 'Inventario', 'Administración']
+NOMBRES = ['Ana', 'Carlos', 'María', 'José', 'Laura', 'Pedro', 'Lucía', 'Javier']
+APELLIDOS = ['García', 'López', 'Rodríguez', 'Martínez', 'Hernández', 'Gómez', 'Pérez']
+
+# ===============================
+# GENERACIÓN DE DATOS
+# ===============================
+
+def generar_productos(n: int, semilla: int = 42) -> List[Dict[str, Any]]:
+    """Genera n productos con la misma forma que los datos de ejemplo."""
+    rnd = random.Random(semilla)
+    productos = []
+    for i in range(1, n + 1):
+        marca = rnd.choice(MARCAS)
+        stock = rnd.choice([0, rnd.randint(1, 5), rnd.randint(6, 50)])
+        productos.append({
+            'id': i,
+            'nombre': f"{marca} Modelo {i}",
+            'marca': marca,
+            'categoria': rnd.choice(CATEGORIAS),
+            'precio': round(rnd.uniform(10, 3000), 2),
+            'stock': stock,
+            'disponible': stock > 0 and rnd.random() < 0.95,
+        })
+    return productos
+
+def generar_empleados(n: int, semilla: int = 42) -> List[Dict[str, Any]]:
+    """Genera n empleados con la misma forma que los datos de ejemplo."""
+    rnd = random.Random(semilla)
+    return [{
+        'id': 100 + i,
+        'nombre': rnd.choice(NOMBRES),
+        'apellido': f"{rnd.choice(APELLIDOS)}{i}",
+        'departamento': rnd.choice(DEPARTAMENTOS),
+        'salario': rnd.randrange(25000, 60000, 500),
+        'activo': rnd.random() < 0.8,
+    } for i in range(1, n + 1)]
+
+# ===============================
+# ARGUMENTOS DE CADA FUNCIÓN
+# ===============================
+
+def _argumentos(nombre: str, datos: Dict[str, list], rnd: random.Random) -> Optional[List[tuple]]:
+    """
+    Devuelve una lista de llamadas (tuplas de argumentos) para la función, mezclando
+    aciertos y fallos. None si la función no se sabe medir.
+    """
+    productos, empleados, numeros = datos['productos'], datos['empleados'], datos['numeros']
+    n = len(productos)
+    p = [productos[rnd.randrange(n)] for _ in range(8)]
+    e = [empleados[rnd.randrange(n)] for _ in range(8)]
+    tabla: Dict[str, Callable[[], List[tuple]]] = {
+        'busqueda_lineal_simple': lambda: [(numeros, numeros[rnd.randrange(n)]) for _ in range(8)] + [(numeros, -1)],
+        'buscar_producto_por_nombre': lambda: [(productos, x['nombre']) for x in p] + [(productos, 'Inexistente')],
+        'buscar_producto_por_id': lambda: [(productos, x['id']) for x in p] + [(productos, -1)],
+        'buscar_productos_por_categoria': lambda: [(productos, c) for c in CATEGORIAS],
+        'buscar_productos_por_marca': lambda: [(productos, m) for m in MARCAS],
+        'buscar_productos_disponibles': lambda: [(productos,)],
+        'buscar_productos_sin_stock': lambda: [(productos,)],
+        'buscar_productos_por_rango_precio': lambda: [(productos, 100, 500), (productos, 900, 1000)],
+        'buscar_productos_por_stock_minimo': lambda: [(productos, 10), (productos, 40)],
+        'buscar_productos_bajo_stock': lambda: [(productos, 5)],
+        'buscar_productos_parecidos': lambda: [(productos, x['nombre'][:-1] + 'x') for x in p[:4]] + [(productos, 'Inexistente')],
+        'buscar_productos_por_texto': lambda: [(productos, 'apple modelo'), (productos, f"{p[0]['marca']} {p[0]['id']}"),
+                                               (productos, 'samsung laptop', 'o', 10)],
+        'autocompletar_productos': lambda: [(productos, x['nombre'][:k]) for x, k in zip(p, range(1, 9))],
+        'buscar_empleado_por_id': lambda: [(empleados, x['id']) for x in e] + [(empleados, -1)],
+        'buscar_empleado_por_nombre_completo': lambda: [(empleados, f"{x['nombre']} {x['apellido']}") for x in e],
+        'buscar_empleados_por_departamento': lambda: [(empleados, d) for d in DEPARTAMENTOS],
+        'buscar_empleados_activos': lambda: [(empleados,)],
+        'buscar_empleados_por_rango_salario': lambda: [(empleados, 35000, 40000)],
+        'buscar_empleados_por_nombre_o_apellido': lambda: [(empleados, 'Garc'), (empleados, 'Mar')],
+        'autocompletar_empleados': lambda: [(empleados, f"{x['nombre']} {x['apellido']}"[:k]) for x, k in zip(e, range(2, 10))],
+    }
+    if nombre in tabla:
+        return tabla[nombre]()
+    return None
+
+# Funciones con filtros por **kwargs: se miden con criterios fijos
+_KWARGS = {
+    'buscar_productos_con_filtros': [{'marca': 'Apple', 'categoria': 'Smartphone'}],
+    'buscar_productos_con_filtros_multiples': [
+        {'marca': 'Apple', 'disponible': True, 'precio_min': 200, 'precio_max': 800},
+        {'categoria': 'Laptop', 'disponible': True, 'stock_min': 1},
+    ],
+    'buscar_empleados_avanzado': [
+        {'departamento': 'Técnico', 'activo': True},
+        {'salario_min': 40000, 'activo': True},
+    ],
+}
+
+# ===============================
+# MEDICIÓN
+# ===============================
+
+def importar_silencioso(nombre: str):
+    """Importa un módulo del paquete descartando las pruebas que imprime al cargarse."""
+    with contextlib.redirect_stdout(io.StringIO()):
+        return importlib.import_module(nombre)
+
+def descubrir_funciones() -> List[tuple]:
+    """
+    Devuelve (módulo, nombre, función) de todas las funciones de búsqueda.
+    Las de los menús no reciben argumentos (piden los datos por teclado) y
+    no se incluyen.
+    """
+    encontradas = []
+    for nombre_modulo in MODULOS:
+        modulo = importar_silencioso(nombre_modulo)
+        for nombre, valor in vars(modulo).items():
+            if callable(valor) and nombre.startswith(PREFIJOS) and getattr(valor, '__module__', None) == modulo.__name__:
+                if inspect.signature(valor).parameters:
+                    encontradas.append((nombre_modulo, nombre, valor))
+    return encontradas
+
+def medir(funcion: Callable, llamadas: List[tuple], kwargs: List[dict],
+          tiempo_max: float = 0.5, min_iteraciones: int = 3) -> Dict[str, Any]:
+    """Llama a la función en bucle y devuelve ops/seg, latencias y memoria pico."""
+    if kwargs:
+        invocaciones = [(llamadas[0], kw) for kw in kwargs]
+    else:
+        invocaciones = [(args, {}) for args in llamadas]
+    latencias = []
+    inicio = time.perf_counter()
+    i = 0
+    while i < min_iteraciones or time.perf_counter() - inicio < tiempo_max:
+        args, kw = invocaciones[i % len(invocaciones)]
+        t0 = time.perf_counter_ns()
+        funcion(*args, **kw)
+        latencias.append(time.perf_counter_ns() - t0)
+        i += 1
+    total = sum(latencias) / 1e9
+
+    args, kw = invocaciones[0]
+    tracemalloc.start()
+    funcion(*args, **kw)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencias.sort()
+    return {
+        'iteraciones': len(latencias),
+        'ops_por_seg': len(latencias) / total if total else float('inf'),
+        'p50_us': latencias[len(latencias) // 2] / 1e3,
+        'p99_us': latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))] / 1e3,
+        'memoria_pico_bytes': pico,
+    }
+
+def ejecutar(tamanos: List[int], tiempo_max: float = 0.5, filtro: Optional[str] = None) -> Dict[str, Any]:
+    """Ejecuta el banco completo y devuelve el informe como diccionario serializable."""
+    funciones = descubrir_funciones()
+    # Una función nueva sin argumentos en _argumentos se avisa, no se salta en silencio
+    muestra = {'productos': generar_productos(8), 'empleados': generar_empleados(8), 'numeros': list(range(8))}
+    sin_argumentos = [(m, nombre) for m, nombre, _ in funciones
+                      if nombre not in _KWARGS and _argumentos(nombre, muestra, random.Random(0)) is None]
+    for nombre_modulo, nombre in sin_argumentos:
+        print(f"⚠️  {nombre_modulo}.{nombre} no tiene argumentos de prueba en _argumentos: no se mide", file=sys.stderr)
+    funciones = [f for f in funciones if f[:2] not in sin_argumentos]
+    resultados = []
+    for n in tamanos:
+        datos = {
+            'productos': generar_productos(n),
+            'empleados': generar_empleados(n),
+            'numeros': [random.Random(n).randrange(n * 10) for _ in range(n)],
+        }
+        for nombre_modulo, nombre, funcion in funciones:
+            clave = f"{nombre_modulo}.{nombre}"
+            if filtro and filtro not in clave:
+                continue
+            rnd = random.Random(f"{clave}:{n}")
+            kwargs = _KWARGS.get(nombre, [])
+            if kwargs:
+                coleccion = datos['empleados'] if 'empleado' in nombre else datos['productos']
+                llamadas = [(coleccion,)]
+            else:
+                llamadas = _argumentos(nombre, datos, rnd)
+            resultado = {'funcion': clave, 'n': n}
+            resultado.update(medir(funcion, llamadas, kwargs, tiempo_max))
+            resultados.append(resultado)
+            print(f"   {clave:<60} n={n:<9} {resultado['ops_por_seg']:>12.1f} ops/s  "
+                  f"p50={resultado['p50_us']:>10.1f}us  p99={resultado['p99_us']:>10.1f}us", file=sys.stderr)
+        del datos
+    return {
+        'meta': {
+            'fecha': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'plataforma': platform.platform(),
+        },
+        'resultados': resultados,
+    }
+
+def comparar(base: Dict[str, Any], actual: Dict[str, Any], tolerancia: float = 0.10) -> List[Dict[str, Any]]:
+    """
+    Compara dos informes por (función, n). Devuelve una fila por medición común con
+    el cociente actual/base de p50 y de ops/seg, marcando como regresión los
+    p50 que empeoran más de la tolerancia.
+    """
+    previos = {(r['funcion'], r['n']): r for r in base['resultados']}
+    filas = []
+    for r in actual['resultados']:
+        anterior = previos.get((r['funcion'], r['n']))
+        if not anterior:
+            continue
+        ratio_p50 = r['p50_us'] / anterior['p50_us'] if anterior['p50_us'] else float('inf')
+        filas.append({
+            'funcion': r['funcion'],
+            'n': r['n'],
+            'p50_base_us': anterior['p50_us'],
+            'p50_actual_us': r['p50_us'],
+            'ratio_p50': ratio_p50,
+            'ratio_ops': r['ops_por_seg'] / anterior['ops_por_seg'] if anterior['ops_por_seg'] else float('inf'),
+            'regresion': ratio_p50 > 1 + tolerancia,
+        })
+    return filas
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Banco de pruebas de las funciones de búsqueda.")
+    parser.add_argument('--tamanos', type=int, nargs='+', default=TAMANOS,
+                        help="Tamaños de los conjuntos de datos (por defecto 10^3 .. 10^7)")
+    parser.add_argument('--tiempo', type=float, default=0.5, help="Segundos de medición por función y tamaño")
+    parser.add_argument('--filtro', help="Solo mide funciones cuyo nombre contenga este texto")
+    parser.add_argument('--salida', help="Archivo JSON donde escribir el informe (por defecto, stdout)")
+    parser.add_argument('--base', help="Informe JSON de referencia contra el que comparar")
+    parser.add_argument('--actualizar-base', action='store_true', help="Guarda este informe como nueva base")
+    parser.add_argument('--tolerancia', type=float, default=0.10, help="Empeoramiento de p50 tolerado (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    informe = ejecutar(args.tamanos, args.tiempo, args.filtro)
+    if args.base and not args.actualizar_base:
+        with open(args.base, encoding='utf-8') as f:
+            informe['comparacion'] = comparar(json.load(f), informe, args.tolerancia)
+
+    texto = json.dumps(informe, indent=2, ensure_ascii=False)
+    if args.salida:
+        with open(args.salida, 'w', encoding='utf-8') as f:
+            f.write(texto)
+    else:
+        print(texto)
+    if args.base and args.actualizar_base:
+        with open(args.base, 'w', encoding='utf-8') as f:
+            f.write(texto)
+
+    regresiones = [c for c in informe.get('comparacion', []) if c['regresion']]
+    for c in regresiones:
+        print(f"❌ Regresión en {c['funcion']} (n={c['n']}): p50 x{c['ratio_p50']:.2f}", file=sys.stderr)
+    return 1 if regresiones else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
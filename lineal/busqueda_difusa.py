@@ -0,0 +1,301 @@
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from operator import itemgetter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from normalizacion import clave_texto
+
+# Relleno al inicio para que la primera y la segunda letra también formen trigramas
+_RELLENO = '\0\0'
+# Trigramas que puede romper un error: 3 una sustitución, inserción o
+# borrado, y 4 una transposición de letras vecinas
+_POR_ERROR = 4
+_VACIA = array('i')
+# Posiciones como mucho que se recorren para reunir candidatos (salvo las imprescindibles)
+_PRESUPUESTO = 20_000
+# Con menos candidatos que 1/_BISECCION del tamaño de una lista se buscan por bisección
+_BISECCION = 64
+
+def trigramas(clave: str) -> Dict[str, None]:
+    """Trigramas distintos de una clave ya normalizada, en orden de aparición."""
+    texto = _RELLENO + clave
+    return dict.fromkeys(texto[i:i + 3] for i in range(len(texto) - 2))
+
+def errores_por_defecto(clave: str) -> int:
+    """Errores tolerados según la longitud: ninguno hasta 2 letras, 1 hasta 5 y 2 a partir de ahí."""
+    return 0 if len(clave) <= 2 else 1 if len(clave) <= 5 else 2
+
+def _distancias(a: str, b: str, maximo: int) -> Tuple[int, int]:
+    """
+    Distancia de Damerau-Levenshtein (transposiciones de letras vecinas)
+    entre a y el prefijo de b más parecido, y entre a y b completa. Solo se
+    calculan las celdas a menos de `maximo` de la diagonal y se abandona en
+    cuanto ninguna puede quedar por debajo: las distancias mayores que
+    maximo se devuelven como maximo + 1.
+    """
+    n, m = len(a), len(b)
+    tope = maximo + 1
+    antepenultima: List[int] = []
+    anterior = [j if j <= maximo else tope for j in range(m + 1)]
+    for i in range(1, n + 1):
+        actual = [tope] * (m + 1)
+        if i <= maximo:
+            actual[0] = i
+        letra = a[i - 1]
+        for j in range(max(1, i - maximo), min(m, i + maximo) + 1):
+            otra = b[j - 1]
+            valor = anterior[j - 1] + (letra != otra)
+            if anterior[j] + 1 < valor:
+                valor = anterior[j] + 1
+            if actual[j - 1] + 1 < valor:
+                valor = actual[j - 1] + 1
+            if i > 1 and j > 1 and letra != otra and letra == b[j - 2] and a[i - 2] == otra:
+                if antepenultima[j - 2] + 1 < valor:
+                    valor = antepenultima[j - 2] + 1
+            actual[j] = valor if valor < tope else tope
+        if min(actual) >= tope and min(anterior) >= tope:
+            return tope, tope
+        antepenultima, anterior = anterior, actual
+    return min(anterior), anterior[m]
+
+def distancia(a: str, b: str, maximo: Optional[int] = None) -> int:
+    """Distancia de Damerau-Levenshtein entre dos textos; con maximo, se corta en maximo + 1."""
+    return _distancias(a, b, max(len(a), len(b)) if maximo is None else maximo)[1]
+
+def _clasificar(clave: str, candidatos: Iterable[Tuple[int, str]], limite: int,
+                maximo: int) -> List[Tuple[int, int]]:
+    """
+    (posición, distancia) de los mejores candidatos (posición, clave) a
+    distancia <= maximo. Antes los que coinciden con un prefijo más
+    parecido, después los más parecidos completos y por último por posición.
+    """
+    encontrados = []
+    for pos, otra in candidatos:
+        prefijo, completa = _distancias(clave, otra, maximo)
+        if prefijo <= maximo:
+            encontrados.append((prefijo, completa, pos))
+    encontrados.sort()
+    return [(pos, prefijo) for prefijo, _, pos in encontrados[:limite]]
+
+def puntuacion(clave: str, distancia_prefijo: int) -> float:
+    """Entre 0 y 1: 1 si coincide sin errores, menos cuantos más errores para su longitud."""
+    return round(1 - distancia_prefijo / max(len(clave), 1), 3)
+
+def parecidos_en(registros: Iterable[Dict[str, Any]], texto: str, campo: str = 'nombre', limite: int = 5,
+                 max_errores: Optional[int] = None) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    Versión recorriendo todos los registros, para listas sin índice: los
+    mismos criterios y puntuaciones que IndiceTrigramas.parecidos().
+    """
+    clave = clave_texto(texto)
+    if not clave:
+        return []
+    maximo = errores_por_defecto(clave) if max_errores is None else max_errores
+    registros = list(registros)
+    candidatos = ((pos, clave_texto(r.get(campo))) for pos, r in enumerate(registros))
+    return [(registros[pos], puntuacion(clave, d)) for pos, d in _clasificar(clave, candidatos, limite, maximo)]
+
+class IndiceTrigramas:
+    """
+    Índice invertido de trigramas de un campo de texto (normalizado): para
+    cada trigrama, las posiciones de los registros que lo contienen, en un
+    array ordenado de enteros de 4 bytes.
+
+    Una búsqueda aproximada no compara el texto con todos los registros:
+    un registro a k errores comparte con el texto al menos T - 4k de sus T
+    trigramas, así que basta con contar apariciones en las listas más
+    cortas, descartar los candidatos que no llegan y calcular la distancia
+    de edición (acotada) solo para los que quedan, de más a menos
+    prometedores, parando cuando ninguno de los restantes puede mejorar a
+    los encontrados. Con textos muy cortos para los errores permitidos esa
+    cota no existe y solo se consideran los registros que comparten algún
+    trigrama.
+
+    Se registra en un Catalogo como cualquier otro índice.
+    """
+
+    def __init__(self, campo: str = 'nombre', normalizar: Callable[[Any], str] = clave_texto):
+        self.campo = campo
+        self.normalizar = normalizar
+        self.listas: Dict[str, array] = {}
+        self.claves: Dict[int, str] = {}
+
+    def construir(self, filas: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        if self.claves:
+            for pos, registro in filas:
+                self.insertar(pos, registro)
+            return
+        # En bloque: las posiciones se juntan en listas y se ordenan al final
+        claves, campo, normalizar = self.claves, self.campo, self.normalizar
+        nuevas: Dict[str, List[int]] = {}
+        for pos, registro in filas:
+            clave = normalizar(registro.get(campo))
+            if not clave:
+                continue
+            claves[pos] = clave
+            texto = _RELLENO + clave
+            for trigrama in {texto[i:i + 3] for i in range(len(clave))}:
+                lista = nuevas.get(trigrama)
+                if lista is None:
+                    nuevas[trigrama] = [pos]
+                else:
+                    lista.append(pos)
+        self.listas = {trigrama: array('i', sorted(lista)) for trigrama, lista in nuevas.items()}
+
+    def verificar(self, pos: int, registro: Dict[str, Any]) -> None:
+        pass
+
+    def insertar(self, pos: int, registro: Dict[str, Any]) -> None:
+        clave = self.normalizar(registro.get(self.campo))
+        if not clave:
+            return
+        self.claves[pos] = clave
+        listas = self.listas
+        for trigrama in trigramas(clave):
+            lista = listas.get(trigrama)
+            if lista is None:
+                listas[trigrama] = array('i', [pos])
+            elif pos > lista[-1]:
+                lista.append(pos)
+            else:
+                lista.insert(bisect_left(lista, pos), pos)
+
+    def eliminar(self, pos: int, registro: Dict[str, Any]) -> None:
+        clave = self.claves.pop(pos, None)
+        if clave is None:
+            return
+        for trigrama in trigramas(clave):
+            lista = self.listas[trigrama]
+            i = bisect_left(lista, pos)
+            if i < len(lista) and lista[i] == pos:
+                del lista[i]
+                if not lista:
+                    del self.listas[trigrama]
+
+    def actualizar(self, pos: int, anterior: Dict[str, Any], nuevo: Dict[str, Any]) -> None:
+        if self.normalizar(anterior.get(self.campo)) != self.normalizar(nuevo.get(self.campo)):
+            self.eliminar(pos, anterior)
+            self.insertar(pos, nuevo)
+
+    def parecidos(self, texto: str, limite: int = 5, max_errores: Optional[int] = None) -> List[Tuple[int, int]]:
+        """
+        Hasta `limite` pares (posición, errores) de los registros cuyo campo,
+        o un prefijo suyo, está a `max_errores` o menos del texto; por
+        defecto según su longitud (ver errores_por_defecto). Entre empates
+        con los mismos errores no se garantiza cuáles quedan dentro.
+        """
+        clave = self.normalizar(texto)
+        if not clave or limite <= 0:
+            return []
+        maximo = errores_por_defecto(clave) if max_errores is None else max_errores
+        listas = sorted((self.listas.get(t, _VACIA) for t in trigramas(clave)), key=len)
+        # Primero con menos errores, que filtran mucho más: si ya hay
+        # suficientes resultados, los de más errores no entrarían
+        for errores in range(maximo + 1):
+            encontrados = self._buscar(clave, listas, errores, limite)
+            if len(encontrados) >= limite:
+                break
+        return [(pos, prefijo) for prefijo, _, pos in encontrados]
+
+    def _candidatos(self, listas: List[array], maximo: int) -> List[Tuple[int, int]]:
+        """
+        (posición, trigramas compartidos) de los registros que pueden estar a
+        `maximo` errores, de más a menos trigramas compartidos.
+        """
+        # Un registro a `maximo` errores tiene como poco `necesarios` trigramas
+        # del texto, así que aparece en alguna de las `usadas` listas más
+        # cortas (y al menos `umbral` veces si se usan más). Se añaden listas
+        # mientras no pasen del presupuesto de posiciones a recorrer.
+        necesarios = len(listas) - _POR_ERROR * maximo
+        usadas = min(_POR_ERROR * maximo + 1, len(listas))
+        recorridas = sum(len(lista) for lista in listas[:usadas])
+        while usadas < len(listas) and recorridas + len(listas[usadas]) <= _PRESUPUESTO:
+            recorridas += len(listas[usadas])
+            usadas += 1
+        cuenta: Counter = Counter()
+        for lista in listas[:usadas]:
+            cuenta.update(lista)
+        umbral = max(1, usadas - _POR_ERROR * maximo)
+        vivos = cuenta if umbral == 1 else {pos: veces for pos, veces in cuenta.items() if veces >= umbral}
+        # El resto de listas solo se consulta para los candidatos (por
+        # bisección si son pocos) y se descartan los que ya no pueden llegar
+        # a `necesarios`; las que contienen todos los registros suman a todos
+        universales = sum(1 for lista in listas[usadas:] if len(lista) == len(self.claves))
+        for j in range(usadas, len(listas) - universales):
+            lista = listas[j]
+            if len(vivos) * _BISECCION < len(lista):
+                presentes = []
+                for pos in vivos:
+                    i = bisect_left(lista, pos)
+                    if i < len(lista) and lista[i] == pos:
+                        presentes.append(pos)
+            else:
+                presentes = vivos.keys() & lista
+            for pos in presentes:
+                vivos[pos] += 1
+            minimo = necesarios - universales - (len(listas) - universales - j - 1)
+            vivos = {pos: veces for pos, veces in vivos.items() if veces >= minimo}
+        return sorted(((pos, veces + universales) for pos, veces in vivos.items()),
+                      key=itemgetter(1), reverse=True)
+
+    def _buscar(self, clave: str, listas: List[array], maximo: int, limite: int) -> List[Tuple[int, int, int]]:
+        """Los `limite` mejores (errores del prefijo, errores completos, posición) a `maximo` errores o menos."""
+        claves = self.claves
+        encontrados: List[Tuple[int, int, int]] = []
+        peor = maximo
+        for pos, veces in self._candidatos(listas, maximo):
+            # Errores mínimos por los trigramas que le faltan: a partir de
+            # aquí nadie mejora a los ya encontrados
+            if len(encontrados) >= limite and -(-(len(listas) - veces) // _POR_ERROR) >= peor:
+                break
+            prefijo, completa = _distancias(clave, claves[pos], maximo)
+            if prefijo <= maximo:
+                encontrados.append((prefijo, completa, pos))
+                if len(encontrados) >= limite:
+                    encontrados.sort()
+                    del encontrados[limite:]
+                    peor = encontrados[-1][0]
+        encontrados.sort()
+        return encontrados[:limite]
+
+    def memoria_bytes(self) -> int:
+        """Bytes de las listas de posiciones (sin contar las claves guardadas)."""
+        return sum(len(lista) * 4 for lista in self.listas.values())
+
+if __name__ == "__main__":
+    import time
+
+    print("=== PRUEBAS DE BÚSQUEDA APROXIMADA ===\n")
+    print(f"1. distancia('macbok', 'macbook') = {distancia('macbok', 'macbook')}, "
+          f"distancia('iphnoe', 'iphone') = {distancia('iphnoe', 'iphone')}")
+
+    productos = [
+        {'id': 1, 'nombre': 'iPhone 15'},
+        {'id': 3, 'nombre': 'MacBook Air M3'},
+        {'id': 4, 'nombre': 'Dell XPS 13'},
+        {'id': 5, 'nombre': 'Sony WH-1000XM5'},
+    ]
+    indice = IndiceTrigramas()
+    indice.construir(enumerate(productos))
+    for texto in ['macbok air', 'iphnoe', 'del xps', 'sony wh1000']:
+        resultados = [(productos[pos]['nombre'], puntuacion(clave_texto(texto), d)) for pos, d in indice.parecidos(texto)]
+        print(f"   {texto!r:14} -> {resultados}")
+
+    n = 1_000_000
+    palabras = ['Pro', 'Max', 'Ultra', 'Air', 'Mini', 'Plus', 'Lite', 'Neo', 'Edge', 'Flip', 'Fold', 'Note']
+    marcas = ['Apple', 'Samsung', 'Dell', 'Sony', 'Logitech', 'HP', 'Lenovo', 'Asus']
+    indice = IndiceTrigramas()
+    inicio = time.perf_counter()
+    indice.construir((i, {'nombre': f"{marcas[i % 8]} {palabras[i % 12]} {palabras[i * 7 % 11]} X{i}"})
+                     for i in range(n))
+    print(f"\n2. Índice de {n:,} nombres en {time.perf_counter() - inicio:.1f}s "
+          f"({indice.memoria_bytes() / 1e6:.0f} MB de listas)")
+    for i in (123_456, 654_321, 5):
+        nombre = f"{marcas[i % 8]} {palabras[i % 12]} {palabras[i * 7 % 11]} X{i}".lower()
+        # Dos errores: una letra cambiada de sitio y otra que falta
+        texto = nombre[:2] + nombre[3] + nombre[2] + nombre[4:8] + nombre[9:]
+        inicio = time.perf_counter()
+        resultados = indice.parecidos(texto, limite=3)
+        ms = (time.perf_counter() - inicio) * 1000
+        print(f"   {texto!r:28} -> {[indice.claves[pos] for pos, _ in resultados]} ({ms:.2f} ms)")
@@ -0,0 +1,180 @@
+import os
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker, shared_memory
+from typing import Optional
+
+from Búsqueda_Lineal import busqueda_lineal_simple, np
+
+# Por debajo de este tamaño arrancar procesos cuesta más que recorrer la lista
+UMBRAL_PARALELO = 1_000_000
+# Cada trozo se recorre en sub-bloques para poder abandonarlo a tiempo
+_SUBBLOQUE = 1 << 18
+_SIN_COINCIDENCIA = (1 << 63) - 1
+
+def busqueda_lineal_paralela(lista, elemento, procesos: Optional[int] = None,
+                             trozos_por_proceso: int = 4,
+                             executor: Optional[ProcessPoolExecutor] = None) -> int:
+    """
+    Búsqueda lineal repartida en varios procesos.
+
+    Copia los datos a memoria compartida, los divide en trozos y los recorre en
+    un pool de procesos. En cuanto un trozo encuentra el elemento se cancelan
+    los trozos posteriores; el resultado es siempre la primera ocurrencia.
+
+    Args:
+        lista: Lista de números, array.array o arreglo NumPy
+        elemento: Elemento a buscar
+        procesos: Número de procesos (por defecto, uno por CPU)
+        trozos_por_proceso: Trozos en que se divide el trabajo de cada proceso
+        executor: Pool ya creado para reutilizarlo entre llamadas (sin
+            haberlo usado antes de la primera llamada)
+
+    Returns:
+        int: Índice del elemento si se encuentra, -1 si no
+    """
+    procesos = procesos or os.cpu_count() or 1
+    if procesos == 1 or len(lista) < UMBRAL_PARALELO:
+        return busqueda_lineal_simple(lista, elemento)
+    datos = _como_arreglo(lista)
+    if datos is None or not _sin_perdida(elemento, datos.typecode):
+        return busqueda_lineal_simple(lista, elemento)
+
+    # Los bloques compartidos los registra el proceso principal. Arrancar su
+    # resource_tracker antes de que el pool lance procesos hace que estos lo
+    # hereden en lugar de lanzar uno propio que los daría por perdidos.
+    resource_tracker.ensure_running()
+    formato, n = datos.typecode, len(datos)
+    compartida = shared_memory.SharedMemory(create=True, size=max(1, n * datos.itemsize))
+    control = shared_memory.SharedMemory(create=True, size=8)
+    propio = executor is None
+    if propio:
+        executor = ProcessPoolExecutor(max_workers=procesos)
+    try:
+        compartida.buf[:n * datos.itemsize] = memoryview(datos).cast('B')
+        del datos
+        mejor = control.buf.cast('q')
+        mejor[0] = _SIN_COINCIDENCIA
+
+        tamano = -(-n // (procesos * trozos_por_proceso))
+        limites = [(ini, min(ini + tamano, n)) for ini in range(0, n, tamano)]
+        futuros = {
+            executor.submit(_buscar_en_trozo, compartida.name, control.name,
+                            formato, ini, fin, orden, elemento): orden
+            for orden, (ini, fin) in enumerate(limites)
+        }
+        resultados = {}
+        pendientes = set(futuros)
+        resultado = -1
+        while pendientes:
+            hechos, pendientes = wait(pendientes, return_when=FIRST_COMPLETED)
+            for futuro in hechos:
+                resultados[futuros[futuro]] = futuro.result()
+            encontrados = [o for o, i in resultados.items() if i != -1]
+            if encontrados:
+                primero = min(encontrados)
+                if primero < mejor[0]:
+                    mejor[0] = primero
+                    for futuro in pendientes:
+                        if futuros[futuro] > primero:
+                            futuro.cancel()
+                    pendientes = {f for f in pendientes if futuros[f] < primero}
+                if all(o in resultados for o in range(primero)):
+                    resultado = resultados[primero]
+                    break
+        # Los trozos que ya estaban en marcha abandonan en su próximo
+        # sub-bloque; se esperan para no liberar la memoria que aún leen.
+        for futuro in futuros:
+            futuro.cancel()
+        wait(futuros)
+        del mejor
+        return resultado
+    finally:
+        if propio:
+            executor.shutdown(wait=True, cancel_futures=True)
+        control.close()
+        control.unlink()
+        compartida.close()
+        compartida.unlink()
+
+def _como_arreglo(lista) -> Optional[array]:
+    """
+    Convierte la entrada en un array.array de ancho fijo, o None si no se
+    puede sin cambiar ningún valor.
+    """
+    if isinstance(lista, array):
+        return lista
+    if np is not None and isinstance(lista, np.ndarray):
+        if lista.ndim == 1 and lista.dtype.char in 'bBhHiIlLqQfd':
+            return array(lista.dtype.char, lista.tobytes())
+        return None
+    try:
+        return array('q', lista)
+    except (TypeError, OverflowError):
+        pass
+    try:
+        datos = array('d', lista)
+    except (TypeError, OverflowError):
+        return None
+    # Los enteros grandes pierden precisión como double y darían falsas
+    # coincidencias; la comparación de listas se hace en C. Con NaN también
+    # falla (NaN != NaN) y se busca sin memoria compartida.
+    if datos.tolist() != (lista if isinstance(lista, list) else list(lista)):
+        return None
+    return datos
+
+def _sin_perdida(elemento, formato: str) -> bool:
+    """Indica si el elemento cabe tal cual en el formato del arreglo."""
+    try:
+        return array(formato, [elemento])[0] == elemento
+    except (TypeError, OverflowError):
+        return False
+
+def _buscar_en_trozo(nombre: str, nombre_control: str, formato: str,
+                     ini: int, fin: int, orden: int, elemento) -> int:
+    """Recorre datos[ini:fin]; abandona si un trozo anterior ya encontró el elemento."""
+    compartida = shared_memory.SharedMemory(name=nombre)
+    control = shared_memory.SharedMemory(name=nombre_control)
+    vista = compartida.buf.cast(formato)
+    mejor = control.buf.cast('q')
+    try:
+        for sub in range(ini, fin, _SUBBLOQUE):
+            if mejor[0] < orden:
+                return -1
+            sub_fin = min(sub + _SUBBLOQUE, fin)
+            if np is not None:
+                coincide = np.frombuffer(vista, dtype=formato, count=sub_fin - sub, offset=sub * vista.itemsize) == elemento
+                i = int(coincide.argmax()) if coincide.size else 0
+                i = i if coincide.size and coincide[i] else -1
+                del coincide
+            else:
+                with vista[sub:sub_fin] as tramo:
+                    i = busqueda_lineal_simple(tramo, elemento)
+            if i != -1:
+                return sub + i
+        return -1
+    finally:
+        vista.release()
+        mejor.release()
+        compartida.close()
+        control.close()
+
+if __name__ == "__main__":
+    import random
+    import time
+
+    print("=== PRUEBAS DE BÚSQUEDA LINEAL PARALELA ===\n")
+    n = 5_000_000
+    numeros = [random.randint(0, 1_000_000) for _ in range(n)]
+    numeros[3_000_000] = -7
+    numeros[4_000_000] = -7
+
+    inicio = time.perf_counter()
+    print(f"Buscando -7 (paralela): {busqueda_lineal_paralela(numeros, -7)}")  # 3000000
+    print(f"   Tiempo: {time.perf_counter() - inicio:.3f} s")
+
+    inicio = time.perf_counter()
+    print(f"Buscando -7 (simple):   {busqueda_lineal_simple(numeros, -7)}")  # 3000000
+    print(f"   Tiempo: {time.perf_counter() - inicio:.3f} s")
+
+    print(f"Buscando -1 (paralela): {busqueda_lineal_paralela(numeros, -1)}")  # -1
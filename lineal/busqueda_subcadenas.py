@@ -0,0 +1,234 @@
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Sequence, Set, Tuple, Union
+
+from busqueda_texto import interseccion
+from normalizacion import clave_sin_cache, clave_texto
+
+# Campos de los empleados en los que se buscan las subcadenas
+CAMPOS = ('nombre', 'apellido')
+# Valores distintos cuya clave se recuerda durante un recorrido
+_MEMORIA = 1 << 16
+
+def trigramas(clave: str) -> Set[str]:
+    """Trigramas distintos de una clave ya normalizada (ninguno si tiene menos de 3 letras)."""
+    return {clave[i:i + 3] for i in range(len(clave) - 2)}
+
+def buscar_subcadena_en(registros: Iterable[Dict[str, Any]], texto: str,
+                        campos: Sequence[str] = CAMPOS) -> List[Dict[str, Any]]:
+    """
+    Versión recorriendo todos los registros, para listas: los que contienen
+    el texto en alguno de los campos, sin distinguir mayúsculas ni tildes.
+    """
+    consulta = clave_texto(texto)
+    memoria: Dict[Any, str] = {}
+
+    def clave(valor) -> str:
+        # Los nombres se repiten mucho: se pliegan una vez por recorrido
+        plegado = memoria.get(valor)
+        if plegado is None:
+            plegado = clave_sin_cache(valor)
+            if len(memoria) < _MEMORIA:
+                memoria[valor] = plegado
+        return plegado
+
+    resultado = []
+    for registro in registros:
+        for campo in campos:
+            if consulta in clave(registro.get(campo)):
+                resultado.append(registro)
+                break
+    return resultado
+
+class IndiceSubcadenas:
+    """
+    Índice de subcadenas sobre varios campos de texto (nombre y apellido).
+
+    Se indexan los valores distintos ya normalizados (sin mayúsculas ni
+    tildes), no las personas: cada valor tiene un número, las posiciones de
+    los registros que lo llevan en alguno de los campos y, por cada uno de
+    sus trigramas, una entrada en la lista de ese trigrama. Para un texto de
+    3 letras o más se intersecan las listas de sus trigramas y se comprueba
+    cada candidato con `in`, así el coste va con los resultados y no con el
+    tamaño del directorio; con 1 o 2 letras se recorren los valores
+    distintos, nunca los registros.
+
+    Los números de valor solo crecen, de modo que las listas de trigramas
+    se mantienen ordenadas añadiendo al final. Un valor que se queda sin
+    personas se conserva vacío por si vuelve.
+
+    Se registra en un Catalogo como cualquier otro índice.
+    """
+
+    def __init__(self, campos: Sequence[str] = CAMPOS):
+        self.campos = tuple(campos)
+        self.claves: List[str] = []
+        self.numeros: Dict[str, int] = {}
+        # Posiciones de cada valor: un entero si es una sola (lo más común
+        # con apellidos) y un array ordenado si son varias
+        self.personas: List[Union[int, array, None]] = []
+        self.listas: Dict[str, array] = {}
+
+    def _numero(self, clave: str) -> int:
+        numero = self.numeros.get(clave)
+        if numero is None:
+            numero = len(self.claves)
+            self.numeros[clave] = numero
+            self.claves.append(clave)
+            self.personas.append(None)
+            for trigrama in trigramas(clave):
+                lista = self.listas.get(trigrama)
+                if lista is None:
+                    self.listas[trigrama] = array('i', [numero])
+                else:
+                    lista.append(numero)
+        return numero
+
+    def _valores(self, registro: Dict[str, Any]) -> Dict[str, None]:
+        # Sin la caché de claves: cada apellido suele aparecer una sola vez
+        return dict.fromkeys(clave for clave in map(clave_sin_cache, map(registro.get, self.campos)) if clave)
+
+    def construir(self, filas: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        if self.claves:
+            for pos, registro in filas:
+                self.insertar(pos, registro)
+            return
+        # En bloque: primero los valores distintos y sus personas (las
+        # posiciones llegan en orden) y después los trigramas de cada valor
+        numeros, claves, personas = self.numeros, self.claves, self.personas
+        for pos, registro in filas:
+            for clave in self._valores(registro):
+                numero = numeros.get(clave)
+                if numero is None:
+                    numeros[clave] = len(claves)
+                    claves.append(clave)
+                    personas.append(pos)
+                    continue
+                actual = personas[numero]
+                if actual.__class__ is int:
+                    personas[numero] = array('i', [actual, pos])
+                else:
+                    actual.append(pos)
+        listas: Dict[str, List[int]] = {}
+        for numero, clave in enumerate(claves):
+            for trigrama in trigramas(clave):
+                lista = listas.get(trigrama)
+                if lista is None:
+                    listas[trigrama] = [numero]
+                else:
+                    lista.append(numero)
+        self.listas = {trigrama: array('i', lista) for trigrama, lista in listas.items()}
+
+    def verificar(self, pos: int, registro: Dict[str, Any]) -> None:
+        pass
+
+    def insertar(self, pos: int, registro: Dict[str, Any]) -> None:
+        personas = self.personas
+        for clave in self._valores(registro):
+            numero = self._numero(clave)
+            actual = personas[numero]
+            if actual is None:
+                personas[numero] = pos
+            elif actual.__class__ is int:
+                personas[numero] = array('i', [actual, pos] if actual < pos else [pos, actual])
+            elif pos > actual[-1]:
+                actual.append(pos)
+            else:
+                actual.insert(bisect_left(actual, pos), pos)
+
+    def eliminar(self, pos: int, registro: Dict[str, Any]) -> None:
+        personas = self.personas
+        for clave in self._valores(registro):
+            numero = self.numeros.get(clave)
+            if numero is None:
+                continue
+            actual = personas[numero]
+            if actual is None:
+                continue
+            if actual.__class__ is int:
+                if actual == pos:
+                    personas[numero] = None
+                continue
+            i = bisect_left(actual, pos)
+            if i < len(actual) and actual[i] == pos:
+                del actual[i]
+                if len(actual) == 1:
+                    personas[numero] = actual[0]
+
+    def actualizar(self, pos: int, anterior: Dict[str, Any], nuevo: Dict[str, Any]) -> None:
+        if self._valores(anterior) != self._valores(nuevo):
+            self.eliminar(pos, anterior)
+            self.insertar(pos, nuevo)
+
+    # ---------- consultas ----------
+
+    def valores(self, texto: str) -> List[int]:
+        """Números de los valores distintos que contienen el texto (ya normalizado o no)."""
+        consulta = clave_texto(texto)
+        if len(consulta) < 3:
+            return [numero for numero, clave in enumerate(self.claves) if consulta in clave]
+        listas = []
+        for trigrama in trigramas(consulta):
+            lista = self.listas.get(trigrama)
+            if lista is None:
+                return []
+            listas.append(lista)
+        candidatos = interseccion(listas)
+        if len(consulta) == 3:
+            return candidatos
+        claves = self.claves
+        return [numero for numero in candidatos if consulta in claves[numero]]
+
+    def buscar(self, texto: str) -> List[int]:
+        """
+        Posiciones (en orden) de los registros que contienen el texto en
+        alguno de los campos. Un texto vacío no se resuelve aquí: lo contienen
+        todos los registros, también los que no tienen ningún valor.
+        """
+        sueltas, listas = [], []
+        for numero in self.valores(texto):
+            actual = self.personas[numero]
+            if actual is None:
+                continue
+            if actual.__class__ is int:
+                sueltas.append(actual)
+            else:
+                listas.append(actual)
+        if not listas:
+            return sorted(set(sueltas)) if len(sueltas) > 1 else sueltas
+        if len(listas) == 1 and not sueltas:
+            return list(listas[0])
+        return sorted(set(sueltas).union(*listas))
+
+if __name__ == "__main__":
+    import time
+
+    from benchmark import generar_empleados
+
+    print("=== PRUEBAS DE BÚSQUEDA POR SUBCADENAS ===\n")
+    empleados = [
+        {'id': 101, 'nombre': 'Ana', 'apellido': 'García'},
+        {'id': 103, 'nombre': 'María', 'apellido': 'Rodríguez'},
+        {'id': 104, 'nombre': 'José', 'apellido': 'Martínez'},
+        {'id': 105, 'nombre': 'Laura', 'apellido': 'Hernández'},
+    ]
+    indice = IndiceSubcadenas()
+    indice.construir(enumerate(empleados))
+    for texto in ['Garc', 'Mar', 'HERNANDEZ', 'ez', 'xyz']:
+        print(f"   {texto!r:12} -> {[empleados[pos]['apellido'] for pos in indice.buscar(texto)]}")
+
+    n = 2_000_000
+    empleados = generar_empleados(n)
+    indice = IndiceSubcadenas()
+    inicio = time.perf_counter()
+    indice.construir(enumerate(empleados))
+    print(f"\n{n:,} empleados ({len(indice.claves):,} valores distintos) indexados "
+          f"en {time.perf_counter() - inicio:.1f}s")
+    for texto in ['Garc', 'Mar', 'hernandez12345', 'ía99999', 'zz']:
+        inicio = time.perf_counter()
+        posiciones = indice.buscar(texto)
+        ms = (time.perf_counter() - inicio) * 1000
+        print(f"   {texto!r:17} -> {len(posiciones):>9,} empleados ({ms:.1f} ms)")
+    inicio = time.perf_counter()
+    buscar_subcadena_en(empleados, 'hernandez12345')
+    print(f"   Recorriendo la lista: {(time.perf_counter() - inicio) * 1000:.0f} ms por búsqueda")
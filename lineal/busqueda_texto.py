@@ -0,0 +1,279 @@
+import heapq
+import math
+import re
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from normalizacion import clave_texto
+
+# Campos de los productos que se indexan por palabras
+CAMPOS = ('nombre', 'marca', 'categoria')
+# Parámetros de BM25: saturación de la frecuencia y peso de la longitud
+K1 = 1.2
+B = 0.75
+
+_PALABRA = re.compile(r'\w+')
+# Al galope solo si la lista es al menos _GALOPE veces más larga que los
+# candidatos; con tamaños parecidos se intersecan como conjuntos (en C)
+_GALOPE = 16
+# Textos distintos cuyas palabras se recuerdan durante una construcción en bloque
+_MEMORIA = 1 << 16
+
+def palabras(texto) -> List[str]:
+    """Palabras de un texto ya normalizadas (minúsculas y sin tildes); los valores que no son texto no tienen."""
+    return _PALABRA.findall(clave_texto(texto))
+
+def _galope(lista: Sequence[int], valor: int, desde: int) -> int:
+    """
+    Primer índice a partir de `desde` con lista[i] >= valor: salta 1, 2, 4...
+    posiciones hasta pasarse y biseca solo el último tramo, así cuesta
+    O(log d) para un salto de d en lugar de O(log n).
+    """
+    hasta, paso, n = desde, 1, len(lista)
+    while hasta < n and lista[hasta] < valor:
+        desde = hasta + 1
+        hasta += paso
+        paso *= 2
+    return bisect_left(lista, valor, desde, min(hasta, n))
+
+def interseccion(listas: List[Sequence[int]]) -> List[int]:
+    """
+    Posiciones comunes a varias listas ordenadas. Se parte de la más corta
+    y cada candidata se busca al galope en las demás, de menor a mayor, con
+    lo que el coste depende de la lista más corta y no de la más larga.
+    """
+    if not listas:
+        return []
+    listas = sorted(listas, key=len)
+    resultado = list(listas[0])
+    for lista in listas[1:]:
+        if len(lista) < _GALOPE * len(resultado):
+            resultado = sorted(set(resultado).intersection(lista))
+            if not resultado:
+                break
+            continue
+        comunes, i, n = [], 0, len(lista)
+        for valor in resultado:
+            i = _galope(lista, valor, i)
+            if i == n:
+                break
+            if lista[i] == valor:
+                comunes.append(valor)
+        resultado = comunes
+        if not resultado:
+            break
+    return resultado
+
+def _operador(operador: str) -> bool:
+    """True para 'y' (todas las palabras) y False para 'o' (alguna)."""
+    operador = operador.lower()
+    if operador in ('y', 'and'):
+        return True
+    if operador in ('o', 'or'):
+        return False
+    raise ValueError(f"Operador '{operador}' no válido (se espera 'y' u 'o')")
+
+class IndiceInvertido:
+    """
+    Índice invertido por palabras de varios campos de texto: para cada
+    palabra, las posiciones de los registros que la contienen en un array
+    ordenado de enteros y, en un array paralelo, cuántas veces aparece en
+    cada uno. Guarda también la longitud (en palabras) de cada registro.
+
+    Las búsquedas solo recorren las listas de las palabras consultadas: con
+    'y' se intersecan al galope y con 'o' se unen, y los resultados se
+    ordenan por relevancia BM25.
+
+    Se registra en un Catalogo como cualquier otro índice.
+    """
+
+    def __init__(self, campos: Sequence[str] = CAMPOS):
+        self.campos = tuple(campos)
+        self.posiciones: Dict[str, array] = {}
+        self.frecuencias: Dict[str, array] = {}
+        self.longitudes = array('H')
+        self.documentos = 0
+        self.palabras_totales = 0
+
+    def _contar(self, registro: Dict[str, Any], memoria: Optional[Dict[Any, List[str]]] = None) -> Dict[str, int]:
+        cuenta: Dict[str, int] = {}
+        for campo in self.campos:
+            valor = registro.get(campo)
+            if memoria is None:
+                lista = palabras(valor)
+            else:
+                # Marcas y categorías se repiten mucho: se separan una vez
+                lista = memoria.get(valor) if valor.__class__ is str else None
+                if lista is None:
+                    lista = palabras(valor)
+                    if valor.__class__ is str and len(memoria) < _MEMORIA:
+                        memoria[valor] = lista
+            for palabra in lista:
+                cuenta[palabra] = cuenta.get(palabra, 0) + 1
+        return cuenta
+
+    def _longitud(self, pos: int, longitud: int) -> None:
+        if pos >= len(self.longitudes):
+            self.longitudes.extend(bytes(2 * (pos + 1 - len(self.longitudes))))
+        self.longitudes[pos] = min(longitud, 0xFFFF)
+
+    def construir(self, filas: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        if self.documentos:
+            for pos, registro in filas:
+                self.insertar(pos, registro)
+            return
+        # En bloque: se juntan las listas y se ordenan por posición al final
+        listas: Dict[str, List[Tuple[int, int]]] = {}
+        memoria: Dict[Any, List[str]] = {}
+        for pos, registro in filas:
+            cuenta = self._contar(registro, memoria)
+            if not cuenta:
+                continue
+            longitud = sum(cuenta.values())
+            self._longitud(pos, longitud)
+            self.documentos += 1
+            self.palabras_totales += longitud
+            for palabra, veces in cuenta.items():
+                lista = listas.get(palabra)
+                if lista is None:
+                    listas[palabra] = [(pos, veces)]
+                else:
+                    lista.append((pos, veces))
+        for palabra, lista in listas.items():
+            lista.sort()
+            self.posiciones[palabra] = array('i', [pos for pos, _ in lista])
+            self.frecuencias[palabra] = array('H', [min(veces, 0xFFFF) for _, veces in lista])
+
+    def verificar(self, pos: int, registro: Dict[str, Any]) -> None:
+        pass
+
+    def insertar(self, pos: int, registro: Dict[str, Any]) -> None:
+        cuenta = self._contar(registro)
+        if not cuenta:
+            return
+        longitud = sum(cuenta.values())
+        self._longitud(pos, longitud)
+        self.documentos += 1
+        self.palabras_totales += longitud
+        for palabra, veces in cuenta.items():
+            posiciones = self.posiciones.get(palabra)
+            if posiciones is None:
+                self.posiciones[palabra] = array('i', [pos])
+                self.frecuencias[palabra] = array('H', [min(veces, 0xFFFF)])
+                continue
+            i = len(posiciones) if pos > posiciones[-1] else bisect_left(posiciones, pos)
+            posiciones.insert(i, pos)
+            self.frecuencias[palabra].insert(i, min(veces, 0xFFFF))
+
+    def eliminar(self, pos: int, registro: Dict[str, Any]) -> None:
+        cuenta = self._contar(registro)
+        if not cuenta:
+            return
+        self.longitudes[pos] = 0
+        self.documentos -= 1
+        self.palabras_totales -= sum(cuenta.values())
+        for palabra in cuenta:
+            posiciones = self.posiciones[palabra]
+            i = bisect_left(posiciones, pos)
+            del posiciones[i]
+            del self.frecuencias[palabra][i]
+            if not posiciones:
+                del self.posiciones[palabra]
+                del self.frecuencias[palabra]
+
+    def actualizar(self, pos: int, anterior: Dict[str, Any], nuevo: Dict[str, Any]) -> None:
+        if any(anterior.get(campo) != nuevo.get(campo) for campo in self.campos):
+            self.eliminar(pos, anterior)
+            self.insertar(pos, nuevo)
+
+    # ---------- consultas ----------
+
+    def buscar(self, consulta: str, operador: str = 'y') -> List[int]:
+        """Posiciones (en orden) de los registros con todas ('y') o alguna ('o') de las palabras de la consulta."""
+        todas = _operador(operador)
+        terminos = dict.fromkeys(palabras(consulta))
+        if not terminos:
+            return []
+        listas = [self.posiciones.get(palabra, ()) for palabra in terminos]
+        if todas:
+            return interseccion(listas)
+        return sorted(set().union(*listas))
+
+    def _idf(self, palabra: str) -> float:
+        aparece = len(self.posiciones.get(palabra, ()))
+        return math.log(1 + (self.documentos - aparece + 0.5) / (aparece + 0.5))
+
+    def buscar_ranking(self, consulta: str, operador: str = 'y',
+                       cantidad: Optional[int] = None) -> List[Tuple[int, float]]:
+        """
+        Pares (posición, puntuación BM25) de los registros que cumplen la
+        consulta, del más al menos relevante (a igual puntuación, por
+        posición); con `cantidad`, solo los primeros.
+        """
+        todas = _operador(operador)
+        consultadas = list(dict.fromkeys(palabras(consulta)))
+        terminos = [palabra for palabra in consultadas if palabra in self.posiciones]
+        if not terminos or (todas and len(terminos) < len(consultadas)):
+            return []
+        media = self.palabras_totales / self.documentos
+        longitudes = self.longitudes
+        puntos: Dict[int, float] = {}
+        if todas:
+            for pos in interseccion([self.posiciones[palabra] for palabra in terminos]):
+                puntos[pos] = 0.0
+        for palabra in terminos:
+            idf = self._idf(palabra)
+            posiciones, frecuencias = self.posiciones[palabra], self.frecuencias[palabra]
+            if todas:
+                pares = ((pos, frecuencias[bisect_left(posiciones, pos)]) for pos in puntos)
+            else:
+                pares = zip(posiciones, frecuencias)
+            for pos, veces in pares:
+                norma = K1 * (1 - B + B * longitudes[pos] / media)
+                puntos[pos] = puntos.get(pos, 0.0) + idf * veces * (K1 + 1) / (veces + norma)
+        orden = lambda par: (-par[1], par[0])
+        if cantidad is None:
+            return sorted(puntos.items(), key=orden)
+        return heapq.nsmallest(cantidad, puntos.items(), key=orden)
+
+def buscar_texto_en(registros: Iterable[Dict[str, Any]], consulta: str, operador: str = 'y',
+                    cantidad: Optional[int] = None, campos: Sequence[str] = CAMPOS) -> List[Tuple[Dict[str, Any], float]]:
+    """
+    Versión sin índice previo, para listas: construye uno de paso (recorre
+    todos los registros) y da los mismos resultados que buscar_ranking().
+    """
+    registros = list(registros)
+    indice = IndiceInvertido(campos)
+    indice.construir(enumerate(registros))
+    return [(registros[pos], puntos) for pos, puntos in indice.buscar_ranking(consulta, operador, cantidad)]
+
+if __name__ == "__main__":
+    import time
+
+    from benchmark import generar_productos
+
+    print("=== PRUEBAS DE BÚSQUEDA POR PALABRAS ===\n")
+    productos = [
+        {'id': 1, 'nombre': 'iPhone 15', 'marca': 'Apple', 'categoria': 'Smartphone'},
+        {'id': 2, 'nombre': 'Samsung Galaxy S24', 'marca': 'Samsung', 'categoria': 'Smartphone'},
+        {'id': 3, 'nombre': 'MacBook Air M3', 'marca': 'Apple', 'categoria': 'Laptop'},
+        {'id': 4, 'nombre': 'Galaxy Tab S9', 'marca': 'Samsung', 'categoria': 'Tablet'},
+        {'id': 5, 'nombre': 'Sony WH-1000XM5', 'marca': 'Sony', 'categoria': 'Audífonos'},
+    ]
+    for consulta, operador in [('galaxy', 'y'), ('samsung smartphone', 'y'), ('apple tablet', 'o'), ('AUDIFONOS', 'y')]:
+        resultados = [(p['nombre'], round(puntos, 2)) for p, puntos in buscar_texto_en(productos, consulta, operador)]
+        print(f"   {consulta!r:22} ({operador}) -> {resultados}")
+
+    n = 1_000_000
+    productos = generar_productos(n)
+    indice = IndiceInvertido()
+    inicio = time.perf_counter()
+    indice.construir(enumerate(productos))
+    print(f"\n{n:,} productos indexados en {time.perf_counter() - inicio:.1f}s")
+    for consulta, operador in [('modelo 123456', 'y'), ('sony laptop', 'y'), ('123456 654321', 'o')]:
+        inicio = time.perf_counter()
+        resultados = indice.buscar_ranking(consulta, operador, 3)
+        ms = (time.perf_counter() - inicio) * 1000
+        print(f"   {consulta!r:16} ({operador}) -> {len(indice.buscar(consulta, operador)):>7,} resultados, "
+              f"los primeros {[productos[pos]['nombre'] for pos, _ in resultados]} ({ms:.1f} ms)")
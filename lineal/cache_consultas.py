@@ -0,0 +1,209 @@
+import functools
+import sys
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from normalizacion import clave_busqueda
+
+# Límites por defecto: número de resultados guardados y memoria estimada
+MAX_ENTRADAS = 1024
+MAX_BYTES = 64 * 1024 * 1024
+
+def tamano_resultado(valor) -> int:
+    """
+    Bytes aproximados de un resultado: el contenedor y cada elemento de
+    primer nivel (los registros de una lista, los pares de un ranking).
+    Los registros de un catálogo se comparten con él y aun así se cuentan,
+    así que la estimación se pasa por arriba y el límite nunca se supera.
+    """
+    tamano = sys.getsizeof(valor)
+    if isinstance(valor, (list, tuple)):
+        tamano += sum(sys.getsizeof(elemento) for elemento in valor)
+    elif isinstance(valor, dict):
+        tamano += sum(sys.getsizeof(elemento) for elemento in valor.values())
+    return tamano
+
+def _copia(valor):
+    """Copia superficial de listas y diccionarios, para que quien llama pueda modificarlos."""
+    if isinstance(valor, list):
+        return list(valor)
+    if isinstance(valor, dict):
+        return dict(valor)
+    return valor
+
+class CacheConsultas:
+    """
+    Caché LRU de resultados de consultas sobre colecciones con versión
+    (CatalogoProductos, CatalogoEmpleados, AlmacenProductos).
+
+    La clave es la función, la colección y los argumentos normalizados
+    (los textos con clave_busqueda, así 'Laptop' y ' laptop ' comparten
+    resultado). Cada entrada guarda la versión de la colección con la que se
+    calculó; como toda alta, cambio o baja aumenta la versión, una entrada
+    con otra versión se descarta al consultarla y nunca se devuelve un
+    resultado viejo. Las listas de diccionarios no tienen versión (sus
+    registros cambian en su sitio sin avisar) y no se guardan nunca.
+
+    Se expulsan las entradas menos usadas cuando se pasa de `max_entradas`
+    o de `max_bytes` (estimados con tamano_resultado). Puede usarse desde
+    varios hilos a la vez.
+    """
+
+    def __init__(self, max_entradas: int = MAX_ENTRADAS, max_bytes: int = MAX_BYTES,
+                 normalizar: Optional[Callable[[Any], Any]] = clave_busqueda):
+        if max_entradas < 1 or max_bytes < 1:
+            raise ValueError("La caché necesita sitio para al menos una entrada")
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.normalizar = normalizar
+        # clave -> (versión, referencia débil a la colección, resultado, bytes)
+        self._entradas: 'OrderedDict[tuple, tuple]' = OrderedDict()
+        self._cerrojo = threading.Lock()
+        self.bytes = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+        self.invalidaciones = 0
+        self.omitidas = 0
+
+    def _argumento(self, valor):
+        if isinstance(valor, str) and self.normalizar is not None:
+            return self.normalizar(valor)
+        if isinstance(valor, (list, tuple, set, frozenset)):
+            return (type(valor).__name__,) + tuple(self._argumento(v) for v in valor)
+        # El tipo evita que True y 1, o 5 y 5.0, compartan entrada
+        return (type(valor).__name__, valor)
+
+    def clave(self, nombre: str, coleccion, args: tuple, kwargs: Dict[str, Any]) -> Optional[tuple]:
+        """Clave de una consulta, o None si los argumentos no se pueden usar como clave."""
+        clave = (nombre, id(coleccion), tuple(self._argumento(a) for a in args),
+                 tuple(sorted((k, self._argumento(v)) for k, v in kwargs.items())))
+        try:
+            hash(clave)
+        except TypeError:
+            return None
+        return clave
+
+    def _buscar(self, clave: tuple, coleccion, version: int):
+        with self._cerrojo:
+            entrada = self._entradas.get(clave)
+            if entrada is not None:
+                guardada, referencia, resultado, _ = entrada
+                # id() se reutiliza cuando la colección muere: se comprueba que es la misma
+                if guardada == version and referencia() is coleccion:
+                    self._entradas.move_to_end(clave)
+                    self.aciertos += 1
+                    return True, resultado
+                self._quitar(clave)
+                self.invalidaciones += 1
+            self.fallos += 1
+            return False, None
+
+    def _quitar(self, clave: tuple) -> None:
+        self.bytes -= self._entradas.pop(clave)[3]
+
+    def _guardar(self, clave: tuple, coleccion, version: int, resultado) -> None:
+        tamano = sys.getsizeof(clave) + tamano_resultado(resultado)
+        if tamano > self.max_bytes:
+            return
+        try:
+            referencia = weakref.ref(coleccion)
+        except TypeError:
+            return
+        with self._cerrojo:
+            if clave in self._entradas:
+                self._quitar(clave)
+            self._entradas[clave] = (version, referencia, resultado, tamano)
+            self.bytes += tamano
+            while len(self._entradas) > self.max_entradas or self.bytes > self.max_bytes:
+                self._quitar(next(iter(self._entradas)))
+                self.expulsiones += 1
+
+    def consultar(self, nombre: str, coleccion, calcular: Callable[[], Any],
+                  args: tuple = (), kwargs: Optional[Dict[str, Any]] = None):
+        """
+        Resultado de la consulta `nombre` con esos argumentos: el guardado si
+        la colección no ha cambiado desde que se calculó, o el de calcular()
+        (que se guarda). Las listas y diccionarios se devuelven copiados.
+        """
+        version = getattr(coleccion, 'version', None)
+        clave = None if version is None else self.clave(nombre, coleccion, args, kwargs or {})
+        if clave is None:
+            with self._cerrojo:
+                self.omitidas += 1
+            return calcular()
+        encontrado, resultado = self._buscar(clave, coleccion, version)
+        if not encontrado:
+            # Se calcula fuera del cerrojo; si la colección cambia mientras
+            # tanto, la entrada queda con la versión vieja y no se usará
+            resultado = calcular()
+            self._guardar(clave, coleccion, version, resultado)
+        return _copia(resultado)
+
+    def cacheada(self, funcion: Callable) -> Callable:
+        """Decorador para funciones buscar_*(coleccion, ...) cuyo primer argumento es la colección."""
+        nombre = f"{funcion.__module__}.{funcion.__qualname__}"
+
+        @functools.wraps(funcion)
+        def envoltura(coleccion, *args, **kwargs):
+            return self.consultar(nombre, coleccion, lambda: funcion(coleccion, *args, **kwargs), args, kwargs)
+
+        envoltura.cache = self
+        return envoltura
+
+    def invalidar(self, coleccion=None) -> int:
+        """Descarta las entradas de una colección (o todas) y devuelve cuántas eran."""
+        with self._cerrojo:
+            if coleccion is None:
+                claves = list(self._entradas)
+            else:
+                claves = [clave for clave in self._entradas if clave[1] == id(coleccion)]
+            for clave in claves:
+                self._quitar(clave)
+            self.invalidaciones += len(claves)
+            return len(claves)
+
+    def estadisticas(self) -> Dict[str, Any]:
+        with self._cerrojo:
+            consultas = self.aciertos + self.fallos
+            return {'entradas': len(self._entradas), 'bytes': self.bytes,
+                    'aciertos': self.aciertos, 'fallos': self.fallos,
+                    'tasa_aciertos': self.aciertos / consultas if consultas else 0.0,
+                    'expulsiones': self.expulsiones, 'invalidaciones': self.invalidaciones,
+                    'omitidas': self.omitidas}
+
+    def __len__(self) -> int:
+        return len(self._entradas)
+
+# Caché compartida por las funciones de búsqueda del sistema
+cache = CacheConsultas()
+cacheada = cache.cacheada
+
+if __name__ == "__main__":
+    import time
+
+    from benchmark import generar_productos
+    from catalogo import CatalogoProductos
+
+    print("=== PRUEBAS DE LA CACHÉ DE CONSULTAS ===\n")
+    n = 200_000
+    catalogo = CatalogoProductos(generar_productos(n))
+    cache_prueba = CacheConsultas(max_entradas=100)
+
+    @cache_prueba.cacheada
+    def buscar_productos_disponibles(productos):
+        return [p for p in productos if p.get('disponible') and p.get('stock', 0) > 0]
+
+    for intento in ("primera vez (se calcula)", "segunda vez (en caché)"):
+        inicio = time.perf_counter()
+        disponibles = buscar_productos_disponibles(catalogo)
+        print(f"   Disponibles entre {n:,}, {intento}: {len(disponibles):,} "
+              f"({(time.perf_counter() - inicio) * 1000:.2f} ms)")
+    producto = next(p for p in catalogo if p.get('disponible') and p.get('stock', 0) > 0)
+    catalogo.actualizar(producto['id'], stock=0)
+    print(f"   Tras agotar el producto {producto['id']}: {len(buscar_productos_disponibles(catalogo)):,} "
+          f"(la versión cambió y se recalculó)")
+    print(f"\n   Una lista sin versión no se guarda: {len(buscar_productos_disponibles(list(catalogo))):,}")
+    print(f"   Estadísticas: {cache_prueba.estadisticas()}")
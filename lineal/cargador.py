@@ -0,0 +1,248 @@
+import csv
+import gzip
+import json
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+# Registros por lote al leer en trozos
+LOTE = 50_000
+# Mensajes de error que se guardan en el informe
+MAX_ERRORES = 20
+
+# ===============================
+# CONVERSIÓN DE TIPOS
+# ===============================
+
+_VERDADEROS = {'true', '1', 'si', 'sí', 's', 'yes', 'y', 'verdadero', 'v'}
+_FALSOS = {'false', '0', 'no', 'n', 'falso', 'f'}
+
+def _entero(valor) -> int:
+    if isinstance(valor, bool):
+        raise ValueError(f"no es un entero: {valor!r}")
+    if isinstance(valor, int):
+        return valor
+    if isinstance(valor, str):
+        valor = valor.strip()
+        try:
+            return int(valor)
+        except ValueError:
+            pass
+    real = float(valor)
+    if not real.is_integer():
+        raise ValueError(f"no es un entero: {valor!r}")
+    return int(real)
+
+def _real(valor) -> float:
+    if isinstance(valor, bool):
+        raise ValueError(f"no es un número: {valor!r}")
+    return float(valor)
+
+def _numero(valor):
+    """Entero si el valor es entero (como los salarios de ejemplo) y si no real."""
+    real = _real(valor)
+    return int(real) if real.is_integer() and not isinstance(valor, float) else real
+
+def _booleano(valor) -> bool:
+    if isinstance(valor, bool):
+        return valor
+    texto = str(valor).strip().lower()
+    if texto in _VERDADEROS:
+        return True
+    if texto in _FALSOS:
+        return False
+    raise ValueError(f"no es un booleano: {valor!r}")
+
+def _texto(valor) -> str:
+    return valor.strip() if isinstance(valor, str) else str(valor)
+
+# Valores que ya tienen el tipo final (los de JSON) se aceptan sin convertir
+_YA_CONVERTIDO = {_entero: int, _real: float, _booleano: bool}
+
+ESQUEMA_PRODUCTOS: Dict[str, Callable[[Any], Any]] = {
+    'id': _entero, 'nombre': _texto, 'marca': _texto, 'categoria': _texto,
+    'precio': _real, 'stock': _entero, 'disponible': _booleano,
+}
+ESQUEMA_EMPLEADOS: Dict[str, Callable[[Any], Any]] = {
+    'id': _entero, 'nombre': _texto, 'apellido': _texto, 'departamento': _texto,
+    'salario': _numero, 'activo': _booleano,
+}
+
+def convertir(registro: Dict[str, Any], esquema: Dict[str, Callable[[Any], Any]]) -> Dict[str, Any]:
+    """
+    Registro con los campos del esquema convertidos a su tipo. Los campos
+    vacíos se omiten (como si no estuvieran) y los que no están en el
+    esquema se conservan tal cual. Lanza ValueError si falta el id o un
+    valor no se puede convertir.
+    """
+    resultado = {}
+    for campo, valor in registro.items():
+        if valor is None or valor == '':
+            continue
+        conversor = esquema.get(campo)
+        if conversor is None or valor.__class__ is _YA_CONVERTIDO.get(conversor):
+            resultado[campo] = valor
+            continue
+        try:
+            resultado[campo] = conversor(valor)
+        except (TypeError, ValueError):
+            raise ValueError(f"valor no válido para '{campo}': {valor!r}") from None
+    if 'id' in esquema and 'id' not in resultado:
+        raise ValueError("falta el campo 'id'")
+    return resultado
+
+# ===============================
+# LECTURA EN STREAMING
+# ===============================
+
+def _abrir(ruta: str):
+    """Abre el archivo como texto; los .gz se descomprimen al vuelo."""
+    if ruta.endswith('.gz'):
+        return gzip.open(ruta, 'rt', encoding='utf-8-sig', newline='')
+    return open(ruta, encoding='utf-8-sig', newline='')
+
+def _formato(ruta: str) -> str:
+    nombre = ruta[:-3] if ruta.endswith('.gz') else ruta
+    if nombre.endswith('.csv'):
+        return 'csv'
+    if nombre.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    raise ValueError(f"No se reconoce el formato de '{ruta}' (se esperaba .csv o .jsonl)")
+
+def _filas_csv(archivo) -> Iterator[tuple]:
+    lector = csv.reader(archivo)
+    cabecera = [campo.strip() for campo in next(lector, [])]
+    for linea, fila in enumerate(lector, 2):
+        if not fila:
+            continue
+        if len(fila) != len(cabecera):
+            yield linea, ValueError(f"la fila tiene {len(fila)} columnas y la cabecera {len(cabecera)}")
+            continue
+        yield linea, dict(zip(cabecera, fila))
+
+def _filas_jsonl(archivo) -> Iterator[tuple]:
+    for linea, texto in enumerate(archivo, 1):
+        if not texto.strip():
+            continue
+        try:
+            registro = json.loads(texto)
+        except json.JSONDecodeError as e:
+            yield linea, ValueError(f"JSON no válido: {e.msg}")
+            continue
+        yield linea, registro if isinstance(registro, dict) else ValueError("la línea no es un objeto JSON")
+
+def leer_registros(ruta: str, esquema: Dict[str, Callable[[Any], Any]],
+                   formato: Optional[str] = None, omitir_errores: bool = False,
+                   informe: Optional[Dict[str, Any]] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Generador de los registros de un archivo CSV (con cabecera) o JSON Lines,
+    ya convertidos según el esquema. Lee línea a línea, así la memoria no
+    depende del tamaño del archivo.
+
+    Un registro no válido lanza ValueError con la línea, salvo con
+    omitir_errores=True, que lo salta. Si se pasa `informe` (un dict), se
+    rellena con 'leidos', 'validos', 'descartados' y los primeros 'errores'.
+    """
+    if informe is None:
+        informe = {}
+    informe.update(leidos=0, validos=0, descartados=0, errores=[])
+    formato = formato or _formato(ruta)
+    filas = {'csv': _filas_csv, 'jsonl': _filas_jsonl}[formato]
+    with _abrir(ruta) as archivo:
+        for linea, registro in filas(archivo):
+            informe['leidos'] += 1
+            try:
+                if isinstance(registro, ValueError):
+                    raise registro
+                registro = convertir(registro, esquema)
+            except ValueError as e:
+                mensaje = f"{ruta}:{linea}: {e}"
+                if not omitir_errores:
+                    raise ValueError(mensaje) from None
+                informe['descartados'] += 1
+                if len(informe['errores']) < MAX_ERRORES:
+                    informe['errores'].append(mensaje)
+                continue
+            informe['validos'] += 1
+            yield registro
+
+def leer_lotes(ruta: str, esquema: Dict[str, Callable[[Any], Any]], tamano: int = LOTE,
+               **opciones) -> Iterator[List[Dict[str, Any]]]:
+    """Como leer_registros, pero en listas de hasta `tamano` registros."""
+    registros = leer_registros(ruta, esquema, **opciones)
+    while True:
+        lote = list(islice(registros, tamano))
+        if not lote:
+            return
+        yield lote
+
+# ===============================
+# CARGA EN UNA COLECCIÓN
+# ===============================
+
+def cargar(registros: Iterable[Dict[str, Any]], destino) -> int:
+    """
+    Vuelca los registros en el destino sin pasar por una lista intermedia:
+    un Catalogo (alta masiva con los índices construidos al final), un
+    AlmacenProductos o una lista. Devuelve cuántos registros se han cargado.
+    """
+    if hasattr(destino, 'cargar'):
+        return destino.cargar(registros)
+    antes = len(destino)
+    if hasattr(destino, 'agregar_lote'):
+        destino.agregar_lote(registros)
+    else:
+        destino.extend(registros)
+    return len(destino) - antes
+
+def cargar_productos(ruta: str, destino=None, **opciones):
+    """
+    Carga los productos de un CSV o JSON Lines en `destino` (por defecto un
+    CatalogoProductos nuevo) y lo devuelve. Las opciones son las de
+    leer_registros.
+    """
+    if destino is None:
+        from catalogo import CatalogoProductos
+        destino = CatalogoProductos()
+    cargar(leer_registros(ruta, ESQUEMA_PRODUCTOS, **opciones), destino)
+    return destino
+
+def cargar_empleados(ruta: str, destino=None, **opciones):
+    """Como cargar_productos, para empleados (por defecto en un CatalogoEmpleados nuevo)."""
+    if destino is None:
+        from catalogo import CatalogoEmpleados
+        destino = CatalogoEmpleados()
+    cargar(leer_registros(ruta, ESQUEMA_EMPLEADOS, **opciones), destino)
+    return destino
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    from benchmark import generar_productos
+
+    print("=== PRUEBAS DEL CARGADOR ===\n")
+    directorio = tempfile.mkdtemp()
+    ruta_csv = os.path.join(directorio, 'productos.csv')
+    with open(ruta_csv, 'w', encoding='utf-8', newline='') as f:
+        f.write("id,nombre,marca,categoria,precio,stock,disponible\n"
+                "1,iPhone 15,Apple,Smartphone,999.99,10,true\n"
+                "2,Galaxy S24,Samsung,,899.99,0,false\n"
+                "3,Roto,Dell,Laptop,caro,5,sí\n")
+    informe = {}
+    catalogo = cargar_productos(ruta_csv, omitir_errores=True, informe=informe)
+    print(f"1. CSV: {informe['validos']} cargados, {informe['descartados']} descartados")
+    print(f"   Error: {informe['errores'][0]}")
+    print(f"   Producto 2: {catalogo.obtener(2)}")
+
+    n = 200_000
+    ruta_jsonl = os.path.join(directorio, 'productos.jsonl.gz')
+    with gzip.open(ruta_jsonl, 'wt', encoding='utf-8') as f:
+        for producto in generar_productos(n):
+            f.write(json.dumps(producto) + "\n")
+    inicio = time.perf_counter()
+    catalogo = cargar_productos(ruta_jsonl)
+    segundos = time.perf_counter() - inicio
+    print(f"\n2. JSONL comprimido con {n:,} productos cargado en {segundos:.2f}s "
+          f"({n / segundos:,.0f} filas/s con todos los índices)")
+    print(f"   Apple disponibles: {len(catalogo.buscar_productos_con_filtros(marca='apple', disponible=True))}")
@@ -0,0 +1,844 @@
+import threading
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from numbers import Real
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from agregados import AgregadosEmpleados, AgregadosProductos
+from autocompletado import IndicePrefijos, nombre_completo
+from busqueda_difusa import IndiceTrigramas, puntuacion
+from busqueda_subcadenas import IndiceSubcadenas
+from busqueda_texto import IndiceInvertido
+from mapa_bits import MapaBits
+from normalizacion import clave_busqueda, clave_texto
+from planificador import Planificador
+from vigilancia_stock import VigilanciaStock
+
+# Comprobar antes la clase exacta evita el isinstance con Real, que es lento
+_NUMEROS = (int, float)
+
+def _en_stock(registro: Dict[str, Any]) -> bool:
+    stock = registro.get('stock', 0)
+    return (stock.__class__ in _NUMEROS or isinstance(stock, Real)) and stock > 0
+
+class _Falta:
+    """Marca de las filas que no tienen el campo."""
+
+    def __repr__(self) -> str:
+        return 'FALTA'
+
+FALTA = _Falta()
+
+# ===============================
+# ÍNDICES
+# ===============================
+
+class Indice:
+    """
+    Base de los índices de un Catalogo. El catálogo avisa al índice de cada
+    alta, cambio y baja con la posición del registro; un índice nuevo puede
+    engancharse a estos tres métodos para mantenerse al día.
+    """
+
+    def __init__(self, campo: str, normalizar: Optional[Callable[[Any], Any]] = None):
+        self.campo = campo
+        self.normalizar = normalizar
+
+    def clave(self, registro: Dict[str, Any]):
+        valor = registro.get(self.campo)
+        return self.normalizar(valor) if self.normalizar else valor
+
+    def construir(self, filas: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        for pos, registro in filas:
+            self.insertar(pos, registro)
+
+    def verificar(self, pos: int, registro: Dict[str, Any]) -> None:
+        """Lanza ValueError si el registro no puede entrar en el índice."""
+
+    def insertar(self, pos: int, registro: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def eliminar(self, pos: int, registro: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+    def actualizar(self, pos: int, anterior: Dict[str, Any], nuevo: Dict[str, Any]) -> None:
+        if self.clave(anterior) != self.clave(nuevo):
+            self.eliminar(pos, anterior)
+            self.insertar(pos, nuevo)
+
+    def _exacto(self, valor) -> bool:
+        """
+        Si una búsqueda por igualdad en el índice da lo mismo que comparar fila
+        a fila (textos sin distinguir mayúsculas). None engloba las filas sin
+        el campo y los textos solo coinciden si el índice los normaliza.
+        """
+        if valor is None or valor != valor:
+            return False
+        return self.normalizar is not None or not isinstance(valor, str)
+
+    def igualdad(self, valor) -> Optional[List[int]]:
+        """Posiciones cuyo campo es igual a valor, o None si el índice no puede responder con exactitud."""
+        return None
+
+    def cuenta_igualdad(self, valor) -> Optional[int]:
+        """Cuántas posiciones devolvería igualdad(valor), sin construirlas."""
+        return None
+
+class IndiceUnico(Indice):
+    """Índice hash clave -> posición; rechaza claves repetidas. Las claves None no se indexan."""
+
+    def __init__(self, campo: str, normalizar: Optional[Callable[[Any], Any]] = None):
+        super().__init__(campo, normalizar)
+        self.posiciones: Dict[Any, int] = {}
+
+    def verificar(self, pos: int, registro: Dict[str, Any]) -> None:
+        self._verificar_clave(pos, self.clave(registro), registro)
+
+    def _verificar_clave(self, pos: int, clave, registro: Dict[str, Any]) -> None:
+        otra = self.posiciones.get(clave, pos) if clave is not None else pos
+        if otra != pos:
+            raise ValueError(f"Ya existe un registro con {self.campo}={registro.get(self.campo)!r}")
+
+    def insertar(self, pos: int, registro: Dict[str, Any]) -> None:
+        clave = self.clave(registro)
+        self._verificar_clave(pos, clave, registro)
+        if clave is not None:
+            self.posiciones[clave] = pos
+
+    def eliminar(self, pos: int, registro: Dict[str, Any]) -> None:
+        clave = self.clave(registro)
+        if self.posiciones.get(clave) == pos:
+            del self.posiciones[clave]
+
+    def buscar(self, valor) -> Optional[int]:
+        return self.posiciones.get(self.normalizar(valor) if self.normalizar else valor)
+
+    def igualdad(self, valor) -> Optional[List[int]]:
+        if not self._exacto(valor):
+            return None
+        pos = self.buscar(valor)
+        return [] if pos is None else [pos]
+
+    def cuenta_igualdad(self, valor) -> Optional[int]:
+        return len(self.igualdad(valor)) if self._exacto(valor) else None
+
+class IndiceBitmap(Indice):
+    """
+    Índice valor -> MapaBits de posiciones, para columnas con pocos valores
+    distintos. Las conjunciones y disyunciones de filtros se resuelven con
+    &, | y - entre mapas, y los conteos con popcount, sin visitar filas.
+
+    Guarda cada valor tal cual (las filas sin el campo bajo FALTA) y, si hay
+    `normalizar`, agrupa los valores con la misma forma normalizada. Con
+    `calculo` indexa un valor derivado del registro en lugar de un campo.
+    """
+
+    def __init__(self, campo: str, normalizar: Optional[Callable[[Any], Any]] = None,
+                 calculo: Optional[Callable[[Dict[str, Any]], Any]] = None):
+        super().__init__(campo, normalizar)
+        self.calculo = calculo
+        self.mapas: Dict[Any, MapaBits] = {}
+        self._formas: Dict[Any, Dict[Any, None]] = {}
+
+    def clave(self, registro: Dict[str, Any]):
+        if self.calculo is not None:
+            return self.calculo(registro)
+        return registro.get(self.campo, FALTA)
+
+    def _forma(self, valor):
+        return self.normalizar(valor) if self.normalizar else valor
+
+    def _nuevo_mapa(self, valor, mapa: MapaBits) -> None:
+        self.mapas[valor] = mapa
+        if valor is not FALTA:
+            self._formas.setdefault(self._forma(valor), {})[valor] = None
+
+    def construir(self, filas: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        grupos: Dict[Any, List[int]] = {}
+        for pos, registro in filas:
+            grupos.setdefault(self.clave(registro), []).append(pos)
+        for valor, posiciones in grupos.items():
+            mapa = self.mapas.get(valor)
+            if mapa is None:
+                self._nuevo_mapa(valor, MapaBits(posiciones))
+            else:
+                self.mapas[valor] = mapa | MapaBits(posiciones)
+
+    def insertar(self, pos: int, registro: Dict[str, Any]) -> None:
+        valor = self.clave(registro)
+        mapa = self.mapas.get(valor)
+        if mapa is None:
+            self._nuevo_mapa(valor, MapaBits([pos]))
+        else:
+            mapa.agregar(pos)
+
+    def eliminar(self, pos: int, registro: Dict[str, Any]) -> None:
+        valor = self.clave(registro)
+        mapa = self.mapas.get(valor)
+        if mapa is None:
+            return
+        mapa.quitar(pos)
+        if not mapa:
+            del self.mapas[valor]
+            if valor is not FALTA:
+                forma = self._forma(valor)
+                valores = self._formas[forma]
+                del valores[valor]
+                if not valores:
+                    del self._formas[forma]
+
+    def mapa(self, valor) -> MapaBits:
+        """Posiciones cuyo valor (normalizado, si hay normalizar) es igual a valor. No modificar."""
+        valores = self._formas.get(self._forma(valor), ())
+        mapas = [self.mapas[v] for v in valores]
+        if not mapas:
+            return MapaBits()
+        resultado = mapas[0]
+        for mapa in mapas[1:]:
+            resultado = resultado | mapa
+        return resultado
+
+    def union(self, condicion: Callable[[Any], bool]) -> MapaBits:
+        """Posiciones cuyo valor original cumple la condición."""
+        resultado = MapaBits()
+        for valor, mapa in self.mapas.items():
+            if valor is not FALTA and condicion(valor):
+                resultado = resultado | mapa
+        return resultado
+
+    def igualdad(self, valor) -> Optional[List[int]]:
+        return self.mapa(valor).a_lista() if self._exacto(valor) else None
+
+    def cuenta_igualdad(self, valor) -> Optional[int]:
+        return len(self.mapa(valor)) if self._exacto(valor) else None
+
+    def conteos(self) -> Dict[Any, int]:
+        """Filas por valor original, en orden de primera aparición."""
+        primeras = sorted((next(iter(mapa)), valor) for valor, mapa in self.mapas.items())
+        return {valor: len(self.mapas[valor]) for _, valor in primeras}
+
+class IndiceOrdenado(Indice):
+    """
+    Índice ordenado por (valor, posición) para consultas de rango con bisect
+    en O(log n + k). Las altas y bajas insertan o quitan en su sitio, sin
+    reordenar. Los valores que no son números (o son NaN) quedan aparte en
+    `otros`, porque ningún rango los incluye.
+    """
+
+    def __init__(self, campo: str, defecto=None):
+        super().__init__(campo)
+        self.defecto = defecto
+        self.valores: List[Real] = []
+        self.posiciones: List[int] = []
+        self.otros: Dict[int, None] = {}
+
+    def clave(self, registro: Dict[str, Any]):
+        return registro.get(self.campo, self.defecto)
+
+    @staticmethod
+    def _ordenable(valor) -> bool:
+        return (valor.__class__ in _NUMEROS or isinstance(valor, Real)) and valor == valor
+
+    def construir(self, filas: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        pares = []
+        for pos, registro in filas:
+            valor = self.clave(registro)
+            if self._ordenable(valor):
+                pares.append((valor, pos))
+            else:
+                self.otros[pos] = None
+        pares.extend(zip(self.valores, self.posiciones))
+        pares.sort()
+        self.valores = [v for v, _ in pares]
+        self.posiciones = [pos for _, pos in pares]
+
+    def _hueco(self, valor, pos: int) -> int:
+        lo = bisect_left(self.valores, valor)
+        hi = bisect_right(self.valores, valor, lo)
+        return bisect_left(self.posiciones, pos, lo, hi)
+
+    def insertar(self, pos: int, registro: Dict[str, Any]) -> None:
+        valor = self.clave(registro)
+        if not self._ordenable(valor):
+            self.otros[pos] = None
+            return
+        i = self._hueco(valor, pos)
+        self.valores.insert(i, valor)
+        self.posiciones.insert(i, pos)
+
+    def eliminar(self, pos: int, registro: Dict[str, Any]) -> None:
+        valor = self.clave(registro)
+        if not self._ordenable(valor):
+            self.otros.pop(pos, None)
+            return
+        i = self._hueco(valor, pos)
+        if i < len(self.posiciones) and self.posiciones[i] == pos:
+            del self.valores[i]
+            del self.posiciones[i]
+
+    def _limites(self, minimo, maximo, incluir_min: bool, incluir_max: bool) -> Tuple[int, int]:
+        valores = self.valores
+        lo, hi = 0, len(valores)
+        if minimo is not None:
+            lo = (bisect_left if incluir_min else bisect_right)(valores, minimo)
+        if maximo is not None:
+            hi = (bisect_right if incluir_max else bisect_left)(valores, maximo)
+        return lo, max(lo, hi)
+
+    def rango(self, minimo=None, maximo=None, incluir_min: bool = True, incluir_max: bool = True) -> List[int]:
+        """Posiciones con minimo <= valor <= maximo, ordenadas por valor. None = sin límite."""
+        lo, hi = self._limites(minimo, maximo, incluir_min, incluir_max)
+        return self.posiciones[lo:hi]
+
+    def contar_rango(self, minimo=None, maximo=None, incluir_min: bool = True, incluir_max: bool = True) -> int:
+        lo, hi = self._limites(minimo, maximo, incluir_min, incluir_max)
+        return hi - lo
+
+    def iter_menores(self) -> Iterator[int]:
+        """Posiciones de menor a mayor valor; los empates, por posición (como sorted)."""
+        return iter(self.posiciones)
+
+    def iter_mayores(self) -> Iterator[int]:
+        """Posiciones de mayor a menor valor; los empates, por posición (como sorted con reverse=True)."""
+        valores, posiciones = self.valores, self.posiciones
+        j = len(valores)
+        while j:
+            i = bisect_left(valores, valores[j - 1], 0, j)
+            yield from posiciones[i:j]
+            j = i
+
+    def menores(self, k: int) -> List[int]:
+        return self.posiciones[:k]
+
+    def mayores(self, k: int) -> List[int]:
+        return list(islice(self.iter_mayores(), k))
+
+class IndiceRanking(Indice):
+    """
+    Un IndiceOrdenado por cada valor (normalizado) del campo `particion`,
+    para los rankings dentro de un grupo, como los más caros de una
+    categoría, en O(k) en lugar de ordenar el grupo en cada consulta.
+    """
+
+    def __init__(self, campo: str, particion: str, defecto=None,
+                 normalizar: Optional[Callable[[Any], Any]] = clave_busqueda):
+        super().__init__(campo, normalizar)
+        self.particion = particion
+        self.defecto = defecto
+        self.grupos: Dict[Any, IndiceOrdenado] = {}
+
+    def _grupo(self, registro: Dict[str, Any]):
+        return self.normalizar(registro.get(self.particion))
+
+    def clave(self, registro: Dict[str, Any]):
+        return self._grupo(registro), registro.get(self.campo, self.defecto)
+
+    def insertar(self, pos: int, registro: Dict[str, Any]) -> None:
+        clave = self._grupo(registro)
+        grupo = self.grupos.get(clave)
+        if grupo is None:
+            grupo = self.grupos[clave] = IndiceOrdenado(self.campo, self.defecto)
+        grupo.insertar(pos, registro)
+
+    def construir(self, filas: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        miembros: Dict[Any, List[Tuple[int, Dict[str, Any]]]] = {}
+        for pos, registro in filas:
+            miembros.setdefault(self._grupo(registro), []).append((pos, registro))
+        for clave, filas_grupo in miembros.items():
+            grupo = self.grupos.get(clave)
+            if grupo is None:
+                grupo = self.grupos[clave] = IndiceOrdenado(self.campo, self.defecto)
+            grupo.construir(filas_grupo)
+
+    def eliminar(self, pos: int, registro: Dict[str, Any]) -> None:
+        clave = self._grupo(registro)
+        grupo = self.grupos.get(clave)
+        if grupo is not None:
+            grupo.eliminar(pos, registro)
+            if not grupo.posiciones and not grupo.otros:
+                del self.grupos[clave]
+
+    def grupo(self, valor) -> Optional[IndiceOrdenado]:
+        return self.grupos.get(self.normalizar(valor))
+
+# ===============================
+# CATÁLOGO
+# ===============================
+
+def _en_bloque(indice) -> bool:
+    """Si el índice tiene su propia construcción en bloque, más rápida que insertar fila a fila."""
+    return type(indice).construir is not Indice.construir
+
+class Catalogo:
+    """
+    Colección de registros (diccionarios) con índices que se mantienen
+    al día en cada alta, cambio o baja, en lugar de recorrer la lista entera
+    en cada búsqueda.
+
+    Cada registro ocupa una posición fija; las bajas dejan un hueco para no
+    tener que renumerar los índices. Los registros devueltos no deben
+    modificarse directamente: los cambios se hacen con actualizar().
+    Las altas, cambios y bajas se serializan con un cerrojo, así varios
+    hilos pueden modificar el catálogo sin dejar índices a medias.
+    """
+
+    def __init__(self, registros: Iterable[Dict[str, Any]] = (), clave: str = 'id'):
+        self.clave = clave
+        self._filas: List[Optional[Dict[str, Any]]] = []
+        self._vivos = 0
+        # Aumenta con cada alta, cambio o baja, después de poner al día los
+        # índices: quien lee la versión nueva ya ve los índices completos
+        self.version = 0
+        self._cerrojo = threading.RLock()
+        self.primario = IndiceUnico(clave)
+        self.indices: Dict[str, Indice] = {}
+        self.cargar(registros)
+
+    # Búsquedas que la subclase resuelve con sus índices: nombre de la
+    # búsqueda -> función(catálogo, argumentos) con las posiciones en orden
+    _POSICIONES: Dict[str, Callable[..., Iterable[int]]] = {}
+
+    def _todos_los_indices(self) -> List[Indice]:
+        return [self.primario, *self.indices.values()]
+
+    def posiciones_busqueda(self, nombre: str, *args, **kwargs) -> Optional[Iterable[int]]:
+        """
+        Posiciones (en orden) de los registros que devuelve la búsqueda
+        `nombre`, sacadas de los índices sin recorrer los registros; None si
+        el catálogo no tiene índice para esa búsqueda.
+        """
+        calculo = self._POSICIONES.get(nombre)
+        return None if calculo is None else calculo(self, *args, **kwargs)
+
+    def agregar_indice(self, nombre: str, indice: Indice) -> Indice:
+        """Registra un índice y lo construye con los registros actuales."""
+        with self._cerrojo:
+            indice.construir(self.filas())
+            self.indices[nombre] = indice
+        return indice
+
+    def filas(self, desde: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Pares (posición, registro) de los registros vivos a partir de la posición `desde`."""
+        filas = self._filas
+        return ((pos, filas[pos]) for pos in range(desde, len(filas)) if filas[pos] is not None)
+
+    def registro(self, pos: int) -> Dict[str, Any]:
+        return self._filas[pos]
+
+    def posicion(self, valor_clave) -> Optional[int]:
+        return self.primario.buscar(valor_clave)
+
+    def obtener(self, valor_clave) -> Optional[Dict[str, Any]]:
+        pos = self.primario.buscar(valor_clave)
+        return None if pos is None else self._filas[pos]
+
+    def insertar(self, registro: Dict[str, Any]) -> Dict[str, Any]:
+        """Da de alta una copia del registro y la devuelve."""
+        if registro.get(self.clave) is None:
+            raise ValueError(f"El registro necesita un valor para '{self.clave}'")
+        nuevo = dict(registro)
+        with self._cerrojo:
+            pos = len(self._filas)
+            indices = self._todos_los_indices()
+            for indice in indices:
+                indice.verificar(pos, nuevo)
+            self._filas.append(nuevo)
+            self._vivos += 1
+            for indice in indices:
+                indice.insertar(pos, nuevo)
+            self.version += 1
+        return nuevo
+
+    def cargar(self, registros: Iterable[Dict[str, Any]]) -> int:
+        """
+        Alta masiva de registros (una copia de cada uno). Los índices que se
+        construyen mejor en bloque (mapas de bits, ordenados, rankings) no se
+        tocan fila a fila: se construyen al final con todas las filas nuevas.
+        Los demás, como los únicos que rechazan duplicados, se mantienen con
+        cada fila. Si un registro falla, los anteriores quedan cargados.
+        Devuelve el número de registros dados de alta.
+        """
+        with self._cerrojo:
+            todos = self._todos_los_indices()
+            inmediatos = [indice for indice in todos if not _en_bloque(indice)]
+            aplazados = [indice for indice in todos if _en_bloque(indice)]
+            filas = self._filas
+            desde = len(filas)
+            try:
+                for registro in registros:
+                    if registro.get(self.clave) is None:
+                        raise ValueError(f"El registro necesita un valor para '{self.clave}'")
+                    nuevo = dict(registro)
+                    pos = len(filas)
+                    for indice in aplazados:
+                        indice.verificar(pos, nuevo)
+                    filas.append(nuevo)
+                    try:
+                        # insertar ya verifica; si un índice rechaza la fila
+                        # se retira de los que la habían aceptado
+                        for indice in inmediatos:
+                            indice.insertar(pos, nuevo)
+                    except ValueError:
+                        for indice in inmediatos:
+                            indice.eliminar(pos, nuevo)
+                        filas.pop()
+                        raise
+            finally:
+                cargados = len(filas) - desde
+                self._vivos += cargados
+                try:
+                    for indice in aplazados:
+                        indice.construir(self.filas(desde))
+                finally:
+                    self.version += cargados
+        return cargados
+
+    def actualizar(self, valor_clave, **cambios) -> Dict[str, Any]:
+        """Aplica los cambios al registro con esa clave y devuelve la versión nueva."""
+        with self._cerrojo:
+            pos = self.primario.buscar(valor_clave)
+            if pos is None:
+                raise KeyError(valor_clave)
+            anterior = self._filas[pos]
+            nuevo = {**anterior, **cambios}
+            if nuevo.get(self.clave) is None:
+                raise ValueError(f"El registro necesita un valor para '{self.clave}'")
+            indices = self._todos_los_indices()
+            for indice in indices:
+                indice.verificar(pos, nuevo)
+            self._filas[pos] = nuevo
+            for indice in indices:
+                indice.actualizar(pos, anterior, nuevo)
+            self.version += 1
+        return nuevo
+
+    def eliminar(self, valor_clave) -> Dict[str, Any]:
+        """Da de baja el registro con esa clave y lo devuelve."""
+        with self._cerrojo:
+            pos = self.primario.buscar(valor_clave)
+            if pos is None:
+                raise KeyError(valor_clave)
+            registro = self._filas[pos]
+            self._filas[pos] = None
+            self._vivos -= 1
+            for indice in self._todos_los_indices():
+                indice.eliminar(pos, registro)
+            self.version += 1
+        return registro
+
+    def __len__(self) -> int:
+        return self._vivos
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (r for r in self._filas if r is not None)
+
+    def __contains__(self, valor_clave) -> bool:
+        return self.primario.buscar(valor_clave) is not None
+
+def _conteos(indice: IndiceBitmap, sin_valor) -> Dict[Any, int]:
+    """Filas por valor de un IndiceBitmap; las que no tienen el campo cuentan bajo sin_valor."""
+    conteo: Dict[Any, int] = {}
+    for valor, cantidad in indice.conteos().items():
+        valor = sin_valor if valor is FALTA else valor
+        conteo[valor] = conteo.get(valor, 0) + cantidad
+    return conteo
+
+class CatalogoProductos(Catalogo):
+    """
+    Catálogo de productos con índices hash únicos sobre id y nombre normalizado,
+    mapas de bits sobre marca y categoría (normalizadas), disponible y "en
+    stock" (stock > 0), índices ordenados sobre precio y stock y rankings de
+    precio por categoría y por marca. Tiene los mismos métodos que las
+    funciones de búsqueda de los módulos, que le delegan al recibirlo.
+    """
+
+    def __init__(self, productos: Iterable[Dict[str, Any]] = ()):
+        # Se cargan primero los registros para construir cada índice de una vez
+        super().__init__(productos, clave='id')
+        self.agregar_indice('nombre', IndiceUnico('nombre', clave_busqueda))
+        self.agregar_indice('marca', IndiceBitmap('marca', clave_busqueda))
+        self.agregar_indice('categoria', IndiceBitmap('categoria', clave_busqueda))
+        self.agregar_indice('disponible', IndiceBitmap('disponible'))
+        self.agregar_indice('en_stock', IndiceBitmap('en_stock', calculo=_en_stock))
+        self.agregar_indice('precio', IndiceOrdenado('precio', 0.0))
+        self.agregar_indice('stock', IndiceOrdenado('stock', 0))
+        self.agregar_indice('precio_por_categoria', IndiceRanking('precio', 'categoria', 0.0))
+        self.agregar_indice('precio_por_marca', IndiceRanking('precio', 'marca', 0.0))
+        self.agregar_indice('agregados', AgregadosProductos())
+        self.planificador = Planificador(self)
+
+    def _filas_de(self, posiciones: Iterable[int]) -> List[Dict[str, Any]]:
+        filas = self._filas
+        return [filas[pos] for pos in posiciones]
+
+    def buscar_producto_por_id(self, id_buscado) -> Optional[Dict[str, Any]]:
+        return self.obtener(id_buscado)
+
+    def buscar_producto_por_nombre(self, nombre_buscado: str) -> Optional[Dict[str, Any]]:
+        pos = self.indices['nombre'].buscar(nombre_buscado)
+        return None if pos is None else self._filas[pos]
+
+    def buscar_productos_parecidos(self, nombre_buscado: str, cantidad: int = 5,
+                                   max_errores: Optional[int] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Pares (producto, puntuación) de nombre parecido, con el índice de
+        trigramas; este se construye la primera vez que se usa, así las
+        cargas que no buscan por aproximación no lo pagan.
+        """
+        indice = self.indices.get('trigramas')
+        if indice is None:
+            indice = self.agregar_indice('trigramas', IndiceTrigramas('nombre'))
+        clave = clave_texto(nombre_buscado)
+        return [(self._filas[pos], puntuacion(clave, errores))
+                for pos, errores in indice.parecidos(nombre_buscado, cantidad, max_errores)]
+
+    def autocompletar_productos(self, prefijo: str, cantidad: int = 10) -> List[Dict[str, Any]]:
+        """Los `cantidad` primeros productos (por nombre) cuyo nombre empieza por el prefijo."""
+        indice = self.indices.get('prefijos')
+        if indice is None:
+            indice = self.agregar_indice('prefijos', IndicePrefijos('nombre'))
+        return self._filas_de(indice.completar(prefijo, cantidad))
+
+    def buscar_productos_por_texto(self, consulta: str, operador: str = 'y',
+                                   cantidad: Optional[int] = None) -> List[Tuple[Dict[str, Any], float]]:
+        """
+        Pares (producto, puntuación BM25) de los productos con todas ('y') o
+        alguna ('o') de las palabras de la consulta en nombre, marca o
+        categoría, del más al menos relevante. El índice invertido se
+        construye la primera vez.
+        """
+        indice = self.indices.get('texto')
+        if indice is None:
+            indice = self.agregar_indice('texto', IndiceInvertido())
+        filas = self._filas
+        return [(filas[pos], puntos) for pos, puntos in indice.buscar_ranking(consulta, operador, cantidad)]
+
+    def _por_categoria(self, categoria_buscada: str) -> MapaBits:
+        return self.indices['categoria'].mapa(categoria_buscada)
+
+    def _por_marca(self, marca_buscada: str) -> MapaBits:
+        return self.indices['marca'].mapa(marca_buscada)
+
+    def _disponibles(self) -> MapaBits:
+        return self.indices['en_stock'].mapa(True) & self.indices['disponible'].union(bool)
+
+    def _sin_stock(self) -> List[int]:
+        return sorted(self.indices['stock'].rango(0, 0))
+
+    def buscar_productos_por_categoria(self, categoria_buscada: str) -> List[Dict[str, Any]]:
+        return self._filas_de(self._por_categoria(categoria_buscada))
+
+    def buscar_productos_por_marca(self, marca_buscada: str) -> List[Dict[str, Any]]:
+        return self._filas_de(self._por_marca(marca_buscada))
+
+    def buscar_productos_disponibles(self) -> List[Dict[str, Any]]:
+        return self._filas_de(self._disponibles())
+
+    def buscar_productos_sin_stock(self) -> List[Dict[str, Any]]:
+        return self._filas_de(self._sin_stock())
+
+    # Rankings: productos sin precio numérico (None, NaN, texto) no entran
+
+    def _ranking(self, mayores: bool, cantidad: int, categoria: Optional[str], marca: Optional[str]) -> List[Dict[str, Any]]:
+        otro = None
+        if categoria is not None:
+            ranking = self.indices['precio_por_categoria'].grupo(categoria)
+            if marca is not None:
+                otro = self.indices['marca'].mapa(marca)
+        elif marca is not None:
+            ranking = self.indices['precio_por_marca'].grupo(marca)
+        else:
+            ranking = self.indices['precio']
+        if ranking is None or cantidad <= 0:
+            return []
+        posiciones = ranking.iter_mayores() if mayores else ranking.iter_menores()
+        if otro is not None:
+            posiciones = (pos for pos in posiciones if pos in otro)
+        return self._filas_de(islice(posiciones, cantidad))
+
+    def obtener_productos_mas_caros(self, cantidad: int = 3, categoria: Optional[str] = None,
+                                    marca: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._ranking(True, cantidad, categoria, marca)
+
+    def obtener_productos_mas_baratos(self, cantidad: int = 3, categoria: Optional[str] = None,
+                                      marca: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self._ranking(False, cantidad, categoria, marca)
+
+    def contar_productos_por_categoria(self, categoria_buscada: Optional[str] = None, sin_categoria=''):
+        """
+        Como contar_productos_por_categoria, con popcount sobre los mapas de bits.
+        `sin_categoria` es la clave del conteo de los productos sin categoría.
+        """
+        indice = self.indices['categoria']
+        if categoria_buscada:
+            return len(indice.mapa(categoria_buscada))
+        return _conteos(indice, sin_categoria)
+
+    def calcular_valor_inventario_total(self) -> float:
+        return self.indices['agregados'].valor_inventario()
+
+    def estadisticas_productos(self) -> Dict[str, Any]:
+        """Las cifras de mostrar_estadisticas, leídas de los agregados y mapas de bits."""
+        agregados = self.indices['agregados']
+        return {'total': agregados.total, 'disponibles': agregados.disponibles,
+                'sin_stock': agregados.sin_stock, 'valor_inventario': agregados.valor_inventario(),
+                'por_categoria': self.contar_productos_por_categoria(sin_categoria='Sin categoría'),
+                'por_marca': _conteos(self.indices['marca'], 'Sin marca')}
+
+    # Los rangos salen del índice ordenados por valor; se reordenan por posición
+    # para devolver lo mismo, y en el mismo orden, que recorrer la lista.
+
+    def _por_rango_precio(self, precio_min: float, precio_max: float) -> List[int]:
+        return sorted(self.indices['precio'].rango(precio_min, precio_max))
+
+    def _por_stock_minimo(self, stock_minimo: int) -> List[int]:
+        return sorted(self.indices['stock'].rango(stock_minimo))
+
+    def _bajo_stock(self, limite_stock: int = 5) -> List[int]:
+        return sorted(self.indices['stock'].rango(0, limite_stock, incluir_min=False))
+
+    def buscar_productos_por_rango_precio(self, precio_min: float, precio_max: float) -> List[Dict[str, Any]]:
+        return self._filas_de(self._por_rango_precio(precio_min, precio_max))
+
+    def buscar_productos_por_stock_minimo(self, stock_minimo: int) -> List[Dict[str, Any]]:
+        return self._filas_de(self._por_stock_minimo(stock_minimo))
+
+    def buscar_productos_bajo_stock(self, limite_stock: int = 5) -> List[Dict[str, Any]]:
+        return self._filas_de(self._bajo_stock(limite_stock))
+
+    def vigilar_stock(self, limite_stock: int = 5) -> VigilanciaStock:
+        """
+        Vigilancia de los productos con poco stock (0 < stock <= limite_stock)
+        y agotados, registrada como índice: se entera de cada alta, cambio o
+        baja. Se crea la primera vez y después se devuelve la misma.
+        """
+        nombre = f'vigilancia_{limite_stock}'
+        with self._cerrojo:
+            vigilancia = self.indices.get(nombre)
+            if vigilancia is None:
+                vigilancia = self.agregar_indice(nombre, VigilanciaStock(limite_stock))
+        return vigilancia
+
+    def buscar_productos_con_filtros(self, **filtros) -> List[Dict[str, Any]]:
+        return self.planificador.ejecutar(filtros, rangos=False)
+
+    def buscar_productos_con_filtros_multiples(self, **filtros) -> List[Dict[str, Any]]:
+        return self.planificador.ejecutar(filtros)
+
+    _POSICIONES = {
+        'buscar_productos_por_categoria': _por_categoria,
+        'buscar_productos_por_marca': _por_marca,
+        'buscar_productos_disponibles': _disponibles,
+        'buscar_productos_sin_stock': _sin_stock,
+        'buscar_productos_por_rango_precio': _por_rango_precio,
+        'buscar_productos_por_stock_minimo': _por_stock_minimo,
+        'buscar_productos_bajo_stock': _bajo_stock,
+    }
+
+class CatalogoEmpleados(Catalogo):
+    """
+    Catálogo de empleados con mapas de bits sobre departamento y activo y
+    agregados de salarios, para los resúmenes y estadísticas sin recorrer
+    la lista.
+    """
+
+    def __init__(self, empleados: Iterable[Dict[str, Any]] = ()):
+        super().__init__(empleados, clave='id')
+        self.agregar_indice('departamento', IndiceBitmap('departamento'))
+        self.agregar_indice('activo', IndiceBitmap('activo'))
+        self.agregar_indice('agregados', AgregadosEmpleados())
+
+    def buscar_empleado_por_id(self, id_buscado) -> Optional[Dict[str, Any]]:
+        return self.obtener(id_buscado)
+
+    def _activos(self) -> MapaBits:
+        return self.indices['activo'].union(bool)
+
+    def buscar_empleados_activos(self) -> List[Dict[str, Any]]:
+        filas = self._filas
+        return [filas[pos] for pos in self._activos()]
+
+    def autocompletar_empleados(self, prefijo: str, cantidad: int = 10) -> List[Dict[str, Any]]:
+        """Los `cantidad` primeros empleados (por "nombre apellido") cuyo nombre completo empieza por el prefijo."""
+        indice = self.indices.get('prefijos')
+        if indice is None:
+            indice = self.agregar_indice('prefijos', IndicePrefijos(calculo=nombre_completo))
+        filas = self._filas
+        return [filas[pos] for pos in indice.completar(prefijo, cantidad)]
+
+    def buscar_empleados_por_nombre_o_apellido(self, texto_buscado: str) -> List[Dict[str, Any]]:
+        """
+        Empleados con el texto en el nombre o el apellido, sin distinguir
+        mayúsculas ni tildes. El índice de subcadenas se construye la primera
+        vez que se usa.
+        """
+        filas = self._filas
+        return [filas[pos] for pos in self._por_nombre_o_apellido(texto_buscado)]
+
+    def _por_nombre_o_apellido(self, texto_buscado: str) -> Iterable[int]:
+        if not clave_texto(texto_buscado):
+            return [pos for pos, _ in self.filas()]
+        indice = self.indices.get('subcadenas')
+        if indice is None:
+            indice = self.agregar_indice('subcadenas', IndiceSubcadenas(('nombre', 'apellido')))
+        return indice.buscar(texto_buscado)
+
+    def obtener_resumen_departamentos(self) -> Dict[Any, int]:
+        return _conteos(self.indices['departamento'], None)
+
+    def estadisticas_empleados(self) -> Dict[str, Any]:
+        """Las cifras de mostrar_estadisticas, leídas de los agregados y mapas de bits."""
+        agregados = self.indices['agregados']
+        activos = len(self.indices['activo'].union(bool))
+        return {'total': agregados.total, 'activos': activos, 'inactivos': agregados.total - activos,
+                'salario_promedio': agregados.salario_promedio(),
+                'por_departamento': _conteos(self.indices['departamento'], 'Sin departamento'),
+                'salarios_por_departamento': agregados.salarios_por_departamento()}
+
+    _POSICIONES = {
+        'buscar_empleados_activos': _activos,
+        'buscar_empleados_por_nombre_o_apellido': _por_nombre_o_apellido,
+    }
+
+if __name__ == "__main__":
+    productos = [
+        {'id': 1, 'nombre': 'iPhone 15', 'marca': 'Apple', 'categoria': 'Smartphone', 'precio': 999.99, 'stock': 10, 'disponible': True},
+        {'id': 2, 'nombre': 'Samsung Galaxy S24', 'marca': 'Samsung', 'categoria': 'Smartphone', 'precio': 899.99, 'stock': 8, 'disponible': True},
+        {'id': 3, 'nombre': 'MacBook Air M3', 'marca': 'Apple', 'categoria': 'Laptop', 'precio': 1299.99, 'stock': 5, 'disponible': True},
+        {'id': 4, 'nombre': 'Dell XPS 13', 'marca': 'Dell', 'categoria': 'Laptop', 'precio': 1199.99, 'stock': 0, 'disponible': False},
+        {'id': 5, 'nombre': 'Sony WH-1000XM5', 'marca': 'Sony', 'categoria': 'Audífonos', 'precio': 399.99, 'stock': 15, 'disponible': True}
+    ]
+    catalogo = CatalogoProductos(productos)
+
+    print("=== PRUEBAS DEL CATÁLOGO INDEXADO ===\n")
+    print(f"1. Buscando ID 2: {catalogo.buscar_producto_por_id(2)['nombre']}")
+    print(f"2. Buscando ' macbook air m3 ': {catalogo.buscar_producto_por_nombre(' macbook air m3 ')['id']}")
+
+    print("\n3. Productos Apple:")
+    for producto in catalogo.buscar_productos_por_marca('APPLE'):
+        print(f"   - {producto['nombre']}")
+
+    catalogo.actualizar(4, marca='Apple', nombre='MacBook Pro')
+    catalogo.eliminar(1)
+    catalogo.insertar({'id': 6, 'nombre': 'iPad Air', 'marca': 'Apple', 'categoria': 'Tablet', 'precio': 599.99, 'stock': 3, 'disponible': True})
+    print("\n4. Productos Apple tras actualizar, eliminar e insertar:")
+    for producto in catalogo.buscar_productos_por_marca('apple'):
+        print(f"   - {producto['nombre']}")
+    print(f"   Buscando 'Dell XPS 13': {catalogo.buscar_producto_por_nombre('Dell XPS 13')}")
+
+    print("\n5. Productos entre $500 y $1200:")
+    for producto in catalogo.buscar_productos_por_rango_precio(500, 1200):
+        print(f"   - {producto['nombre']}: ${producto['precio']}")
+    print(f"   Con stock bajo (<= 5): {[p['nombre'] for p in catalogo.buscar_productos_bajo_stock()]}")
+
+    print(f"\n6. Laptop más cara: {catalogo.obtener_productos_mas_caros(1, categoria='laptop')[0]['nombre']}")
+    print(f"   Productos por categoría: {catalogo.contar_productos_por_categoria()}")
+
+    print(f"   Valor del inventario: ${catalogo.calcular_valor_inventario_total():,.2f}")
+
+    print("\n7. Plan de precio_min=500, marca='apple', disponible=True:")
+    informe = catalogo.planificador.explain(precio_min=500, marca='apple', disponible=True)
+    for paso in informe['plan']:
+        print(f"   - {paso}")
+    print(f"   Estimadas {informe['filas_estimadas']}, examinadas {informe['filas_examinadas']}, "
+          f"devueltas {informe['filas_devueltas']}")
@@ -0,0 +1,111 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Tuple
+
+from normalizacion import clave_texto
+
+PRODUCTOS = 'productos'
+EMPLEADOS = 'empleados'
+IGUALDAD = 'igualdad'
+
+# Rangos de cada dialecto: criterio -> (campo, valor por defecto, operador que descarta)
+_RANGOS = {
+    PRODUCTOS: {'precio_min': ('precio', 0.0, '<'), 'precio_max': ('precio', 0.0, '>'),
+                'stock_min': ('stock', 0, '<'), 'stock_max': ('stock', 0, '>')},
+    EMPLEADOS: {'salario_min': ('salario', 0, '<'), 'salario_max': ('salario', 0, '>')},
+    IGUALDAD: {},
+}
+_CONTIENE = {EMPLEADOS: {'nombre_contiene': 'nombre', 'apellido_contiene': 'apellido'}}
+
+class FiltroCompilado:
+    """Predicado especializado para unos criterios concretos y la lista filtrada con él."""
+
+    def __init__(self, predicado: Callable[[Dict[str, Any]], bool],
+                 filtrar: Callable[[Any], List[Dict[str, Any]]], codigo: str):
+        self.predicado = predicado
+        self.filtrar = filtrar
+        # Código generado, útil para ver en qué orden se comprueban los criterios
+        self.codigo = codigo
+
+    def __call__(self, registro: Dict[str, Any]) -> bool:
+        return self.predicado(registro)
+
+def _condicion(dialecto: str, clave: str, es_texto: bool, i: int) -> Tuple[int, str, str]:
+    """
+    Devuelve (coste, condición, constante) para el criterio i. La condición usa
+    r (el registro), k{i} (la clave o el campo) y c{i} (el valor ya normalizado);
+    la constante es cómo calcular c{i} a partir de v{i}, el valor original.
+    """
+    rango = _RANGOS[dialecto].get(clave)
+    if rango is not None:
+        campo, defecto, op = rango
+        return 0, f"not r.get({campo!r}, {defecto!r}) {op} c{i}", f"v{i}"
+    if dialecto == PRODUCTOS and clave == 'disponible':
+        return 0, f"not r.get('disponible') != c{i}", f"v{i}"
+    campo = _CONTIENE.get(dialecto, {}).get(clave)
+    if campo is not None:
+        return 3, f"c{i} in r[{campo!r}].lower()", f"v{i}.lower()"
+    if not es_texto:
+        return 1, f"k{i} in r and not r[k{i}] != c{i}", f"v{i}"
+    if dialecto in (PRODUCTOS, IGUALDAD):
+        return 2, (f"k{i} in r and (clave_texto(r[k{i}]) == c{i} if isinstance(r[k{i}], str) "
+                   f"else not r[k{i}] != v{i})"), f"clave_texto(v{i})"
+    return 2, f"k{i} in r and str(r[k{i}]).lower() == c{i}", f"v{i}.lower()"
+
+@lru_cache(maxsize=256)
+def _plantilla(dialecto: str, firma: Tuple[Tuple[str, bool], ...]):
+    """Genera y compila el código para una forma de consulta (claves y si cada valor es texto)."""
+    partes = sorted((_condicion(dialecto, clave, es_texto, i) + (i,) for i, (clave, es_texto) in enumerate(firma)),
+                    key=lambda parte: parte[0])
+    argumentos = ", ".join(f"v{i}" for i in range(len(firma)))
+    condicion = " and ".join(f"({cond})" for _, cond, _, _ in partes) or "True"
+    lineas = [f"def _fabrica(claves, {argumentos}):" if firma else "def _fabrica(claves):"]
+    lineas += [f"    k{i} = claves[{i}]" for i in range(len(firma))]
+    lineas += [f"    c{i} = {constante}" for _, _, constante, i in partes]
+    lineas += [f"    def predicado(r):",
+               f"        return {condicion}",
+               f"    def filtrar(registros):",
+               f"        return [r for r in registros if {condicion}]",
+               f"    return predicado, filtrar"]
+    codigo = "\n".join(lineas)
+    espacio = {'clave_texto': clave_texto}
+    exec(compile(codigo, f"<filtro {dialecto}>", 'exec'), espacio)
+    return espacio['_fabrica'], codigo
+
+def compilar_filtros(criterios: Dict[str, Any], dialecto: str = PRODUCTOS) -> FiltroCompilado:
+    """
+    Convierte los criterios en un único predicado especializado. Las constantes
+    se normalizan una sola vez y las comprobaciones baratas (comparaciones
+    numéricas) van antes que las de texto. El código se genera una vez por
+    forma de consulta (claves y tipo de valor) y se reutiliza en las
+    siguientes, que solo enlazan sus valores.
+
+    dialecto PRODUCTOS sigue a buscar_productos_con_filtros_multiples,
+    IGUALDAD a buscar_productos_con_filtros (solo igualdades) y EMPLEADOS a
+    buscar_empleados_avanzado.
+    """
+    claves = tuple(criterios)
+    valores = tuple(criterios.values())
+    firma = tuple((clave, isinstance(valor, str)) for clave, valor in zip(claves, valores))
+    fabrica, codigo = _plantilla(dialecto, firma)
+    predicado, filtrar = fabrica(claves, *valores)
+    return FiltroCompilado(predicado, filtrar, codigo)
+
+if __name__ == "__main__":
+    print("=== PRUEBAS DEL COMPILADOR DE FILTROS ===\n")
+    productos = [
+        {'id': 1, 'nombre': 'iPhone 15', 'marca': 'Apple', 'precio': 999.99, 'stock': 10, 'disponible': True},
+        {'id': 3, 'nombre': 'MacBook Air M3', 'marca': 'Apple', 'precio': 1299.99, 'stock': 5, 'disponible': True},
+        {'id': 4, 'nombre': 'Dell XPS 13', 'marca': 'Dell', 'precio': 1199.99, 'stock': 0, 'disponible': False},
+    ]
+    filtro = compilar_filtros({'marca': ' apple ', 'precio_min': 1000})
+    print("1. Código generado para marca + precio_min:")
+    print(filtro.codigo)
+    print(f"\n   Resultado: {[p['nombre'] for p in filtro.filtrar(productos)]}")
+
+    otro = compilar_filtros({'marca': 'dell', 'precio_min': 100})
+    print(f"\n2. Misma forma, otros valores (sin recompilar): {[p['nombre'] for p in otro.filtrar(productos)]}")
+    print(f"   Formas compiladas: {_plantilla.cache_info().currsize}")
+
+    empleados = [{'nombre': 'Ana', 'apellido': 'García', 'departamento': 'Ventas', 'salario': 35000, 'activo': True}]
+    filtro = compilar_filtros({'departamento': 'VENTAS', 'nombre_contiene': 'an'}, EMPLEADOS)
+    print(f"\n3. Empleados de ventas con 'an' en el nombre: {len(filtro.filtrar(empleados))}")
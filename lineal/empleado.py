@@ -1,3 +1,7 @@
+from autocompletado import completar_en, nombre_completo
+from busqueda_subcadenas import buscar_subcadena_en
+from compilador_filtros import EMPLEADOS, compilar_filtros
+
 # Datos de ejemplo
 empleados = [
     {'id': 101, 'nombre': 'Ana', 'apellido': 'García', 'departamento': 'Ventas', 'salario': 35000, 'activo': True},
@@ -8,8 +12,12 @@ empleados = [
     {'id': 106, 'nombre': 'Pedro', 'apellido': 'Gómez', 'departamento': 'Administración', 'salario': 32000, 'activo': False}
 ]
 
-def buscar_empleado_por_id(empleados, id_buscado):
+def buscar_empleado_por_id(empleados, id_buscado, filtro=None):
     """Busca un empleado por su ID"""
+    if hasattr(empleados, 'buscar_empleado_por_id'):
+        return empleados.buscar_empleado_por_id(id_buscado)
+    if filtro is not None and filtro.descarta(empleados, id_buscado):
+        return None
     return next((e for e in empleados if e['id'] == id_buscado), None)
 
 def buscar_empleado_por_nombre_completo(empleados, nombre_completo):
@@ -27,6 +35,12 @@ def buscar_empleado_por_nombre_completo(empleados, nombre_completo):
                 return e
     return None
 
+def autocompletar_empleados(empleados, prefijo, cantidad=10):
+    """Los primeros empleados (por "nombre apellido") cuyo nombre completo empieza por el prefijo"""
+    if hasattr(empleados, 'autocompletar_empleados'):
+        return empleados.autocompletar_empleados(prefijo, cantidad)
+    return completar_en(empleados, prefijo, cantidad, calculo=nombre_completo)
+
 def buscar_empleados_por_departamento(empleados, departamento_buscado):
     """Busca todos los empleados de un departamento específico"""
     dept = departamento_buscado.lower()
@@ -34,6 +48,8 @@ def buscar_empleados_por_departamento(empleados, departamento_buscado):
 
 def buscar_empleados_activos(empleados):
     """Busca todos los empleados activos"""
+    if hasattr(empleados, 'buscar_empleados_activos'):
+        return empleados.buscar_empleados_activos()
     return [e for e in empleados if e.get('activo')]
 
 def buscar_empleados_por_rango_salario(empleados, salario_min, salario_max):
@@ -41,12 +57,15 @@ def buscar_empleados_por_rango_salario(empleados, salario_min, salario_max):
     return [e for e in empleados if salario_min <= e.get('salario', 0) <= salario_max]
 
 def buscar_empleados_por_nombre_o_apellido(empleados, texto_buscado):
-    """Busca empleados por nombre o apellido (búsqueda parcial)"""
-    t = texto_buscado.lower()
-    return [e for e in empleados if t in e['nombre'].lower() or t in e['apellido'].lower()]
+    """Busca empleados por nombre o apellido (búsqueda parcial, sin distinguir mayúsculas ni tildes)"""
+    if hasattr(empleados, 'buscar_empleados_por_nombre_o_apellido'):
+        return empleados.buscar_empleados_por_nombre_o_apellido(texto_buscado)
+    return buscar_subcadena_en(empleados, texto_buscado, ('nombre', 'apellido'))
 
 def obtener_resumen_departamentos(empleados):
     """Genera un resumen de empleados por departamento"""
+    if hasattr(empleados, 'obtener_resumen_departamentos'):
+        return empleados.obtener_resumen_departamentos()
     resumen = {}
     for e in empleados:
         depto = e['departamento']
@@ -67,7 +86,10 @@ resultado = buscar_empleado_por_nombre_completo(empleados, "Ana García")
 print(f"   Buscando 'Ana García': {resultado['nombre']} {resultado['apellido']} - {resultado['departamento']}")
 
 resultado = buscar_empleado_por_nombre_completo(empleados, "Carlos López")
-print(f"   Buscando 'Carlos López': {resultado['nombre']} {resultado['apellido']} - {resultado['departamento']}\n")
+print(f"   Buscando 'Carlos López': {resultado['nombre']} {resultado['apellido']} - {resultado['departamento']}")
+
+nombres = [nombre_completo(e) for e in autocompletar_empleados(empleados, "ma")]
+print(f"   Empiezan por 'ma': {nombres}\n")
 
 # Prueba 3: Búsqueda por departamento
 print("3. Búsqueda por departamento:")
@@ -103,6 +125,11 @@ print("   Empleados que contienen 'Mar' en nombre o apellido:")
 for empleado in resultados:
     print(f"   - {empleado['nombre']} {empleado['apellido']}")
 
+resultados = buscar_empleados_por_nombre_o_apellido(empleados, "Hernandez")
+print("   Empleados que contienen 'Hernandez' (sin tilde) en nombre o apellido:")
+for empleado in resultados:
+    print(f"   - {empleado['nombre']} {empleado['apellido']}")
+
 # Prueba 7: Resumen de departamentos
 print("\n7. Resumen por departamento:")
 resumen = obtener_resumen_departamentos(empleados)
@@ -119,35 +146,8 @@ print(f"   Buscando 'Juan Pérez': {resultado}")
 
 # Función adicional: Búsqueda avanzada con múltiples criterios
 def buscar_empleados_avanzado(empleados, **criterios):
-    """Búsqueda avanzada de empleados con múltiples criterios"""
-    resultados = []
-    for e in empleados:
-        cumple = True
-        for criterio, valor in criterios.items():
-            if criterio == 'salario_min':
-                if e.get('salario', 0) < valor:
-                    cumple = False; break
-            elif criterio == 'salario_max':
-                if e.get('salario', 0) > valor:
-                    cumple = False; break
-            elif criterio == 'nombre_contiene':
-                if valor.lower() not in e['nombre'].lower():
-                    cumple = False; break
-            elif criterio == 'apellido_contiene':
-                if valor.lower() not in e['apellido'].lower():
-                    cumple = False; break
-            elif criterio in e:
-                if isinstance(valor, str):
-                    if str(e[criterio]).lower() != valor.lower():
-                        cumple = False; break
-                else:
-                    if e[criterio] != valor:
-                        cumple = False; break
-            else:
-                cumple = False; break
-        if cumple:
-            resultados.append(e)
-    return resultados
+    """Búsqueda avanzada de empleados con múltiples criterios (compilados en un solo predicado)"""
+    return compilar_filtros(criterios, EMPLEADOS).filtrar(empleados)
 
 # Prueba de búsqueda avanzada
 print("\n9. Búsqueda avanzada:")
@@ -0,0 +1,155 @@
+import math
+from hashlib import blake2b
+from numbers import Number
+from typing import Any, Callable, List, Optional, Sequence
+
+from normalizacion import clave_busqueda
+
+def normalizar_texto(valor):
+    """Misma normalización que las búsquedas por texto (ver normalizacion.clave_busqueda)."""
+    return clave_busqueda(valor)
+
+def _bytes_clave(clave) -> bytes:
+    """Codifica la clave de forma estable; valores iguales (1, 1.0, True) dan los mismos bytes."""
+    if isinstance(clave, str):
+        return b's' + clave.encode('utf-8')
+    if isinstance(clave, Number):
+        try:
+            if clave == int(clave):
+                return b'i%d' % int(clave)
+        except (TypeError, ValueError, OverflowError):
+            pass
+        return b'n' + repr(clave).encode()
+    return b'r' + repr(clave).encode()
+
+class _Capa:
+    """Filtro de Bloom de tamaño fijo."""
+
+    def __init__(self, capacidad: int, tasa_error: float):
+        self.capacidad = max(1, capacidad)
+        self.tasa_error = tasa_error
+        bits = -self.capacidad * math.log(tasa_error) / (math.log(2) ** 2)
+        self.m = max(8, int(math.ceil(bits)))
+        self.k = max(1, round(self.m / self.capacidad * math.log(2)))
+        self.bits = bytearray((self.m + 7) // 8)
+        self.n = 0
+
+    def posiciones(self, h1: int, h2: int):
+        m = self.m
+        return ((h1 + i * h2) % m for i in range(self.k))
+
+    def agregar(self, h1: int, h2: int) -> None:
+        bits = self.bits
+        for p in self.posiciones(h1, h2):
+            bits[p >> 3] |= 1 << (p & 7)
+        self.n += 1
+
+    def contiene(self, h1: int, h2: int) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self.posiciones(h1, h2))
+
+    def tasa_estimada(self) -> float:
+        return (1 - math.exp(-self.k * self.n / self.m)) ** self.k
+
+class FiltroBloom:
+    """
+    Filtro de Bloom escalable sobre una columna clave de los registros.
+
+    Responde "seguro que no está" en O(1), por lo que sirve para descartar
+    búsquedas de IDs o nombres inexistentes sin recorrer la lista. Puede dar
+    falsos positivos (entonces se hace la búsqueda lineal normal) pero nunca
+    falsos negativos. Cuando se llena una capa se añade otra el doble de grande
+    y con menor tasa de error, así la tasa total se mantiene acotada.
+
+    Los textos se normalizan por defecto como en las búsquedas (sin
+    mayúsculas ni tildes), así 'iphone 15' no se descarta si está
+    'iPhone 15'; con normalizar=None se guardan tal cual.
+
+    buscar_producto_por_id, buscar_producto_por_nombre y
+    buscar_empleado_por_id aceptan un filtro sobre su columna en el
+    argumento `filtro`: si la clave seguro que no está devuelven None sin
+    recorrer la lista.
+
+    No admite borrados: si se eliminan o modifican registros, hay que crear
+    un filtro nuevo.
+    """
+
+    def __init__(self, campo: Optional[str] = None, capacidad: int = 1024, tasa_error: float = 0.01,
+                 normalizar: Optional[Callable[[Any], Any]] = clave_busqueda):
+        self.campo = campo
+        self.normalizar = normalizar
+        self.tasa_error = tasa_error
+        # Reparto geométrico del error entre capas: la suma queda por debajo de tasa_error
+        self._capas: List[_Capa] = [_Capa(capacidad, tasa_error / 2)]
+        self._vistos = 0
+
+    def _hashes(self, clave):
+        if self.normalizar is not None:
+            clave = self.normalizar(clave)
+        digest = blake2b(_bytes_clave(clave), digest_size=16).digest()
+        return int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+
+    def agregar(self, clave) -> None:
+        """Agrega una clave al filtro."""
+        capa = self._capas[-1]
+        if capa.n >= capa.capacidad:
+            capa = _Capa(capa.capacidad * 2, capa.tasa_error / 2)
+            self._capas.append(capa)
+        capa.agregar(*self._hashes(clave))
+
+    def agregar_registro(self, registro: dict) -> None:
+        """Agrega la clave (columna `campo`) de un registro."""
+        self.agregar(registro.get(self.campo))
+
+    def sincronizar(self, registros: Sequence[dict]) -> None:
+        """
+        Agrega los registros añadidos al final de la lista desde la última
+        sincronización, de modo que el coste es proporcional solo a los nuevos.
+        """
+        for registro in registros[self._vistos:]:
+            self.agregar_registro(registro)
+        self._vistos = max(self._vistos, len(registros))
+
+    def descarta(self, registros: Sequence[dict], clave) -> bool:
+        """Sincroniza con los registros y devuelve True si la clave seguro que no está."""
+        self.sincronizar(registros)
+        return clave not in self
+
+    def __contains__(self, clave) -> bool:
+        h1, h2 = self._hashes(clave)
+        return any(capa.contiene(h1, h2) for capa in self._capas)
+
+    def __len__(self) -> int:
+        return sum(capa.n for capa in self._capas)
+
+    def tasa_falsos_positivos(self) -> float:
+        """Probabilidad estimada de que una clave ausente dé positivo con el llenado actual."""
+        prob_negativo = 1.0
+        for capa in self._capas:
+            prob_negativo *= 1 - capa.tasa_estimada()
+        return 1 - prob_negativo
+
+    def memoria_bytes(self) -> int:
+        """Bytes ocupados por los arreglos de bits."""
+        return sum(len(capa.bits) for capa in self._capas)
+
+if __name__ == "__main__":
+    import random
+
+    print("=== PRUEBAS DEL FILTRO DE BLOOM ===\n")
+    filtro = FiltroBloom('id', capacidad=1000)
+    ids = [{'id': i} for i in range(0, 20000, 2)]
+    filtro.sincronizar(ids)
+    print(f"1. Claves agregadas: {len(filtro)} en {len(filtro._capas)} capa(s)")
+    print(f"   ¿Está el ID 10? {10 in filtro}")      # True
+    print(f"   ¿Está el ID 10.0? {10.0 in filtro}")  # True (igual que 10)
+
+    ausentes = [random.randrange(1, 20000, 2) for _ in range(10000)]
+    falsos = sum(1 for x in ausentes if x in filtro)
+    print(f"\n2. Falsos positivos medidos: {falsos / len(ausentes):.4f}")
+    print(f"   Tasa estimada: {filtro.tasa_falsos_positivos():.4f}")
+    print(f"   Memoria: {filtro.memoria_bytes():,} bytes")
+
+    filtro_nombres = FiltroBloom('nombre')
+    filtro_nombres.sincronizar([{'nombre': 'MacBook Air M3'}, {'nombre': 'iPhone 15'}])
+    print(f"\n3. ¿Está ' macbook air m3 '? {' macbook air m3 ' in filtro_nombres}")  # True
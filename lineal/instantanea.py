@@ -0,0 +1,164 @@
+import json
+import mmap
+import struct
+import sys
+import zlib
+from typing import Any, Dict, List, Tuple
+
+from almacen_productos import AlmacenProductos, ColumnaDiccionario, _tipo
+
+# Extensión habitual de las instantáneas
+EXTENSION = '.lineal'
+FORMATO = 1
+_MAGIA = b'LINEALSN'
+# Cabecera: magia, formato, reservado, número de secciones, CRC del directorio
+_CABECERA = struct.Struct('<8sHHII')
+# Entrada del directorio: nombre, tipo de elemento, CRC, desplazamiento, bytes
+_ENTRADA = struct.Struct('<24s2sxxIQQ')
+# Cada sección empieza en un múltiplo de 64 bytes (una línea de caché)
+_ALINEACION = 64
+
+_TEXTOS = {'nombre': 'nombres', 'marca': 'marcas', 'categoria': 'categorias'}
+
+def _alinear(desplazamiento: int) -> int:
+    return -(-desplazamiento // _ALINEACION) * _ALINEACION
+
+def _secciones(almacen: AlmacenProductos) -> List[Tuple[str, Any]]:
+    """Secciones (nombre, columna) de un almacén: columnas, diccionarios e índices ordenados."""
+    secciones = [('id', almacen.ids), ('precio', almacen.precios), ('stock', almacen.stocks),
+                 ('disponible', almacen.disponibles)]
+    nulos = {}
+    for campo, atributo in _TEXTOS.items():
+        columna: ColumnaDiccionario = getattr(almacen, atributo)
+        secciones += [(f'{campo}.codigos', columna.codigos), (f'{campo}.bloque', columna.bloque),
+                      (f'{campo}.inicios', columna.inicios)]
+        nulos[campo] = columna.codigo_exacto(None)
+    for campo in ('id', 'precio'):
+        valores, posiciones = almacen.orden(campo)
+        secciones += [(f'orden.{campo}.valores', valores), (f'orden.{campo}.posiciones', posiciones)]
+    meta = json.dumps({'filas': len(almacen), 'nulos': nulos}).encode('utf-8')
+    return [('meta', meta)] + secciones
+
+def guardar_instantanea(productos, ruta: str) -> int:
+    """
+    Guarda los productos (un AlmacenProductos o cualquier colección de
+    diccionarios) en una instantánea binaria y devuelve los bytes escritos.
+
+    El archivo tiene una cabecera con versión, un directorio de secciones y
+    cada columna e índice ordenado en su propia sección, alineada a 64 bytes
+    y con su CRC32, en el formato nativo de los arrays (little-endian).
+    """
+    if sys.byteorder != 'little':
+        raise ValueError("Las instantáneas solo se escriben en máquinas little-endian")
+    almacen = productos if isinstance(productos, AlmacenProductos) else AlmacenProductos(productos)
+    secciones = _secciones(almacen)
+    directorio = []
+    desplazamiento = _alinear(_CABECERA.size + _ENTRADA.size * len(secciones))
+    for nombre, datos in secciones:
+        vista = memoryview(datos).cast('B')
+        tipo = 'B' if isinstance(datos, (bytes, bytearray)) else _tipo(datos)
+        directorio.append(_ENTRADA.pack(nombre.encode('ascii'), tipo.encode('ascii'),
+                                        zlib.crc32(vista), desplazamiento, len(vista)))
+        desplazamiento = _alinear(desplazamiento + len(vista))
+    directorio_bytes = b''.join(directorio)
+    with open(ruta, 'wb') as archivo:
+        archivo.write(_CABECERA.pack(_MAGIA, FORMATO, 0, len(secciones), zlib.crc32(directorio_bytes)))
+        archivo.write(directorio_bytes)
+        for (nombre, datos), entrada in zip(secciones, directorio):
+            inicio = _ENTRADA.unpack(entrada)[3]
+            archivo.write(b'\0' * (inicio - archivo.tell()))
+            archivo.write(memoryview(datos).cast('B'))
+        return archivo.tell()
+
+def leer_directorio(mapa) -> Dict[str, Tuple[str, int, int, int]]:
+    """Directorio de una instantánea: {sección: (tipo, crc, desplazamiento, bytes)}."""
+    if len(mapa) < _CABECERA.size:
+        raise ValueError("El archivo es demasiado corto para ser una instantánea")
+    magia, formato, _, cantidad, crc = _CABECERA.unpack_from(mapa, 0)
+    if magia != _MAGIA:
+        raise ValueError("El archivo no es una instantánea de productos")
+    if formato != FORMATO:
+        raise ValueError(f"Formato de instantánea {formato} no soportado (se espera {FORMATO})")
+    directorio_bytes = mapa[_CABECERA.size:_CABECERA.size + _ENTRADA.size * cantidad]
+    if zlib.crc32(directorio_bytes) != crc:
+        raise ValueError("El directorio de la instantánea está dañado")
+    directorio = {}
+    for nombre, tipo, crc_seccion, inicio, tamano in _ENTRADA.iter_unpack(directorio_bytes):
+        if inicio + tamano > len(mapa):
+            raise ValueError("La instantánea está truncada")
+        directorio[nombre.rstrip(b'\0').decode('ascii')] = (tipo.rstrip(b'\0').decode('ascii'), crc_seccion,
+                                                          inicio, tamano)
+    return directorio
+
+def abrir_instantanea(ruta: str, verificar: bool = True) -> AlmacenProductos:
+    """
+    Abre una instantánea como AlmacenProductos sin copiar ni reconstruir
+    nada: cada columna es una vista sobre el archivo mapeado en memoria,
+    así que arrancar cuesta lo mismo con mil productos que con millones y
+    las páginas se leen del disco a medida que se usan.
+
+    El mapeo es copia en escritura: cambiar el stock (por ejemplo con un
+    Inventario) no modifica el archivo. Con verificar=True se comprueba el
+    CRC de cada sección, lo que obliga a leerlas enteras una vez.
+    """
+    if sys.byteorder != 'little':
+        raise ValueError("Las instantáneas solo se leen en máquinas little-endian")
+    with open(ruta, 'rb') as archivo:
+        mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_COPY)
+    directorio = leer_directorio(mapa)
+    vista = memoryview(mapa)
+
+    def seccion(nombre: str):
+        try:
+            tipo, crc, inicio, tamano = directorio[nombre]
+        except KeyError:
+            raise ValueError(f"Falta la sección '{nombre}' en la instantánea") from None
+        datos = vista[inicio:inicio + tamano]
+        if verificar and zlib.crc32(datos) != crc:
+            raise ValueError(f"La sección '{nombre}' de la instantánea está dañada")
+        return datos.cast(tipo)
+
+    meta = json.loads(bytes(seccion('meta')))
+    textos = {campo: ColumnaDiccionario.desde_partes(seccion(f'{campo}.codigos'), seccion(f'{campo}.bloque'),
+                                                     seccion(f'{campo}.inicios'), meta['nulos'][campo])
+              for campo in _TEXTOS}
+    ordenes = {campo: (seccion(f'orden.{campo}.valores'), seccion(f'orden.{campo}.posiciones'))
+               for campo in ('id', 'precio')}
+    almacen = AlmacenProductos.desde_columnas(seccion('id'), seccion('precio'), seccion('stock'),
+                                              seccion('disponible'), textos['nombre'], textos['marca'],
+                                              textos['categoria'], ordenes)
+    if len(almacen) != meta['filas']:
+        raise ValueError("La instantánea no es coherente: las columnas no tienen las filas indicadas")
+    return almacen
+
+if __name__ == "__main__":
+    import os
+    import tempfile
+    import time
+
+    from benchmark import generar_productos
+
+    print("=== PRUEBAS DE INSTANTÁNEAS ===\n")
+    n = 1_000_000
+    ruta = os.path.join(tempfile.mkdtemp(), 'productos' + EXTENSION)
+    inicio = time.perf_counter()
+    almacen = AlmacenProductos(generar_productos(n))
+    print(f"1. Construir el almacén con {n:,} productos: {time.perf_counter() - inicio:.2f}s")
+    inicio = time.perf_counter()
+    tamano = guardar_instantanea(almacen, ruta)
+    print(f"   Guardar la instantánea ({tamano / 1e6:.1f} MB): {time.perf_counter() - inicio:.2f}s")
+
+    print("\n2. Arranque desde la instantánea:")
+    for verificar in (False, True):
+        inicio = time.perf_counter()
+        abierto = abrir_instantanea(ruta, verificar=verificar)
+        print(f"   Abrir {'comprobando' if verificar else 'sin comprobar'} los CRC: "
+              f"{(time.perf_counter() - inicio) * 1000:.1f} ms")
+    inicio = time.perf_counter()
+    producto = abierto.buscar_producto_por_id(n // 2)
+    print(f"   Producto {n // 2}: {producto['nombre']} "
+          f"({(time.perf_counter() - inicio) * 1000:.2f} ms, con el índice de la instantánea)")
+    inicio = time.perf_counter()
+    caros = abierto.buscar_productos_por_rango_precio(1990, 2000)
+    print(f"   Productos entre $1990 y $2000: {len(caros)} ({(time.perf_counter() - inicio) * 1000:.1f} ms)")
+    print(f"   Apple disponibles: {len(abierto.buscar_productos_con_filtros(marca='apple', disponible=True))}")
@@ -0,0 +1,260 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from vigilancia_stock import VigilanciaStock
+
+# Número de cerrojos entre los que se reparten los productos
+FRANJAS = 64
+
+class Inventario:
+    """
+    Operaciones atómicas de stock para varios hilos a la vez.
+
+    Cada producto se asigna a una de `franjas` cerraduras según su id, de
+    modo que dos pedidos de productos distintos casi nunca se esperan entre
+    sí y dos pedidos del mismo producto no pueden pisarse la lectura y la
+    escritura del stock (no se pierden actualizaciones).
+
+    Acepta la lista de productos (modifica los diccionarios en su sitio), un
+    CatalogoProductos (los cambios pasan por actualizar(), que mantiene sus
+    índices) o un AlmacenProductos (escribe en su columna de stock y aumenta
+    su versión). Todo cambio de stock de esos productos debe pasar por el
+    inventario.
+
+    Cuando el stock llega a 0 el producto pasa a no disponible; si vuelve a
+    tener stock recupera la disponibilidad, salvo que ya estuviera marcado
+    como no disponible antes de agotarse.
+    """
+
+    def __init__(self, productos, franjas: int = FRANJAS):
+        if franjas < 1:
+            raise ValueError("Hace falta al menos una franja")
+        self.productos = productos
+        self._cerrojos = [threading.Lock() for _ in range(franjas)]
+        self._cerrojo_version = threading.Lock()
+        # Vigilancias de stock de un almacén o una lista (ver vigilar_stock)
+        self._vigilancias: List[VigilanciaStock] = []
+        # ids que el inventario marcó como no disponibles al agotarse
+        self._agotados = set()
+        if hasattr(productos, 'actualizar') and hasattr(productos, 'obtener'):
+            self._tipo = 'catalogo'
+        elif hasattr(productos, 'stocks') and hasattr(productos, 'ids'):
+            self._tipo = 'almacen'
+            self._posiciones = {}
+            for pos, id_producto in enumerate(productos.ids):
+                self._posiciones.setdefault(id_producto, pos)
+        else:
+            self._tipo = 'lista'
+            self._registros = {}
+            for producto in productos:
+                self._registros.setdefault(producto.get('id'), producto)
+
+    def _cerrojo(self, id_producto) -> threading.Lock:
+        return self._cerrojos[hash(id_producto) % len(self._cerrojos)]
+
+    # ---------- lectura y escritura según la colección ----------
+
+    def _leer(self, id_producto) -> int:
+        if self._tipo == 'catalogo':
+            registro = self.productos.obtener(id_producto)
+            if registro is None:
+                raise KeyError(id_producto)
+            return registro.get('stock', 0)
+        if self._tipo == 'almacen':
+            return self.productos.stocks[self._posiciones[id_producto]]
+        return self._registros[id_producto].get('stock', 0)
+
+    def _disponible(self, id_producto, nuevo: int) -> Optional[bool]:
+        """Nuevo valor de disponible para ese stock, o None si no cambia."""
+        if nuevo == 0:
+            if self._leer_disponible(id_producto):
+                self._agotados.add(id_producto)
+                return False
+        elif id_producto in self._agotados:
+            self._agotados.discard(id_producto)
+            return True
+        return None
+
+    def _leer_disponible(self, id_producto) -> bool:
+        if self._tipo == 'catalogo':
+            return bool(self.productos.obtener(id_producto).get('disponible'))
+        if self._tipo == 'almacen':
+            return bool(self.productos.disponibles[self._posiciones[id_producto]])
+        return bool(self._registros[id_producto].get('disponible'))
+
+    def _escribir(self, id_producto, nuevo: int) -> None:
+        disponible = self._disponible(id_producto, nuevo)
+        if self._tipo == 'catalogo':
+            cambios = {'stock': nuevo} if disponible is None else {'stock': nuevo, 'disponible': disponible}
+            self.productos.actualizar(id_producto, **cambios)
+        elif self._tipo == 'almacen':
+            pos = self._posiciones[id_producto]
+            self.productos.stocks[pos] = nuevo
+            if disponible is not None:
+                self.productos.disponibles[pos] = 1 if disponible else 0
+            # Con franjas distintas dos hilos llegan aquí a la vez: sin cerrojo
+            # se perdería un aumento y una caché podría dar un stock viejo
+            with self._cerrojo_version:
+                self.productos.version += 1
+        else:
+            registro = self._registros[id_producto]
+            registro['stock'] = nuevo
+            if disponible is not None:
+                registro['disponible'] = disponible
+        for vigilancia in self._vigilancias:
+            vigilancia.cambiar(id_producto, nuevo)
+
+    # ---------- operaciones ----------
+
+    def stock(self, id_producto) -> int:
+        return self._leer(id_producto)
+
+    def vigilar_stock(self, limite_stock: int = 5) -> VigilanciaStock:
+        """
+        Vigilancia de los productos con poco stock y agotados, avisada de cada
+        cambio de stock. Con un catálogo es la del propio catálogo; con un
+        almacén o una lista se crea con el stock actual (con todas las
+        franjas tomadas, para no perder un cambio) y se le pasan los cambios
+        que haga el inventario.
+        """
+        if self._tipo == 'catalogo':
+            return self.productos.vigilar_stock(limite_stock)
+        vigilancia = VigilanciaStock(limite_stock)
+        for cerrojo in self._cerrojos:
+            cerrojo.acquire()
+        try:
+            if self._tipo == 'almacen':
+                stocks = self.productos.stocks
+                vigilancia.cargar((id_producto, stocks[pos]) for id_producto, pos in self._posiciones.items())
+            else:
+                vigilancia.cargar((id_producto, registro.get('stock', 0))
+                                  for id_producto, registro in self._registros.items())
+            self._vigilancias.append(vigilancia)
+        finally:
+            for cerrojo in reversed(self._cerrojos):
+                cerrojo.release()
+        return vigilancia
+
+    def reservar(self, id_producto, cantidad: int = 1) -> bool:
+        """
+        Descuenta `cantidad` unidades si hay suficientes. Devuelve False sin
+        tocar nada si no las hay; KeyError si el producto no existe.
+        """
+        if cantidad <= 0:
+            raise ValueError("La cantidad a reservar debe ser positiva")
+        with self._cerrojo(id_producto):
+            actual = self._leer(id_producto)
+            if actual < cantidad:
+                return False
+            self._escribir(id_producto, actual - cantidad)
+            return True
+
+    def liberar(self, id_producto, cantidad: int = 1) -> int:
+        """Devuelve al stock unidades reservadas (pedido cancelado) y devuelve el stock nuevo."""
+        if cantidad <= 0:
+            raise ValueError("La cantidad a liberar debe ser positiva")
+        return self.ajustar_stock(id_producto, cantidad)
+
+    def ajustar_stock(self, id_producto, diferencia: int) -> int:
+        """Suma `diferencia` (positiva o negativa) al stock y devuelve el stock nuevo."""
+        with self._cerrojo(id_producto):
+            nuevo = self._leer(id_producto) + diferencia
+            if nuevo < 0:
+                raise ValueError(f"Stock insuficiente para el producto {id_producto!r}")
+            self._escribir(id_producto, nuevo)
+            return nuevo
+
+    def reservar_pedido(self, pedido: Dict[Any, int]) -> bool:
+        """
+        Reserva todas las líneas del pedido {id: cantidad} o ninguna. Las
+        franjas implicadas se toman siempre en el mismo orden para que dos
+        pedidos cruzados no se bloqueen mutuamente.
+        """
+        if any(cantidad <= 0 for cantidad in pedido.values()):
+            raise ValueError("Las cantidades a reservar deben ser positivas")
+        franjas = sorted({hash(id_producto) % len(self._cerrojos) for id_producto in pedido})
+        for franja in franjas:
+            self._cerrojos[franja].acquire()
+        try:
+            actuales = {id_producto: self._leer(id_producto) for id_producto in pedido}
+            if any(actuales[id_producto] < cantidad for id_producto, cantidad in pedido.items()):
+                return False
+            for id_producto, cantidad in pedido.items():
+                self._escribir(id_producto, actuales[id_producto] - cantidad)
+            return True
+        finally:
+            for franja in reversed(franjas):
+                self._cerrojos[franja].release()
+
+# ===============================
+# PRUEBA DE CONTENCIÓN
+# ===============================
+
+def medir_contencion(inventario: Inventario, ids: List[Any], hilos: int = 16,
+                     pedidos_por_hilo: int = 2000, semilla: int = 42) -> Dict[str, Any]:
+    """
+    Lanza `hilos` hilos que reservan una unidad de productos al azar de `ids`
+    y comprueba que el stock final es el inicial menos las reservas hechas.
+    Devuelve reservas, rechazos, segundos, pedidos por segundo y si cuadra.
+    """
+    import random
+
+    iniciales = {id_producto: inventario.stock(id_producto) for id_producto in ids}
+    reservas = [0] * hilos
+    rechazos = [0] * hilos
+    salida = threading.Barrier(hilos + 1)
+
+    def trabajar(n: int) -> None:
+        rnd = random.Random(semilla + n)
+        elegidos = [rnd.choice(ids) for _ in range(pedidos_por_hilo)]
+        salida.wait()
+        for id_producto in elegidos:
+            if inventario.reservar(id_producto):
+                reservas[n] += 1
+            else:
+                rechazos[n] += 1
+
+    trabajadores = [threading.Thread(target=trabajar, args=(n,)) for n in range(hilos)]
+    for t in trabajadores:
+        t.start()
+    salida.wait()
+    inicio = time.perf_counter()
+    for t in trabajadores:
+        t.join()
+    segundos = time.perf_counter() - inicio
+    descontado = sum(iniciales[i] - inventario.stock(i) for i in ids)
+    return {'reservas': sum(reservas), 'rechazos': sum(rechazos), 'segundos': segundos,
+            'pedidos_por_segundo': hilos * pedidos_por_hilo / segundos if segundos else 0.0,
+            'cuadra': descontado == sum(reservas)}
+
+if __name__ == "__main__":
+    import sys
+
+    from benchmark import generar_productos
+    from catalogo import CatalogoProductos
+
+    print("=== PRUEBAS DE INVENTARIO CONCURRENTE ===\n")
+    productos = [
+        {'id': 1, 'nombre': 'iPhone 15', 'marca': 'Apple', 'precio': 999.99, 'stock': 2, 'disponible': True},
+        {'id': 2, 'nombre': 'Dell XPS 13', 'marca': 'Dell', 'precio': 1199.99, 'stock': 1, 'disponible': True},
+    ]
+    inventario = Inventario(productos)
+    print(f"1. Reservar 2 iPhone: {inventario.reservar(1, 2)} -> stock {productos[0]['stock']}, "
+          f"disponible {productos[0]['disponible']}")
+    print(f"   Reservar otro: {inventario.reservar(1)}")
+    print(f"   Liberar 1: stock {inventario.liberar(1)}, disponible {productos[0]['disponible']}")
+    print(f"   Pedido de 1 iPhone y 2 Dell (no hay): {inventario.reservar_pedido({1: 1, 2: 2})}, "
+          f"stock {productos[0]['stock']} y {productos[1]['stock']}")
+
+    # Cambios de hilo muy frecuentes para forzar intercalados
+    sys.setswitchinterval(1e-5)
+    print("\n2. Contención: 16 hilos x 2000 reservas sobre 50 productos")
+    surtido = [{**p, 'stock': 700, 'disponible': True} for p in generar_productos(50)]
+    for nombre, franjas in [("un cerrojo global", 1), (f"{FRANJAS} franjas", FRANJAS)]:
+        for tipo, coleccion in [("lista", [dict(p) for p in surtido]), ("catálogo", CatalogoProductos(surtido))]:
+            inventario = Inventario(coleccion, franjas)
+            ids = [p['id'] for p in coleccion]
+            r = medir_contencion(inventario, ids)
+            print(f"   {tipo:9} {nombre:18}: {r['pedidos_por_segundo']:>9,.0f} pedidos/s, "
+                  f"{r['reservas']} reservas, {r['rechazos']} rechazos, cuadra: {r['cuadra']}")
@@ -0,0 +1,203 @@
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Union
+
+from Búsqueda_Lineal import np
+
+# Cada contenedor cubre 2**16 posiciones consecutivas
+_BITS = 16
+_MASCARA = (1 << _BITS) - 1
+_BYTES_DENSO = (1 << _BITS) // 8
+# Hasta este número de elementos un contenedor es un arreglo ordenado (2 bytes
+# por elemento); por encima ocupa menos como mapa de bits de 8 KB
+_MAX_DISPERSO = 4096
+
+_BITS_DE_BYTE = [tuple(j for j in range(8) if b >> j & 1) for b in range(256)]
+
+Contenedor = Union[array, int]
+
+def _a_entero(valores: Iterable[int]) -> int:
+    bits = bytearray(_BYTES_DENSO)
+    for v in valores:
+        bits[v >> 3] |= 1 << (v & 7)
+    return int.from_bytes(bits, 'little')
+
+def _bits(entero: int) -> List[int]:
+    """Posiciones de los bits a 1 de un contenedor denso, en orden."""
+    datos = entero.to_bytes(_BYTES_DENSO, 'little')
+    if np is not None:
+        return np.flatnonzero(np.unpackbits(np.frombuffer(datos, dtype=np.uint8), bitorder='little')).tolist()
+    tabla = _BITS_DE_BYTE
+    return [i << 3 | j for i, byte in enumerate(datos) if byte for j in tabla[byte]]
+
+def _compactar(contenedor: Contenedor) -> Contenedor:
+    """Elige la representación más pequeña para el contenido."""
+    if isinstance(contenedor, int):
+        if contenedor.bit_count() <= _MAX_DISPERSO:
+            return array('H', _bits(contenedor))
+        return contenedor
+    if len(contenedor) > _MAX_DISPERSO:
+        return _a_entero(contenedor)
+    return contenedor
+
+def _tamano(contenedor: Contenedor) -> int:
+    return contenedor.bit_count() if isinstance(contenedor, int) else len(contenedor)
+
+def _y(a: Contenedor, b: Contenedor) -> Contenedor:
+    if isinstance(a, int) and isinstance(b, int):
+        return _compactar(a & b)
+    if isinstance(a, int):
+        a, b = b, a
+    if isinstance(b, int):
+        datos = b.to_bytes(_BYTES_DENSO, 'little')
+        return array('H', [v for v in a if datos[v >> 3] >> (v & 7) & 1])
+    return array('H', sorted(set(a).intersection(b)))
+
+def _o(a: Contenedor, b: Contenedor) -> Contenedor:
+    if isinstance(a, int) or isinstance(b, int):
+        a = a if isinstance(a, int) else _a_entero(a)
+        b = b if isinstance(b, int) else _a_entero(b)
+        return a | b
+    return _compactar(array('H', sorted(set(a).union(b))))
+
+def _menos(a: Contenedor, b: Contenedor) -> Contenedor:
+    if isinstance(a, int):
+        return _compactar(a & ~(b if isinstance(b, int) else _a_entero(b)))
+    if isinstance(b, int):
+        datos = b.to_bytes(_BYTES_DENSO, 'little')
+        return array('H', [v for v in a if not datos[v >> 3] >> (v & 7) & 1])
+    return array('H', sorted(set(a).difference(b)))
+
+class MapaBits:
+    """
+    Conjunto comprimido de enteros no negativos al estilo roaring. Las
+    posiciones se reparten en bloques de 65536; cada bloque es un arreglo
+    ordenado de 16 bits si tiene pocos elementos o un mapa de bits (un int
+    de Python) si tiene muchos. Así los conjuntos pequeños ocupan poco, los
+    grandes 1 bit por posición, y &, | y - trabajan bloque a bloque con
+    operaciones de enteros. len() suma popcounts sin recorrer posiciones.
+    """
+
+    __slots__ = ('_contenedores',)
+
+    def __init__(self, valores: Iterable[int] = ()):
+        self._contenedores: Dict[int, Contenedor] = {}
+        ordenados = sorted(valores)
+        i, n = 0, len(ordenados)
+        while i < n:
+            alto = ordenados[i] >> _BITS
+            j = bisect_left(ordenados, (alto + 1) << _BITS, i)
+            bajos = [v & _MASCARA for v in ordenados[i:j]]
+            self._contenedores[alto] = _compactar(array('H', dict.fromkeys(bajos)))
+            i = j
+
+    @classmethod
+    def _desde(cls, contenedores: Dict[int, Contenedor]) -> 'MapaBits':
+        mapa = cls.__new__(cls)
+        mapa._contenedores = {k: c for k, c in contenedores.items() if _tamano(c)}
+        return mapa
+
+    def agregar(self, valor: int) -> None:
+        alto, bajo = valor >> _BITS, valor & _MASCARA
+        contenedor = self._contenedores.get(alto)
+        if contenedor is None:
+            self._contenedores[alto] = array('H', [bajo])
+        elif isinstance(contenedor, int):
+            self._contenedores[alto] = contenedor | (1 << bajo)
+        else:
+            i = bisect_left(contenedor, bajo)
+            if i == len(contenedor) or contenedor[i] != bajo:
+                contenedor.insert(i, bajo)
+                if len(contenedor) > _MAX_DISPERSO:
+                    self._contenedores[alto] = _a_entero(contenedor)
+
+    def quitar(self, valor: int) -> None:
+        alto, bajo = valor >> _BITS, valor & _MASCARA
+        contenedor = self._contenedores.get(alto)
+        if contenedor is None:
+            return
+        if isinstance(contenedor, int):
+            contenedor = _compactar(contenedor & ~(1 << bajo))
+        else:
+            i = bisect_left(contenedor, bajo)
+            if i < len(contenedor) and contenedor[i] == bajo:
+                del contenedor[i]
+        if _tamano(contenedor):
+            self._contenedores[alto] = contenedor
+        else:
+            del self._contenedores[alto]
+
+    def __contains__(self, valor: int) -> bool:
+        contenedor = self._contenedores.get(valor >> _BITS)
+        if contenedor is None:
+            return False
+        bajo = valor & _MASCARA
+        if isinstance(contenedor, int):
+            return bool(contenedor >> bajo & 1)
+        i = bisect_left(contenedor, bajo)
+        return i < len(contenedor) and contenedor[i] == bajo
+
+    def __len__(self) -> int:
+        return sum(map(_tamano, self._contenedores.values()))
+
+    def __bool__(self) -> bool:
+        return bool(self._contenedores)
+
+    def __iter__(self) -> Iterator[int]:
+        for alto in sorted(self._contenedores):
+            contenedor = self._contenedores[alto]
+            base = alto << _BITS
+            bajos = _bits(contenedor) if isinstance(contenedor, int) else contenedor
+            for bajo in bajos:
+                yield base | bajo
+
+    def a_lista(self) -> List[int]:
+        """Posiciones en orden creciente."""
+        return list(self)
+
+    def __and__(self, otro: 'MapaBits') -> 'MapaBits':
+        a, b = self._contenedores, otro._contenedores
+        if len(a) > len(b):
+            a, b = b, a
+        return MapaBits._desde({k: _y(c, b[k]) for k, c in a.items() if k in b})
+
+    def __or__(self, otro: 'MapaBits') -> 'MapaBits':
+        contenedores = dict(self._contenedores)
+        for k, c in otro._contenedores.items():
+            propio = contenedores.get(k)
+            contenedores[k] = c if propio is None else _o(propio, c)
+        # Los arreglos se comparten con los operandos: se copian al devolverlos
+        return MapaBits._desde({k: c if isinstance(c, int) else array('H', c) for k, c in contenedores.items()})
+
+    def __sub__(self, otro: 'MapaBits') -> 'MapaBits':
+        b = otro._contenedores
+        return MapaBits._desde({k: _menos(c, b[k]) if k in b else array('H', c) if not isinstance(c, int) else c
+                                for k, c in self._contenedores.items()})
+
+    def __eq__(self, otro) -> bool:
+        if not isinstance(otro, MapaBits):
+            return NotImplemented
+        return self._contenedores == otro._contenedores
+
+    def memoria_bytes(self) -> int:
+        """Bytes ocupados por los contenedores."""
+        return sum(_BYTES_DENSO if isinstance(c, int) else len(c) * 2 for c in self._contenedores.values())
+
+    def __repr__(self) -> str:
+        return f"MapaBits({len(self)} posiciones, {len(self._contenedores)} bloques)"
+
+if __name__ == "__main__":
+    print("=== PRUEBAS DEL MAPA DE BITS ===\n")
+    pares = MapaBits(range(0, 1_000_000, 2))
+    tercios = MapaBits(range(0, 1_000_000, 3))
+    print(f"1. Pares: {len(pares)} posiciones en {pares.memoria_bytes():,} bytes")
+    print(f"   Múltiplos de 3: {len(tercios)} posiciones en {tercios.memoria_bytes():,} bytes")
+    print(f"   Pares y múltiplos de 3 (múltiplos de 6): {len(pares & tercios)}")
+    print(f"   Pares o múltiplos de 3: {len(pares | tercios)}")
+    print(f"   Pares que no son múltiplos de 3: {len(pares - tercios)}")
+
+    raros = MapaBits([5, 70000, 3_000_000])
+    print(f"\n2. Conjunto disperso: {list(raros)} en {raros.memoria_bytes()} bytes")
+    raros.agregar(6)
+    raros.quitar(70000)
+    print(f"   Tras agregar 6 y quitar 70000: {list(raros)}")
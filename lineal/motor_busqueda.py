@@ -0,0 +1,158 @@
+from bisect import bisect_left
+from itertools import islice
+from numbers import Real
+from operator import le
+from typing import Any, Dict, Optional, Sequence
+
+from Búsqueda_Lineal import busqueda_lineal_simple
+
+LINEAL = 'lineal'
+BINARIA = 'binaria'
+INTERPOLACION = 'interpolacion'
+INDICE = 'indice'
+
+class MotorBusqueda:
+    """
+    Envuelve una secuencia y elige por sí solo cómo buscar en ella:
+      - lineal si no está ordenada
+      - binaria (bisect) si está ordenada
+      - por interpolación si además sus valores numéricos son casi uniformes
+    Tras `umbral_indice` consultas construye un índice valor -> primera
+    posición y a partir de ahí responde en O(1).
+
+    Todas las estrategias devuelven lo mismo que busqueda_lineal_simple:
+    el índice de la primera ocurrencia o -1. La secuencia se supone estática;
+    si cambia hay que llamar a invalidar().
+    """
+
+    def __init__(self, datos: Sequence, umbral_indice: int = 32,
+                 tolerancia_uniforme: float = 0.05, muestras_uniforme: int = 64):
+        self.datos = datos
+        self.umbral_indice = umbral_indice
+        self.tolerancia_uniforme = tolerancia_uniforme
+        self.muestras_uniforme = muestras_uniforme
+        self.invalidar()
+
+    def invalidar(self) -> None:
+        """Vuelve a analizar la secuencia y descarta el índice construido."""
+        self.consultas = 0
+        self._indice: Optional[Dict[Any, int]] = None
+        self.ordenada = _esta_ordenada(self.datos)
+        self.uniforme = self.ordenada and _es_uniforme(
+            self.datos, self.tolerancia_uniforme, self.muestras_uniforme)
+        if self.uniforme:
+            self.estrategia = INTERPOLACION
+        elif self.ordenada:
+            self.estrategia = BINARIA
+        else:
+            self.estrategia = LINEAL
+
+    def buscar(self, elemento) -> int:
+        """Devuelve el índice de la primera ocurrencia de elemento o -1."""
+        self.consultas += 1
+        if self._indice is None and self.consultas > self.umbral_indice:
+            self._construir_indice()
+        try:
+            if self._indice is not None:
+                return self._indice.get(elemento, -1)
+            if self.estrategia == INTERPOLACION and isinstance(elemento, Real):
+                return self._buscar_interpolacion(elemento)
+            if self.estrategia in (BINARIA, INTERPOLACION):
+                return self._buscar_binaria(elemento)
+        except TypeError:
+            # Elemento no hashable o no comparable con los datos: se recorre
+            pass
+        return busqueda_lineal_simple(self.datos, elemento)
+
+    def _construir_indice(self) -> None:
+        indice: Dict[Any, int] = {}
+        try:
+            for i, valor in enumerate(self.datos):
+                # NaN nunca coincide en busqueda_lineal_simple: no se indexa
+                if valor == valor and valor not in indice:
+                    indice[valor] = i
+        except TypeError:
+            # Valores no hashables: se sigue con la estrategia elegida
+            self.umbral_indice = float('inf')
+            return
+        self._indice = indice
+        self.estrategia = INDICE
+
+    def _buscar_binaria(self, elemento, lo: int = 0, hi: Optional[int] = None) -> int:
+        datos = self.datos
+        if hi is None:
+            hi = len(datos)
+        i = bisect_left(datos, elemento, lo, hi)
+        return i if i < len(datos) and datos[i] == elemento else -1
+
+    def _buscar_interpolacion(self, elemento) -> int:
+        datos = self.datos
+        lo, hi = 0, len(datos) - 1
+        if hi < 0 or not datos[lo] <= elemento <= datos[hi]:
+            return -1
+        # Invariante: todo lo anterior a lo es < elemento y datos[hi] >= elemento.
+        # Se limita el número de pasos por si los datos dejan de parecer uniformes.
+        pasos = 2 * max(hi, 1).bit_length()
+        while lo < hi and pasos:
+            if datos[lo] == elemento:
+                return lo
+            if datos[lo] > elemento:
+                return -1
+            pos = lo + int((elemento - datos[lo]) * (hi - lo) / (datos[hi] - datos[lo]))
+            pos = min(max(pos, lo), hi - 1)
+            if datos[pos] < elemento:
+                lo = pos + 1
+            else:
+                hi = pos
+            pasos -= 1
+        return self._buscar_binaria(elemento, lo, hi + 1)
+
+def _esta_ordenada(datos: Sequence) -> bool:
+    try:
+        return all(map(le, datos, islice(datos, 1, None)))
+    except TypeError:
+        return False
+
+def _es_uniforme(datos: Sequence, tolerancia: float, muestras: int) -> bool:
+    """Compara una muestra de posiciones con la recta entre el primer y el último valor."""
+    n = len(datos)
+    if n < 3:
+        return False
+    primero, ultimo = datos[0], datos[n - 1]
+    if not (isinstance(primero, Real) and isinstance(ultimo, Real)) or primero == ultimo:
+        return False
+    rango = ultimo - primero
+    paso = max(1, (n - 1) // muestras)
+    for i in range(0, n, paso):
+        valor = datos[i]
+        if not isinstance(valor, Real) or valor != valor:
+            return False
+        esperado = primero + rango * i / (n - 1)
+        if abs(valor - esperado) > tolerancia * rango:
+            return False
+    return True
+
+if __name__ == "__main__":
+    print("=== PRUEBAS DEL MOTOR DE BÚSQUEDA ADAPTATIVO ===\n")
+
+    desordenada = [64, 34, 25, 12, 22, 11, 90]
+    motor = MotorBusqueda(desordenada)
+    print(f"1. Lista desordenada -> estrategia '{motor.estrategia}'")
+    print(f"   Buscando 25: {motor.buscar(25)}")  # 2
+    print(f"   Buscando 99: {motor.buscar(99)}")  # -1
+
+    ordenada = [1, 3, 3, 7, 20, 45, 46, 100]
+    motor = MotorBusqueda(ordenada)
+    print(f"\n2. Lista ordenada no uniforme -> estrategia '{motor.estrategia}'")
+    print(f"   Buscando 3: {motor.buscar(3)}")  # 1 (primera ocurrencia)
+    print(f"   Buscando 8: {motor.buscar(8)}")  # -1
+
+    uniforme = list(range(0, 100000, 5))
+    motor = MotorBusqueda(uniforme, umbral_indice=3)
+    print(f"\n3. Lista ordenada uniforme -> estrategia '{motor.estrategia}'")
+    print(f"   Buscando 4995: {motor.buscar(4995)}")  # 999
+    print(f"   Buscando 4996: {motor.buscar(4996)}")  # -1
+    motor.buscar(10)
+    motor.buscar(15)
+    print(f"   Tras {motor.consultas} consultas -> estrategia '{motor.estrategia}'")
+    print(f"   Buscando 99995: {motor.buscar(99995)}")  # 19999
@@ -0,0 +1,84 @@
+import sys
+import unicodedata
+
+# Claves distintas que se recuerdan; un catálogo normal tiene muchas menos
+MAX_CLAVES = 1 << 16
+
+_claves = {}
+
+def _descomponer(texto: str) -> str:
+    plegado = unicodedata.normalize('NFD', texto.casefold())
+    # Se quitan tildes y diéresis, pero la ñ es otra letra y se conserva
+    plegado = plegado.replace('n\u0303', '\u00f1')
+    sin_acentos = ''.join(c for c in plegado if not unicodedata.combining(c))
+    return unicodedata.normalize('NFC', sin_acentos)
+
+def _tabla_latin1() -> bytes:
+    """
+    Clave de cada carácter Latin-1 (donde están todas las letras del
+    español) como tabla de bytes; 0 para los que no dan un solo carácter
+    Latin-1 (ß, µ) y deben descomponerse.
+    """
+    tabla = bytearray(256)
+    for codigo in range(1, 256):
+        plegado = _descomponer(chr(codigo))
+        if len(plegado) == 1 and ord(plegado) < 256:
+            tabla[codigo] = ord(plegado)
+    return bytes(tabla)
+
+_LATIN1 = _tabla_latin1()
+
+def _plegar(texto: str) -> str:
+    texto = texto.strip()
+    if texto.isascii():
+        # Sin tildes que quitar; en ASCII casefold y lower coinciden
+        return texto.lower()
+    try:
+        # Con tildes pero en Latin-1: una pasada en C por la tabla, mucho
+        # más rápido que la descomposición Unicode carácter a carácter
+        plegado = texto.encode('latin-1').translate(_LATIN1)
+    except UnicodeEncodeError:
+        return _descomponer(texto)
+    return plegado.decode('latin-1') if 0 not in plegado else _descomponer(texto)
+
+def _calcular(texto: str) -> str:
+    clave = sys.intern(_plegar(texto))
+    if len(_claves) >= MAX_CLAVES:
+        _claves.clear()
+    _claves[texto] = clave
+    return clave
+
+def clave_busqueda(valor):
+    """
+    Clave de comparación de un texto: sin espacios en los extremos, en
+    minúsculas (casefold) y sin tildes, de modo que 'Audífonos' y
+    ' audifonos ' dan la misma clave. Las claves se calculan una vez por texto
+    distinto y se internan, así textos iguales comparten un mismo objeto.
+    Los valores que no son texto se devuelven tal cual.
+    """
+    if valor.__class__ is str:
+        clave = _claves.get(valor)
+        return clave if clave is not None else _calcular(valor)
+    return _calcular(valor) if isinstance(valor, str) else valor
+
+def clave_texto(valor) -> str:
+    """Como clave_busqueda, pero los valores que no son texto dan ''."""
+    if valor.__class__ is str:
+        clave = _claves.get(valor)
+        return clave if clave is not None else _calcular(valor)
+    return _calcular(valor) if isinstance(valor, str) else ''
+
+def clave_sin_cache(valor) -> str:
+    """
+    Como clave_texto, pero sin guardar la clave: para recorrer muchos textos
+    que no se repiten (apellidos de millones de personas), que vaciarían la
+    caché de claves sin volver a usarla.
+    """
+    return _plegar(valor) if isinstance(valor, str) else ''
+
+if __name__ == "__main__":
+    print("=== PRUEBAS DE NORMALIZACIÓN ===\n")
+    for texto in ['Audífonos', ' AUDIFONOS ', 'Diseño', 'Pingüino', 'Straße']:
+        print(f"   {texto!r:14} -> {clave_busqueda(texto)!r}")
+    a, b = clave_busqueda('Técnico'), clave_busqueda(' tecnico')
+    print(f"\n   'Técnico' y ' tecnico' comparten objeto: {a is b}")
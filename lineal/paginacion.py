@@ -0,0 +1,190 @@
+from bisect import bisect_left
+from itertools import dropwhile, islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from catalogo import Catalogo
+from compilador_filtros import EMPLEADOS, IGUALDAD, compilar_filtros
+from normalizacion import clave_busqueda, clave_sin_cache, clave_texto
+
+Predicado = Callable[[Dict[str, Any]], bool]
+
+# ===============================
+# PREDICADOS DE CADA BÚSQUEDA
+# ===============================
+# Mismo criterio que la función de lista del mismo nombre, para un solo registro.
+
+def _por_categoria(categoria_buscada) -> Predicado:
+    categoria_norm = clave_busqueda(categoria_buscada)
+    return lambda p: clave_busqueda(p.get('categoria')) == categoria_norm
+
+def _por_marca(marca_buscada) -> Predicado:
+    marca_norm = clave_busqueda(marca_buscada)
+    return lambda p: clave_busqueda(p.get('marca')) == marca_norm
+
+def _por_departamento(departamento_buscado) -> Predicado:
+    dept = departamento_buscado.lower()
+    return lambda e: e['departamento'].lower() == dept
+
+def _por_nombre_o_apellido(texto_buscado) -> Predicado:
+    t = clave_texto(texto_buscado)
+    return lambda e: t in clave_sin_cache(e.get('nombre')) or t in clave_sin_cache(e.get('apellido'))
+
+PREDICADOS: Dict[str, Callable[..., Predicado]] = {
+    'buscar_productos_por_categoria': _por_categoria,
+    'buscar_productos_por_marca': _por_marca,
+    'buscar_productos_disponibles': lambda: lambda p: bool(p.get('disponible') and p.get('stock', 0) > 0),
+    'buscar_productos_sin_stock': lambda: lambda p: p.get('stock', 0) == 0,
+    'buscar_productos_por_rango_precio': lambda precio_min, precio_max: lambda p: precio_min <= p.get('precio', 0.0) <= precio_max,
+    'buscar_productos_por_stock_minimo': lambda stock_minimo: lambda p: p.get('stock', 0) >= stock_minimo,
+    'buscar_productos_bajo_stock': lambda limite_stock=5: lambda p: 0 < p.get('stock', 0) <= limite_stock,
+    'buscar_productos_con_filtros': lambda **filtros: compilar_filtros(filtros, IGUALDAD).predicado,
+    'buscar_productos_con_filtros_multiples': lambda **filtros: compilar_filtros(filtros).predicado,
+    'buscar_empleados_por_departamento': _por_departamento,
+    'buscar_empleados_activos': lambda: lambda e: bool(e.get('activo')),
+    'buscar_empleados_por_rango_salario': lambda salario_min, salario_max: lambda e: salario_min <= e.get('salario', 0) <= salario_max,
+    'buscar_empleados_por_nombre_o_apellido': _por_nombre_o_apellido,
+    'buscar_empleados_avanzado': lambda **criterios: compilar_filtros(criterios, EMPLEADOS).predicado,
+}
+
+# ===============================
+# RESULTADOS PEREZOSOS
+# ===============================
+
+class Pagina:
+    """Registros de una página y el cursor para pedir la siguiente (None si no hay más)."""
+
+    def __init__(self, registros: List[Dict[str, Any]], cursor: Optional[int]):
+        self.registros = registros
+        self.cursor = cursor
+
+    def __iter__(self):
+        return iter(self.registros)
+
+    def __len__(self) -> int:
+        return len(self.registros)
+
+class Resultados:
+    """
+    Resultado perezoso de una búsqueda: no recorre los registros hasta que se
+    piden y deja de recorrer en cuanto tiene los necesarios.
+
+    El cursor de una página es la posición siguiente al último registro
+    devuelto, así la página siguiente continúa desde ahí sin volver a
+    recorrer ni saltar las anteriores (paginación por clave en lugar de
+    por desplazamiento). Los registros pueden ser una lista, un Catalogo o
+    un AlmacenProductos.
+
+    Si se dan `posiciones` (ver buscar_perezoso), sobre un Catalogo las
+    coincidencias salen de sus índices (mapas de bits, índices ordenados)
+    en lugar de pasar el predicado a cada registro.
+    """
+
+    def __init__(self, registros, predicado: Predicado,
+                 posiciones: Optional[Callable[[], Optional[Iterable[int]]]] = None):
+        self.registros = registros
+        self.predicado = predicado
+        self.posiciones = posiciones
+
+    def _recorrer(self, desde: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        registros = self.registros
+        # AlmacenProductos también tiene filas(), pero recibe posiciones
+        if isinstance(registros, Catalogo):
+            return registros.filas(desde)
+        if hasattr(registros, '__getitem__'):
+            return ((i, registros[i]) for i in range(desde, len(registros)))
+        return enumerate(islice(registros, desde, None), desde)
+
+    def _indexadas(self) -> Optional[Iterable[int]]:
+        """Posiciones en orden de las coincidencias según los índices, o None si no los hay."""
+        return None if self.posiciones is None else self.posiciones()
+
+    def _coincidencias(self, desde: int = 0) -> Iterator[Tuple[int, Dict[str, Any]]]:
+        """Pares (posición, registro) de los que cumplen, a partir de la posición `desde`."""
+        posiciones = self._indexadas()
+        if posiciones is None:
+            predicado = self.predicado
+            return ((pos, r) for pos, r in self._recorrer(desde) if predicado(r))
+        if hasattr(posiciones, '__getitem__'):
+            posiciones = islice(posiciones, bisect_left(posiciones, desde), None)
+        elif desde:
+            posiciones = dropwhile(lambda pos: pos < desde, posiciones)
+        registro = self.registros.registro
+        return ((pos, registro(pos)) for pos in posiciones)
+
+    def iterar(self, limite: Optional[int] = None, desplazamiento: int = 0,
+               cursor: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+        """Generador de los registros que cumplen, saltando `desplazamiento` y hasta `limite`."""
+        coincidencias = (r for _, r in self._coincidencias(cursor or 0))
+        return islice(coincidencias, desplazamiento, None if limite is None else desplazamiento + limite)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return self.iterar()
+
+    def pagina(self, limite: int = 10, desplazamiento: int = 0, cursor: Optional[int] = None) -> Pagina:
+        if limite < 1:
+            raise ValueError(f"Una página necesita un límite de al menos 1: {limite!r}")
+        registros: List[Dict[str, Any]] = []
+        for pos, registro in islice(self._coincidencias(cursor or 0), desplazamiento, None):
+            registros.append(registro)
+            if len(registros) >= limite:
+                return Pagina(registros, pos + 1)
+        return Pagina(registros, None)
+
+    def contar(self) -> int:
+        """Cuántos registros cumplen, sin construir ninguna lista."""
+        posiciones = self._indexadas()
+        if posiciones is not None:
+            return len(posiciones)
+        predicado = self.predicado
+        return sum(1 for _, r in self._recorrer() if predicado(r))
+
+    def hay_alguno(self) -> bool:
+        posiciones = self._indexadas()
+        if posiciones is not None:
+            return bool(posiciones)
+        predicado = self.predicado
+        return any(predicado(r) for _, r in self._recorrer())
+
+def buscar_perezoso(nombre: str, registros, *args, **kwargs) -> Resultados:
+    """
+    Versión perezosa de la búsqueda `nombre` (p. ej. 'buscar_productos_por_marca'),
+    con los mismos argumentos que la función de lista.
+    """
+    try:
+        fabrica = PREDICADOS[nombre]
+    except KeyError:
+        raise ValueError(f"No hay versión perezosa de '{nombre}'") from None
+    posiciones = None
+    if hasattr(registros, 'posiciones_busqueda'):
+        posiciones = lambda: registros.posiciones_busqueda(nombre, *args, **kwargs)
+    return Resultados(registros, fabrica(*args, **kwargs), posiciones)
+
+if __name__ == "__main__":
+    from almacen_productos import AlmacenProductos
+    from benchmark import generar_empleados, generar_productos
+
+    print("=== PRUEBAS DE RESULTADOS PAGINADOS ===\n")
+    productos = generar_productos(200_000)
+    apple = buscar_perezoso('buscar_productos_por_marca', productos, 'apple')
+    print(f"1. Productos Apple: {apple.contar()}")
+
+    pagina = apple.pagina(limite=3)
+    print("\n2. Primera página:")
+    for producto in pagina:
+        print(f"   - {producto['nombre']} (${producto['precio']})")
+    pagina = apple.pagina(limite=3, cursor=pagina.cursor)
+    print("   Segunda página (desde el cursor):")
+    for producto in pagina:
+        print(f"   - {producto['nombre']} (${producto['precio']})")
+
+    baratos = buscar_perezoso('buscar_productos_con_filtros_multiples', productos, precio_max=50, disponible=True)
+    print(f"\n3. Primeros 2 disponibles por menos de $50: {[p['nombre'] for p in baratos.iterar(limite=2)]}")
+
+    almacen = AlmacenProductos(productos)
+    bajo_stock = buscar_perezoso('buscar_productos_bajo_stock', almacen, 2)
+    print(f"\n4. En un almacén por columnas, con stock 1 o 2: {bajo_stock.contar()}; "
+          f"primera página: {[p['nombre'] for p in bajo_stock.pagina(limite=2)]}")
+
+    empleados = generar_empleados(1000)
+    activos = buscar_perezoso('buscar_empleados_activos', empleados)
+    print(f"\n5. Empleados activos: {activos.contar()} de {len(empleados)}")
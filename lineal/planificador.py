@@ -0,0 +1,294 @@
+from bisect import bisect_right
+from collections import Counter
+from numbers import Real
+from typing import Any, Callable, Dict, List, Optional
+
+from normalizacion import clave_busqueda
+
+# Si el mejor índice devuelve más de esta fracción de filas, se recorre todo
+UMBRAL_RECORRIDO = 0.5
+# Se intersecta con otro índice solo si devuelve como mucho FACTOR_INTERSECCION
+# veces los candidatos actuales; si no, sale más barato comprobarlo fila a fila
+FACTOR_INTERSECCION = 4
+# Columnas con pocos valores distintos guardan la frecuencia de cada uno
+MAX_FRECUENTES = 64
+CUBETAS_HISTOGRAMA = 32
+
+_RANGOS = {'precio_min': ('precio', 0.0), 'precio_max': ('precio', 0.0),
+           'stock_min': ('stock', 0), 'stock_max': ('stock', 0)}
+
+# ===============================
+# ESTADÍSTICAS
+# ===============================
+
+class EstadisticasColumna:
+    """
+    Resumen de una columna: filas, valores distintos, mínimo y máximo,
+    frecuencias si hay pocos valores distintos e histograma de igual
+    profundidad si es numérica.
+    """
+
+    def __init__(self, campo: str, valores: List[Any], ordenados: Optional[List[Real]] = None):
+        self.campo = campo
+        self.filas = len(valores)
+        conteo = Counter(clave_busqueda(v) for v in valores)
+        self.distintos = len(conteo)
+        self.frecuencias = dict(conteo) if self.distintos <= MAX_FRECUENTES else None
+        if ordenados is None:
+            ordenados = sorted(v for v in valores if isinstance(v, Real) and v == v)
+        self.numericos = len(ordenados)
+        self.minimo = ordenados[0] if ordenados else None
+        self.maximo = ordenados[-1] if ordenados else None
+        self.histograma: List[Real] = []
+        if ordenados:
+            cubetas = min(CUBETAS_HISTOGRAMA, len(ordenados))
+            self.histograma = [ordenados[(len(ordenados) - 1) * i // cubetas] for i in range(cubetas + 1)]
+
+    def selectividad_igualdad(self, valor) -> float:
+        if not self.filas:
+            return 0.0
+        if self.frecuencias is not None:
+            return self.frecuencias.get(clave_busqueda(valor), 0) / self.filas
+        return 1.0 / self.distintos
+
+    def _fraccion_hasta(self, x) -> float:
+        """Fracción estimada de valores numéricos <= x, interpolando dentro de la cubeta."""
+        limites = self.histograma
+        if x < limites[0]:
+            return 0.0
+        if x >= limites[-1]:
+            return 1.0
+        j = bisect_right(limites, x) - 1
+        a, b = limites[j], limites[j + 1]
+        dentro = (x - a) / (b - a) if b > a else 1.0
+        return (j + dentro) / (len(limites) - 1)
+
+    def selectividad_rango(self, minimo=None, maximo=None) -> float:
+        if not self.filas or not self.histograma:
+            return 0.0
+        if (minimo is not None and maximo is not None and minimo > maximo) or \
+                (minimo is not None and minimo > self.maximo) or \
+                (maximo is not None and maximo < self.minimo):
+            return 0.0
+        alto = 1.0 if maximo is None else self._fraccion_hasta(maximo)
+        bajo = 0.0 if minimo is None else self._fraccion_hasta(minimo) - self.selectividad_igualdad(minimo)
+        return max(0.0, alto - max(0.0, bajo)) * self.numericos / self.filas
+
+# ===============================
+# CRITERIOS
+# ===============================
+
+class Criterio:
+    """
+    Un filtro de la consulta: su predicado fila a fila y, si algún índice
+    lo resuelve exactamente, cómo obtener sus posiciones.
+    """
+
+    def __init__(self, descripcion: str, predicado: Callable[[Dict[str, Any]], bool],
+                 acceso: Optional[Callable[[], List[int]]] = None, estimacion: float = 0.0,
+                 mapa: Optional[Callable[[], Any]] = None):
+        self.descripcion = descripcion
+        self.predicado = predicado
+        self.acceso = acceso
+        self.estimacion = estimacion
+        # Si el índice es un mapa de bits, cómo obtenerlo para combinarlo con &
+        self.mapa = mapa
+
+def _igualdad(clave: str, valor) -> Callable[[Dict[str, Any]], bool]:
+    if isinstance(valor, str):
+        valor_norm = clave_busqueda(valor)
+        def predicado(p):
+            if clave not in p:
+                return False
+            v_prod = p[clave]
+            return clave_busqueda(v_prod) == valor_norm if isinstance(v_prod, str) else not (v_prod != valor)
+    else:
+        def predicado(p):
+            return clave in p and not (p[clave] != valor)
+    return predicado
+
+def _predicado_multiple(clave: str, valor) -> Callable[[Dict[str, Any]], bool]:
+    """Predicado de buscar_productos_con_filtros_multiples para una clave."""
+    if clave in _RANGOS:
+        campo, defecto = _RANGOS[clave]
+        if clave.endswith('_min'):
+            return lambda p: not (p.get(campo, defecto) < valor)
+        return lambda p: not (p.get(campo, defecto) > valor)
+    if clave == 'disponible':
+        return lambda p: not (p.get('disponible') != valor)
+    return _igualdad(clave, valor)
+
+# ===============================
+# PLANIFICADOR
+# ===============================
+
+class Planificador:
+    """
+    Planificador por costes para las búsquedas con varios filtros de un
+    Catalogo. Con las estadísticas de cada columna estima cuántas filas deja
+    pasar cada filtro, toma como conductor el índice más selectivo, intersecta
+    los de otros índices que salgan baratos y comprueba el resto fila a fila,
+    empezando por el filtro más selectivo.
+
+    Las estadísticas se recalculan solas cuando el catálogo ha cambiado en
+    más de un 10% de sus filas desde la última vez.
+    """
+
+    def __init__(self, catalogo):
+        self.catalogo = catalogo
+        self._estadisticas: Dict[str, tuple] = {}
+
+    def analizar(self, campo: Optional[str] = None) -> None:
+        """Descarta las estadísticas (de un campo o de todos) para recalcularlas."""
+        if campo is None:
+            self._estadisticas.clear()
+        else:
+            self._estadisticas.pop(campo, None)
+
+    def estadisticas(self, campo: str, defecto=None) -> EstadisticasColumna:
+        catalogo = self.catalogo
+        guardadas = self._estadisticas.get(campo)
+        if guardadas is not None:
+            version, estadisticas = guardadas
+            if catalogo.version - version <= max(100, len(catalogo) // 10):
+                return estadisticas
+        indice = self._indice(campo)
+        ordenados = indice.valores if hasattr(indice, 'rango') else None
+        valores = [r.get(campo, defecto) for r in catalogo]
+        estadisticas = EstadisticasColumna(campo, valores, ordenados)
+        self._estadisticas[campo] = (catalogo.version, estadisticas)
+        return estadisticas
+
+    def _indice(self, campo: str):
+        if campo == self.catalogo.clave:
+            return self.catalogo.primario
+        return self.catalogo.indices.get(campo)
+
+    def _criterios(self, filtros: Dict[str, Any], rangos: bool) -> List[Criterio]:
+        n = len(self.catalogo)
+        criterios = []
+        if rangos:
+            # precio_min y precio_max (igual con stock) forman un solo rango
+            limites: Dict[str, list] = {}
+            for clave, valor in filtros.items():
+                if clave in _RANGOS:
+                    campo, defecto = _RANGOS[clave]
+                    par = limites.setdefault(campo, [None, None, defecto, []])
+                    par[0 if clave.endswith('_min') else 1] = valor
+                    par[3].append(_predicado_multiple(clave, valor))
+            for campo, (minimo, maximo, defecto, predicados) in limites.items():
+                criterios.append(self._criterio_rango(campo, defecto, minimo, maximo, predicados, n))
+
+        for clave, valor in filtros.items():
+            if rangos and clave in _RANGOS:
+                continue
+            predicado = _predicado_multiple(clave, valor) if rangos else _igualdad(clave, valor)
+            criterio = Criterio(f"{clave} = {valor!r}", predicado)
+            indice = self._indice(clave)
+            cuenta = indice.cuenta_igualdad(valor) if indice is not None else None
+            if cuenta is not None:
+                criterio.acceso = lambda indice=indice, valor=valor: indice.igualdad(valor)
+                criterio.estimacion = cuenta
+                if hasattr(indice, 'mapa'):
+                    criterio.mapa = lambda indice=indice, valor=valor: indice.mapa(valor)
+            else:
+                criterio.estimacion = n * self.estadisticas(clave).selectividad_igualdad(valor)
+            criterios.append(criterio)
+        return criterios
+
+    def _criterio_rango(self, campo, defecto, minimo, maximo, predicados, n) -> Criterio:
+        if maximo is None:
+            descripcion = f"{campo} >= {minimo!r}"
+        elif minimo is None:
+            descripcion = f"{campo} <= {maximo!r}"
+        else:
+            descripcion = f"{minimo!r} <= {campo} <= {maximo!r}"
+        predicado = predicados[0] if len(predicados) == 1 else (lambda p: all(f(p) for f in predicados))
+        criterio = Criterio(descripcion, predicado)
+        ordenable = all(v is None or (isinstance(v, Real) and v == v) for v in (minimo, maximo))
+        indice = self._indice(campo)
+        if ordenable:
+            estadisticas = self.estadisticas(campo, defecto)
+            criterio.estimacion = n * estadisticas.selectividad_rango(minimo, maximo)
+            if hasattr(indice, 'rango'):
+                # Los NaN no son menores ni mayores que nada: pasan cualquier rango
+                criterio.acceso = lambda: [*indice.rango(minimo, maximo), *indice.otros]
+                criterio.estimacion += len(indice.otros)
+        else:
+            criterio.estimacion = n
+        return criterio
+
+    def ejecutar(self, filtros: Dict[str, Any], rangos: bool = True, informe: Optional[dict] = None) -> List[Dict[str, Any]]:
+        """
+        Devuelve los registros que cumplen los filtros, en el orden del catálogo.
+        rangos=True sigue a buscar_productos_con_filtros_multiples (precio_min,
+        stock_max, ...); rangos=False a buscar_productos_con_filtros (solo igualdades).
+        Si se pasa `informe`, se rellena con el plan y sus cifras.
+        """
+        catalogo = self.catalogo
+        n = len(catalogo)
+        criterios = self._criterios(filtros, rangos)
+        indexados = sorted((c for c in criterios if c.acceso is not None), key=lambda c: c.estimacion)
+        residuales = [c for c in criterios if c.acceso is None]
+
+        pasos = []
+        entradas_indice = 0
+        con_mapa = [c for c in indexados if c.mapa is not None]
+        if len(con_mapa) > 1:
+            # Los filtros con mapa de bits se combinan en uno solo con AND
+            mapa = con_mapa[0].mapa()
+            for criterio in con_mapa[1:]:
+                mapa = mapa & criterio.mapa()
+            descripcion = " Y ".join(c.descripcion for c in con_mapa)
+            pasos.append(f"mapas de bits {descripcion} (quedan {len(mapa)})")
+            compuesto = Criterio(descripcion, lambda p, fs=[c.predicado for c in con_mapa]: all(f(p) for f in fs),
+                                 mapa.a_lista, len(mapa), lambda: mapa)
+            indexados = sorted([compuesto, *(c for c in indexados if c.mapa is None)], key=lambda c: c.estimacion)
+
+        # Un conductor con mapa de bits sale barato aunque devuelva muchas filas
+        if indexados and (indexados[0].mapa is not None or indexados[0].estimacion <= n * UMBRAL_RECORRIDO):
+            conductor = indexados[0]
+            posiciones = conductor.acceso()
+            entradas_indice += len(posiciones)
+            candidatos = set(posiciones)
+            pasos.append(f"índice {conductor.descripcion} (estimadas {conductor.estimacion:.0f}, leídas {len(posiciones)})")
+            for criterio in indexados[1:]:
+                if criterio.estimacion <= FACTOR_INTERSECCION * len(candidatos):
+                    posiciones = criterio.acceso()
+                    entradas_indice += len(posiciones)
+                    candidatos.intersection_update(posiciones)
+                    pasos.append(f"intersección con {criterio.descripcion} (leídas {len(posiciones)}, quedan {len(candidatos)})")
+                else:
+                    residuales.append(criterio)
+            filas = catalogo.registro
+            examinar = [filas(pos) for pos in sorted(candidatos)]
+        else:
+            residuales.extend(indexados)
+            examinar = list(catalogo)
+            pasos.append(f"recorrido completo ({n} filas)")
+
+        residuales.sort(key=lambda c: c.estimacion)
+        if residuales:
+            pasos.append("filtrar por " + ", ".join(c.descripcion for c in residuales))
+            predicados = [c.predicado for c in residuales]
+            resultado = [r for r in examinar if all(f(r) for f in predicados)]
+        else:
+            resultado = examinar
+
+        if informe is not None:
+            estimadas = float(n)
+            for criterio in criterios:
+                estimadas *= criterio.estimacion / n if n else 0.0
+            informe.update(plan=pasos, filas_estimadas=round(estimadas),
+                           entradas_indice=entradas_indice, filas_examinadas=len(examinar),
+                           filas_devueltas=len(resultado))
+        return resultado
+
+    def explain(self, rangos: bool = True, **filtros) -> dict:
+        """
+        Ejecuta la consulta y devuelve el plan elegido, las filas estimadas,
+        las entradas de índice leídas, las filas examinadas y las devueltas.
+        """
+        informe: dict = {}
+        self.ejecutar(filtros, rangos, informe)
+        return informe
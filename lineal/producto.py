@@ -1,3 +1,8 @@
+from autocompletado import completar_en
+from busqueda_difusa import parecidos_en
+from busqueda_texto import buscar_texto_en
+from normalizacion import clave_busqueda
+
 # Datos de ejemplo
 productos = [
     {'id': 1, 'nombre': 'iPhone 15', 'marca': 'Apple', 'categoria': 'Smartphone', 'precio': 999.99, 'stock': 10, 'disponible': True},
@@ -7,32 +12,65 @@ productos = [
     {'id': 5, 'nombre': 'Sony WH-1000XM5', 'marca': 'Sony', 'categoria': 'Audífonos', 'precio': 399.99, 'stock': 15, 'disponible': True}
 ]
 
-def _norm(valor):
-    return valor.strip().lower() if isinstance(valor, str) else valor
+_norm = clave_busqueda
 
-def buscar_producto_por_nombre(productos, nombre_buscado):
+def buscar_producto_por_nombre(productos, nombre_buscado, filtro=None):
     """Busca un producto por nombre (búsqueda lineal, case-insensitive)."""
+    if hasattr(productos, 'buscar_producto_por_nombre'):
+        return productos.buscar_producto_por_nombre(nombre_buscado)
+    if filtro is not None and filtro.descarta(productos, nombre_buscado):
+        return None
     nombre_norm = _norm(nombre_buscado)
     return next((p for p in productos if _norm(p.get('nombre')) == nombre_norm), None)
 
-def buscar_producto_por_id(productos, id_buscado):
+def buscar_producto_por_id(productos, id_buscado, filtro=None):
     """Busca un producto por ID (búsqueda lineal)."""
+    if hasattr(productos, 'buscar_producto_por_id'):
+        return productos.buscar_producto_por_id(id_buscado)
+    if filtro is not None and filtro.descarta(productos, id_buscado):
+        return None
     return next((p for p in productos if p.get('id') == id_buscado), None)
 
 def buscar_productos_por_categoria(productos, categoria_buscada):
     """Devuelve lista de productos que pertenecen a una categoría (case-insensitive)."""
+    if hasattr(productos, 'buscar_productos_por_categoria'):
+        return productos.buscar_productos_por_categoria(categoria_buscada)
     categoria_norm = _norm(categoria_buscada)
     return [p for p in productos if _norm(p.get('categoria')) == categoria_norm]
 
 def buscar_productos_por_marca(productos, marca_buscada):
     """Devuelve lista de productos de una marca (case-insensitive)."""
+    if hasattr(productos, 'buscar_productos_por_marca'):
+        return productos.buscar_productos_por_marca(marca_buscada)
     marca_norm = _norm(marca_buscada)
     return [p for p in productos if _norm(p.get('marca')) == marca_norm]
 
 def buscar_productos_disponibles(productos):
     """Devuelve productos con stock > 0 y disponibles."""
+    if hasattr(productos, 'buscar_productos_disponibles'):
+        return productos.buscar_productos_disponibles()
     return [p for p in productos if p.get('disponible') and p.get('stock', 0) > 0]
 
+def buscar_productos_parecidos(productos, nombre_buscado, cantidad=5, max_errores=None):
+    """Productos con nombre parecido al buscado aunque tenga errores de tecleo, como pares
+    (producto, puntuación entre 0 y 1) del más al menos parecido."""
+    if hasattr(productos, 'buscar_productos_parecidos'):
+        return productos.buscar_productos_parecidos(nombre_buscado, cantidad, max_errores)
+    return parecidos_en(productos, nombre_buscado, 'nombre', cantidad, max_errores)
+
+def autocompletar_productos(productos, prefijo, cantidad=10):
+    """Los primeros productos (en orden alfabético) cuyo nombre empieza por el prefijo (case-insensitive)."""
+    if hasattr(productos, 'autocompletar_productos'):
+        return productos.autocompletar_productos(prefijo, cantidad)
+    return completar_en(productos, prefijo, cantidad)
+
+def buscar_productos_por_texto(productos, consulta, operador='y', cantidad=None):
+    """Productos con todas ('y') o alguna ('o') de las palabras de la consulta en nombre, marca o
+    categoría, como pares (producto, puntuación BM25) del más al menos relevante."""
+    if hasattr(productos, 'buscar_productos_por_texto'):
+        return productos.buscar_productos_por_texto(consulta, operador, cantidad)
+    return buscar_texto_en(productos, consulta, operador, cantidad)
+
 # Pruebas de las funciones
 print("=== PRUEBAS DE BÚSQUEDA LINEAL EN PRODUCTOS ===\n")
 
@@ -75,11 +113,19 @@ print(f"   Buscando 'Producto Inexistente': {resultado}")
 resultado = buscar_producto_por_id(productos, 99)
 print(f"   Buscando ID 99: {resultado}")
 
+resultado = buscar_producto_por_nombre(productos, "macbok air")
+parecidos = [(p['nombre'], puntuacion) for p, puntuacion in buscar_productos_parecidos(productos, "macbok air")]
+print(f"   Buscando 'macbok air': {resultado}, parecidos: {parecidos}")
+print(f"   Empiezan por 'mac': {[p['nombre'] for p in autocompletar_productos(productos, 'mac')]}")
+print(f"   Con 'apple' y 'laptop': {[p['nombre'] for p, _ in buscar_productos_por_texto(productos, 'apple laptop')]}")
+
 def buscar_productos_con_filtros(productos, **filtros):
     """
     Busca productos aplicando múltiples filtros.
     Comparación case-insensitive para valores string.
     """
+    if hasattr(productos, 'buscar_productos_con_filtros'):
+        return productos.buscar_productos_con_filtros(**filtros)
     def cumple(producto):
         for clave, valor in filtros.items():
             if clave not in producto:
@@ -102,6 +148,11 @@ print("   Productos Apple en categoría Smartphone:")
 for producto in resultados:
     print(f"   - {producto['nombre']}")
 
+from autocompletado import completar_en
+from busqueda_difusa import parecidos_en
+from busqueda_texto import buscar_texto_en
+from normalizacion import clave_busqueda
+
 # Datos de ejemplo
 productos = [
     {'id': 1, 'nombre': 'iPhone 15', 'marca': 'Apple', 'categoria': 'Smartphone', 'precio': 999.99, 'stock': 10, 'disponible': True},
@@ -111,32 +162,65 @@ productos = [
     {'id': 5, 'nombre': 'Sony WH-1000XM5', 'marca': 'Sony', 'categoria': 'Audífonos', 'precio': 399.99, 'stock': 15, 'disponible': True}
 ]
 
-def _norm(valor):
-    return valor.strip().lower() if isinstance(valor, str) else valor
+_norm = clave_busqueda
 
-def buscar_producto_por_nombre(productos, nombre_buscado):
+def buscar_producto_por_nombre(productos, nombre_buscado, filtro=None):
     """Busca un producto por nombre (búsqueda lineal, case-insensitive)."""
+    if hasattr(productos, 'buscar_producto_por_nombre'):
+        return productos.buscar_producto_por_nombre(nombre_buscado)
+    if filtro is not None and filtro.descarta(productos, nombre_buscado):
+        return None
     nombre_norm = _norm(nombre_buscado)
     return next((p for p in productos if _norm(p.get('nombre')) == nombre_norm), None)
 
-def buscar_producto_por_id(productos, id_buscado):
+def buscar_producto_por_id(productos, id_buscado, filtro=None):
     """Busca un producto por ID (búsqueda lineal)."""
+    if hasattr(productos, 'buscar_producto_por_id'):
+        return productos.buscar_producto_por_id(id_buscado)
+    if filtro is not None and filtro.descarta(productos, id_buscado):
+        return None
     return next((p for p in productos if p.get('id') == id_buscado), None)
 
 def buscar_productos_por_categoria(productos, categoria_buscada):
     """Devuelve lista de productos que pertenecen a una categoría (case-insensitive)."""
+    if hasattr(productos, 'buscar_productos_por_categoria'):
+        return productos.buscar_productos_por_categoria(categoria_buscada)
     categoria_norm = _norm(categoria_buscada)
     return [p for p in productos if _norm(p.get('categoria')) == categoria_norm]
 
 def buscar_productos_por_marca(productos, marca_buscada):
     """Devuelve lista de productos de una marca (case-insensitive)."""
+    if hasattr(productos, 'buscar_productos_por_marca'):
+        return productos.buscar_productos_por_marca(marca_buscada)
     marca_norm = _norm(marca_buscada)
     return [p for p in productos if _norm(p.get('marca')) == marca_norm]
 
 def buscar_productos_disponibles(productos):
     """Devuelve productos con stock > 0 y disponibles."""
+    if hasattr(productos, 'buscar_productos_disponibles'):
+        return productos.buscar_productos_disponibles()
     return [p for p in productos if p.get('disponible') and p.get('stock', 0) > 0]
 
+def buscar_productos_parecidos(productos, nombre_buscado, cantidad=5, max_errores=None):
+    """Productos con nombre parecido al buscado aunque tenga errores de tecleo, como pares
+    (producto, puntuación entre 0 y 1) del más al menos parecido."""
+    if hasattr(productos, 'buscar_productos_parecidos'):
+        return productos.buscar_productos_parecidos(nombre_buscado, cantidad, max_errores)
+    return parecidos_en(productos, nombre_buscado, 'nombre', cantidad, max_errores)
+
+def autocompletar_productos(productos, prefijo, cantidad=10):
+    """Los primeros productos (en orden alfabético) cuyo nombre empieza por el prefijo (case-insensitive)."""
+    if hasattr(productos, 'autocompletar_productos'):
+        return productos.autocompletar_productos(prefijo, cantidad)
+    return completar_en(productos, prefijo, cantidad)
+
+def buscar_productos_por_texto(productos, consulta, operador='y', cantidad=None):
+    """Productos con todas ('y') o alguna ('o') de las palabras de la consulta en nombre, marca o
+    categoría, como pares (producto, puntuación BM25) del más al menos relevante."""
+    if hasattr(productos, 'buscar_productos_por_texto'):
+        return productos.buscar_productos_por_texto(consulta, operador, cantidad)
+    return buscar_texto_en(productos, consulta, operador, cantidad)
+
 # Pruebas de las funciones
 print("=== PRUEBAS DE BÚSQUEDA LINEAL EN PRODUCTOS ===\n")
 
@@ -179,11 +263,19 @@ print(f"   Buscando 'Producto Inexistente': {resultado}")
 resultado = buscar_producto_por_id(productos, 99)
 print(f"   Buscando ID 99: {resultado}")
 
+resultado = buscar_producto_por_nombre(productos, "macbok air")
+parecidos = [(p['nombre'], puntuacion) for p, puntuacion in buscar_productos_parecidos(productos, "macbok air")]
+print(f"   Buscando 'macbok air': {resultado}, parecidos: {parecidos}")
+print(f"   Empiezan por 'mac': {[p['nombre'] for p in autocompletar_productos(productos, 'mac')]}")
+print(f"   Con 'apple' y 'laptop': {[p['nombre'] for p, _ in buscar_productos_por_texto(productos, 'apple laptop')]}")
+
 def buscar_productos_con_filtros(productos, **filtros):
     """
     Busca productos aplicando múltiples filtros.
     Comparación case-insensitive para valores string.
     """
+    if hasattr(productos, 'buscar_productos_con_filtros'):
+        return productos.buscar_productos_con_filtros(**filtros)
     def cumple(producto):
         for clave, valor in filtros.items():
             if clave not in producto:
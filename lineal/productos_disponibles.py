@@ -1,6 +1,10 @@
-from typing import List, Dict, Any, Optional
+import heapq
+from typing import List, Dict, Any, Iterable, Optional
 from collections import Counter
 
+from compilador_filtros import compilar_filtros
+from normalizacion import clave_texto
+
 # Datos de ejemplo (ampliados para mejores pruebas)
 productos: List[Dict[str, Any]] = [
     {'id': 1, 'nombre': 'iPhone 15', 'marca': 'Apple', 'categoria': 'Smartphone', 'precio': 999.99, 'stock': 10, 'disponible': True},
@@ -15,23 +19,30 @@ productos: List[Dict[str, Any]] = [
     {'id': 10, 'nombre': 'HP Pavilion', 'marca': 'HP', 'categoria': 'Laptop', 'precio': 799.99, 'stock': 2, 'disponible': True}
 ]
 
-def _norm_str(s: Optional[str]) -> str:
-    return s.strip().lower() if isinstance(s, str) else ''
+_norm_str = clave_texto
 
 def buscar_productos_disponibles(productos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Devuelve productos con stock > 0 y disponibles."""
+    if hasattr(productos, 'buscar_productos_disponibles'):
+        return productos.buscar_productos_disponibles()
     return [p for p in productos if p.get('stock', 0) > 0 and p.get('disponible')]
 
 def buscar_productos_sin_stock(productos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Devuelve productos cuyo stock es exactamente 0."""
+    if hasattr(productos, 'buscar_productos_sin_stock'):
+        return productos.buscar_productos_sin_stock()
     return [p for p in productos if p.get('stock', 0) == 0]
 
 def buscar_productos_por_rango_precio(productos: List[Dict[str, Any]], precio_min: float, precio_max: float) -> List[Dict[str, Any]]:
     """Devuelve productos cuyo precio está dentro del rango [precio_min, precio_max]."""
+    if hasattr(productos, 'buscar_productos_por_rango_precio'):
+        return productos.buscar_productos_por_rango_precio(precio_min, precio_max)
     return [p for p in productos if precio_min <= p.get('precio', 0.0) <= precio_max]
 
 def buscar_productos_por_marca(productos: List[Dict[str, Any]], marca_buscada: str) -> List[Dict[str, Any]]:
     """Devuelve productos que coinciden con la marca (case-insensitive)."""
+    if hasattr(productos, 'buscar_productos_por_marca'):
+        return productos.buscar_productos_por_marca(marca_buscada)
     marca_norm = _norm_str(marca_buscada)
     return [p for p in productos if _norm_str(p.get('marca')) == marca_norm]
 
@@ -40,6 +51,8 @@ def contar_productos_por_categoria(productos: List[Dict[str, Any]], categoria_bu
     Si se pasa categoria_buscada devuelve el conteo (int) de esa categoría,
     si no, devuelve dict con conteos por categoría.
     """
+    if hasattr(productos, 'contar_productos_por_categoria'):
+        return productos.contar_productos_por_categoria(categoria_buscada)
     if categoria_buscada:
         categoria_norm = _norm_str(categoria_buscada)
         return sum(1 for p in productos if _norm_str(p.get('categoria')) == categoria_norm)
@@ -49,22 +62,44 @@ def contar_productos_por_categoria(productos: List[Dict[str, Any]], categoria_bu
 
 def buscar_productos_por_stock_minimo(productos: List[Dict[str, Any]], stock_minimo: int) -> List[Dict[str, Any]]:
     """Devuelve productos con stock >= stock_minimo."""
+    if hasattr(productos, 'buscar_productos_por_stock_minimo'):
+        return productos.buscar_productos_por_stock_minimo(stock_minimo)
     return [p for p in productos if p.get('stock', 0) >= stock_minimo]
 
 def buscar_productos_bajo_stock(productos: List[Dict[str, Any]], limite_stock: int = 5) -> List[Dict[str, Any]]:
     """Devuelve productos con 0 < stock <= limite_stock (necesitan reabastecerse)."""
+    if hasattr(productos, 'buscar_productos_bajo_stock'):
+        return productos.buscar_productos_bajo_stock(limite_stock)
     return [p for p in productos if 0 < p.get('stock', 0) <= limite_stock]
 
-def obtener_productos_mas_caros(productos: List[Dict[str, Any]], cantidad: int = 3) -> List[Dict[str, Any]]:
-    """Devuelve los N productos más caros."""
-    return sorted(productos, key=lambda x: x.get('precio', 0.0), reverse=True)[:cantidad]
-
-def obtener_productos_mas_baratos(productos: List[Dict[str, Any]], cantidad: int = 3) -> List[Dict[str, Any]]:
-    """Devuelve los N productos más baratos."""
-    return sorted(productos, key=lambda x: x.get('precio', 0.0))[:cantidad]
+def _de_grupo(productos: Iterable[Dict[str, Any]], categoria: Optional[str], marca: Optional[str]) -> Iterable[Dict[str, Any]]:
+    if categoria is not None:
+        categoria_norm = _norm_str(categoria)
+        productos = (p for p in productos if _norm_str(p.get('categoria')) == categoria_norm)
+    if marca is not None:
+        marca_norm = _norm_str(marca)
+        productos = (p for p in productos if _norm_str(p.get('marca')) == marca_norm)
+    return productos
+
+def obtener_productos_mas_caros(productos: List[Dict[str, Any]], cantidad: int = 3,
+                                categoria: Optional[str] = None, marca: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Devuelve los N productos más caros (opcionalmente de una categoría y/o marca)."""
+    if hasattr(productos, 'obtener_productos_mas_caros'):
+        return productos.obtener_productos_mas_caros(cantidad, categoria, marca)
+    # nlargest equivale a sorted(..., reverse=True)[:cantidad] en O(n log N)
+    return heapq.nlargest(cantidad, _de_grupo(productos, categoria, marca), key=lambda x: x.get('precio', 0.0))
+
+def obtener_productos_mas_baratos(productos: List[Dict[str, Any]], cantidad: int = 3,
+                                  categoria: Optional[str] = None, marca: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Devuelve los N productos más baratos (opcionalmente de una categoría y/o marca)."""
+    if hasattr(productos, 'obtener_productos_mas_baratos'):
+        return productos.obtener_productos_mas_baratos(cantidad, categoria, marca)
+    return heapq.nsmallest(cantidad, _de_grupo(productos, categoria, marca), key=lambda x: x.get('precio', 0.0))
 
 def calcular_valor_inventario_total(productos: List[Dict[str, Any]]) -> float:
     """Suma precio * stock para cada producto."""
+    if hasattr(productos, 'calcular_valor_inventario_total'):
+        return productos.calcular_valor_inventario_total()
     return sum(p.get('precio', 0.0) * p.get('stock', 0) for p in productos)
 
 def buscar_productos_con_filtros_multiples(productos: List[Dict[str, Any]], **filtros) -> List[Dict[str, Any]]:
@@ -74,30 +109,11 @@ def buscar_productos_con_filtros_multiples(productos: List[Dict[str, Any]], **fi
       - stock_min / stock_max
       - disponible (bool)
       - comparaciones exactas para otras claves (case-insensitive si son str)
+    Los filtros se compilan en un solo predicado (ver compilador_filtros).
     """
-    def cumple(p: Dict[str, Any]) -> bool:
-        for clave, valor in filtros.items():
-            if clave == 'precio_min':
-                if p.get('precio', 0.0) < valor: return False
-            elif clave == 'precio_max':
-                if p.get('precio', 0.0) > valor: return False
-            elif clave == 'stock_min':
-                if p.get('stock', 0) < valor: return False
-            elif clave == 'stock_max':
-                if p.get('stock', 0) > valor: return False
-            elif clave == 'disponible':
-                if p.get('disponible') != valor: return False
-            elif clave in p:
-                v_prod = p[clave]
-                if isinstance(valor, str) and isinstance(v_prod, str):
-                    if _norm_str(v_prod) != _norm_str(valor): return False
-                else:
-                    if v_prod != valor: return False
-            else:
-                return False
-        return True
-
-    return [p for p in productos if cumple(p)]
+    if hasattr(productos, 'buscar_productos_con_filtros_multiples'):
+        return productos.buscar_productos_con_filtros_multiples(**filtros)
+    return compilar_filtros(filtros).filtrar(productos)
 
 # Pruebas de las funciones (misma salida que el original)
 print("=== BÚSQUEDA POR DISPONIBILIDAD Y CRITERIOS CONDICIONALES ===\n")
@@ -199,9 +215,13 @@ print(f"Productos disponibles: {total_disponibles} ({porcentaje_disponibles:.1f}
 print(f"Productos sin stock: {len(sin_stock)}")
 print(f"Valor promedio por producto: ${calcular_valor_inventario_total(productos)/total_productos:.2f}")
 
-from typing import List, Dict, Any, Optional
+import heapq
+from typing import List, Dict, Any, Iterable, Optional
 from collections import Counter
 
+from compilador_filtros import compilar_filtros
+from normalizacion import clave_texto
+
 # Datos de ejemplo (ampliados para mejores pruebas)
 productos: List[Dict[str, Any]] = [
     {'id': 1, 'nombre': 'iPhone 15', 'marca': 'Apple', 'categoria': 'Smartphone', 'precio': 999.99, 'stock': 10, 'disponible': True},
@@ -216,23 +236,30 @@ productos: List[Dict[str, Any]] = [
     {'id': 10, 'nombre': 'HP Pavilion', 'marca': 'HP', 'categoria': 'Laptop', 'precio': 799.99, 'stock': 2, 'disponible': True}
 ]
 
-def _norm_str(s: Optional[str]) -> str:
-    return s.strip().lower() if isinstance(s, str) else ''
+_norm_str = clave_texto
 
 def buscar_productos_disponibles(productos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Devuelve productos con stock > 0 y disponibles."""
+    if hasattr(productos, 'buscar_productos_disponibles'):
+        return productos.buscar_productos_disponibles()
     return [p for p in productos if p.get('stock', 0) > 0 and p.get('disponible')]
 
 def buscar_productos_sin_stock(productos: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
     """Devuelve productos cuyo stock es exactamente 0."""
+    if hasattr(productos, 'buscar_productos_sin_stock'):
+        return productos.buscar_productos_sin_stock()
     return [p for p in productos if p.get('stock', 0) == 0]
 
 def buscar_productos_por_rango_precio(productos: List[Dict[str, Any]], precio_min: float, precio_max: float) -> List[Dict[str, Any]]:
     """Devuelve productos cuyo precio está dentro del rango [precio_min, precio_max]."""
+    if hasattr(productos, 'buscar_productos_por_rango_precio'):
+        return productos.buscar_productos_por_rango_precio(precio_min, precio_max)
     return [p for p in productos if precio_min <= p.get('precio', 0.0) <= precio_max]
 
 def buscar_productos_por_marca(productos: List[Dict[str, Any]], marca_buscada: str) -> List[Dict[str, Any]]:
     """Devuelve productos que coinciden con la marca (case-insensitive)."""
+    if hasattr(productos, 'buscar_productos_por_marca'):
+        return productos.buscar_productos_por_marca(marca_buscada)
     marca_norm = _norm_str(marca_buscada)
     return [p for p in productos if _norm_str(p.get('marca')) == marca_norm]
 
@@ -241,6 +268,8 @@ def contar_productos_por_categoria(productos: List[Dict[str, Any]], categoria_bu
     Si se pasa categoria_buscada devuelve el conteo (int) de esa categoría,
     si no, devuelve dict con conteos por categoría.
     """
+    if hasattr(productos, 'contar_productos_por_categoria'):
+        return productos.contar_productos_por_categoria(categoria_buscada)
     if categoria_buscada:
         categoria_norm = _norm_str(categoria_buscada)
         return sum(1 for p in productos if _norm_str(p.get('categoria')) == categoria_norm)
@@ -250,22 +279,44 @@ def contar_productos_por_categoria(productos: List[Dict[str, Any]], categoria_bu
 
 def buscar_productos_por_stock_minimo(productos: List[Dict[str, Any]], stock_minimo: int) -> List[Dict[str, Any]]:
     """Devuelve productos con stock >= stock_minimo."""
+    if hasattr(productos, 'buscar_productos_por_stock_minimo'):
+        return productos.buscar_productos_por_stock_minimo(stock_minimo)
     return [p for p in productos if p.get('stock', 0) >= stock_minimo]
 
 def buscar_productos_bajo_stock(productos: List[Dict[str, Any]], limite_stock: int = 5) -> List[Dict[str, Any]]:
     """Devuelve productos con 0 < stock <= limite_stock (necesitan reabastecerse)."""
+    if hasattr(productos, 'buscar_productos_bajo_stock'):
+        return productos.buscar_productos_bajo_stock(limite_stock)
     return [p for p in productos if 0 < p.get('stock', 0) <= limite_stock]
 
-def obtener_productos_mas_caros(productos: List[Dict[str, Any]], cantidad: int = 3) -> List[Dict[str, Any]]:
-    """Devuelve los N productos más caros."""
-    return sorted(productos, key=lambda x: x.get('precio', 0.0), reverse=True)[:cantidad]
-
-def obtener_productos_mas_baratos(productos: List[Dict[str, Any]], cantidad: int = 3) -> List[Dict[str, Any]]:
-    """Devuelve los N productos más baratos."""
-    return sorted(productos, key=lambda x: x.get('precio', 0.0))[:cantidad]
+def _de_grupo(productos: Iterable[Dict[str, Any]], categoria: Optional[str], marca: Optional[str]) -> Iterable[Dict[str, Any]]:
+    if categoria is not None:
+        categoria_norm = _norm_str(categoria)
+        productos = (p for p in productos if _norm_str(p.get('categoria')) == categoria_norm)
+    if marca is not None:
+        marca_norm = _norm_str(marca)
+        productos = (p for p in productos if _norm_str(p.get('marca')) == marca_norm)
+    return productos
+
+def obtener_productos_mas_caros(productos: List[Dict[str, Any]], cantidad: int = 3,
+                                categoria: Optional[str] = None, marca: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Devuelve los N productos más caros (opcionalmente de una categoría y/o marca)."""
+    if hasattr(productos, 'obtener_productos_mas_caros'):
+        return productos.obtener_productos_mas_caros(cantidad, categoria, marca)
+    # nlargest equivale a sorted(..., reverse=True)[:cantidad] en O(n log N)
+    return heapq.nlargest(cantidad, _de_grupo(productos, categoria, marca), key=lambda x: x.get('precio', 0.0))
+
+def obtener_productos_mas_baratos(productos: List[Dict[str, Any]], cantidad: int = 3,
+                                  categoria: Optional[str] = None, marca: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Devuelve los N productos más baratos (opcionalmente de una categoría y/o marca)."""
+    if hasattr(productos, 'obtener_productos_mas_baratos'):
+        return productos.obtener_productos_mas_baratos(cantidad, categoria, marca)
+    return heapq.nsmallest(cantidad, _de_grupo(productos, categoria, marca), key=lambda x: x.get('precio', 0.0))
 
 def calcular_valor_inventario_total(productos: List[Dict[str, Any]]) -> float:
     """Suma precio * stock para cada producto."""
+    if hasattr(productos, 'calcular_valor_inventario_total'):
+        return productos.calcular_valor_inventario_total()
     return sum(p.get('precio', 0.0) * p.get('stock', 0) for p in productos)
 
 def buscar_productos_con_filtros_multiples(productos: List[Dict[str, Any]], **filtros) -> List[Dict[str, Any]]:
@@ -275,30 +326,11 @@ def buscar_productos_con_filtros_multiples(productos: List[Dict[str, Any]], **fi
       - stock_min / stock_max
       - disponible (bool)
       - comparaciones exactas para otras claves (case-insensitive si son str)
+    Los filtros se compilan en un solo predicado (ver compilador_filtros).
     """
-    def cumple(p: Dict[str, Any]) -> bool:
-        for clave, valor in filtros.items():
-            if clave == 'precio_min':
-                if p.get('precio', 0.0) < valor: return False
-            elif clave == 'precio_max':
-                if p.get('precio', 0.0) > valor: return False
-            elif clave == 'stock_min':
-                if p.get('stock', 0) < valor: return False
-            elif clave == 'stock_max':
-                if p.get('stock', 0) > valor: return False
-            elif clave == 'disponible':
-                if p.get('disponible') != valor: return False
-            elif clave in p:
-                v_prod = p[clave]
-                if isinstance(valor, str) and isinstance(v_prod, str):
-                    if _norm_str(v_prod) != _norm_str(valor): return False
-                else:
-                    if v_prod != valor: return False
-            else:
-                return False
-        return True
-
-    return [p for p in productos if cumple(p)]
+    if hasattr(productos, 'buscar_productos_con_filtros_multiples'):
+        return productos.buscar_productos_con_filtros_multiples(**filtros)
+    return compilar_filtros(filtros).filtrar(productos)
 
 # Pruebas de las funciones (misma salida que el original)
 print("=== BÚSQUEDA POR DISPONIBILIDAD Y CRITERIOS CONDICIONALES ===\n")
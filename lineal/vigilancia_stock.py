@@ -0,0 +1,163 @@
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+# Eventos que reciben los suscriptores: aviso(evento, id_producto, stock)
+ENTRA_BAJO_STOCK = 'entra_bajo_stock'
+SALE_BAJO_STOCK = 'sale_bajo_stock'
+ENTRA_SIN_STOCK = 'entra_sin_stock'
+SALE_SIN_STOCK = 'sale_sin_stock'
+
+_BAJO, _SIN = 'bajo', 'sin'
+_ENTRA = {_BAJO: ENTRA_BAJO_STOCK, _SIN: ENTRA_SIN_STOCK}
+_SALE = {_BAJO: SALE_BAJO_STOCK, _SIN: SALE_SIN_STOCK}
+
+class VigilanciaStock:
+    """
+    Lista de vigilancia del stock: los ids de los productos con poco stock
+    (0 < stock <= limite_stock, como buscar_productos_bajo_stock) y de los
+    agotados (stock == 0, como buscar_productos_sin_stock), al día en cada
+    cambio de stock sin volver a recorrer el catálogo.
+
+    Cada vez que un producto entra o sale de una de las dos listas se avisa
+    a los suscriptores con aviso(evento, id_producto, stock), así un proceso
+    de reposición reacciona a cada cambio en O(1) en lugar de consultar
+    periódicamente. Un producto que pasa de poco stock a agotado produce
+    'sale_bajo_stock' y después 'entra_sin_stock'.
+
+    Se registra en un CatalogoProductos como cualquier otro índice (ver
+    CatalogoProductos.vigilar_stock); con un almacén o una lista, los
+    cambios le llegan desde Inventario.vigilar_stock. Los avisos se dan con
+    el cerrojo tomado, en el orden de los cambios: deben ser rápidos.
+    """
+
+    def __init__(self, limite_stock: int = 5, campo: str = 'stock', clave: str = 'id'):
+        self.limite_stock = limite_stock
+        self.campo = campo
+        self.clave = clave
+        self.bajo_stock = set()
+        self.sin_stock = set()
+        self._avisos: List[Callable[[str, Any, Any], None]] = []
+        self._cerrojo = threading.RLock()
+
+    def _lista(self, stock) -> Optional[str]:
+        if stock == 0:
+            return _SIN
+        if isinstance(stock, (int, float)) and 0 < stock <= self.limite_stock:
+            return _BAJO
+        return None
+
+    def _avisar(self, evento: str, id_producto, stock) -> None:
+        for aviso in self._avisos:
+            aviso(evento, id_producto, stock)
+
+    # ---------- suscripciones ----------
+
+    def suscribir(self, aviso: Callable[[str, Any, Any], None]) -> Callable[[str, Any, Any], None]:
+        """Añade un suscriptor; devuelve el mismo aviso, así sirve también como decorador."""
+        with self._cerrojo:
+            self._avisos.append(aviso)
+        return aviso
+
+    def cancelar(self, aviso: Callable[[str, Any, Any], None]) -> None:
+        with self._cerrojo:
+            self._avisos.remove(aviso)
+
+    # ---------- cambios ----------
+
+    def cambiar(self, id_producto, stock) -> None:
+        """Anota el stock nuevo de un producto y avisa si cambia de lista."""
+        nueva = self._lista(stock)
+        with self._cerrojo:
+            if id_producto in self.sin_stock:
+                anterior = _SIN
+            elif id_producto in self.bajo_stock:
+                anterior = _BAJO
+            else:
+                anterior = None
+            if anterior == nueva:
+                return
+            if anterior is not None:
+                (self.sin_stock if anterior == _SIN else self.bajo_stock).discard(id_producto)
+                self._avisar(_SALE[anterior], id_producto, stock)
+            if nueva is not None:
+                (self.sin_stock if nueva == _SIN else self.bajo_stock).add(id_producto)
+                self._avisar(_ENTRA[nueva], id_producto, stock)
+
+    def quitar(self, id_producto) -> None:
+        """Saca de la vigilancia un producto dado de baja (con stock None en el aviso)."""
+        self.cambiar(id_producto, None)
+
+    def cargar(self, stocks: Iterable[Tuple[Any, Any]]) -> None:
+        """Anota varios pares (id, stock) de una vez."""
+        for id_producto, stock in stocks:
+            self.cambiar(id_producto, stock)
+
+    # ---------- como índice de un Catalogo ----------
+
+    def construir(self, filas: Iterable[Tuple[int, Dict[str, Any]]]) -> None:
+        self.cargar((registro.get(self.clave), registro.get(self.campo, 0)) for _, registro in filas)
+
+    def verificar(self, pos: int, registro: Dict[str, Any]) -> None:
+        pass
+
+    def insertar(self, pos: int, registro: Dict[str, Any]) -> None:
+        self.cambiar(registro.get(self.clave), registro.get(self.campo, 0))
+
+    def eliminar(self, pos: int, registro: Dict[str, Any]) -> None:
+        self.quitar(registro.get(self.clave))
+
+    def actualizar(self, pos: int, anterior: Dict[str, Any], nuevo: Dict[str, Any]) -> None:
+        if anterior.get(self.clave) != nuevo.get(self.clave):
+            self.quitar(anterior.get(self.clave))
+        self.cambiar(nuevo.get(self.clave), nuevo.get(self.campo, 0))
+
+    def __len__(self) -> int:
+        return len(self.bajo_stock) + len(self.sin_stock)
+
+if __name__ == "__main__":
+    import time
+
+    from almacen_productos import AlmacenProductos
+    from benchmark import generar_productos
+    from catalogo import CatalogoProductos
+    from inventario import Inventario
+
+    print("=== PRUEBAS DE LA VIGILANCIA DE STOCK ===\n")
+    catalogo = CatalogoProductos([
+        {'id': 1, 'nombre': 'iPhone 15', 'marca': 'Apple', 'categoria': 'Smartphone', 'precio': 999.99, 'stock': 7, 'disponible': True},
+        {'id': 2, 'nombre': 'iPad Air', 'marca': 'Apple', 'categoria': 'Tablet', 'precio': 599.99, 'stock': 3, 'disponible': True},
+        {'id': 3, 'nombre': 'Dell XPS 13', 'marca': 'Dell', 'categoria': 'Laptop', 'precio': 1199.99, 'stock': 0, 'disponible': False},
+    ])
+    vigilancia = catalogo.vigilar_stock(5)
+    print(f"   Bajo stock: {sorted(vigilancia.bajo_stock)} · Sin stock: {sorted(vigilancia.sin_stock)}")
+
+    @vigilancia.suscribir
+    def reponer(evento, id_producto, stock):
+        print(f"   -> {evento}: producto {id_producto} (stock {stock})")
+
+    inventario = Inventario(catalogo)
+    for id_producto, cantidad in [(1, 2), (1, 5), (2, 3), (3, -10)]:
+        if cantidad > 0:
+            print(f"   Reservar {cantidad} del producto {id_producto}")
+            inventario.reservar(id_producto, cantidad)
+        else:
+            print(f"   Reponer {-cantidad} del producto {id_producto}")
+            inventario.liberar(id_producto, -cantidad)
+
+    n = 1_000_000
+    almacen = AlmacenProductos(generar_productos(n))
+    inventario = Inventario(almacen)
+    vigilancia = inventario.vigilar_stock(5)
+    eventos = []
+    vigilancia.suscribir(lambda evento, id_producto, stock: eventos.append(evento))
+    inicio = time.perf_counter()
+    for id_producto in range(1, 10_001):
+        inventario.ajustar_stock(id_producto, -min(inventario.stock(id_producto), 3))
+    segundos = time.perf_counter() - inicio
+    print(f"\n{n:,} productos en un almacén, 10,000 cambios de stock: {len(eventos):,} eventos "
+          f"en {segundos * 1000:.0f} ms ({segundos * 100:.1f} µs por cambio)")
+    inicio = time.perf_counter()
+    bajos = almacen.buscar_productos_bajo_stock(5)
+    print(f"   Vigilados {len(vigilancia.bajo_stock):,} con poco stock y {len(vigilancia.sin_stock):,} agotados; "
+          f"una sola consulta recorriendo el almacén tarda {(time.perf_counter() - inicio) * 1000:.0f} ms "
+          f"(y da los mismos: {len(bajos) == len(vigilancia.bajo_stock)})")